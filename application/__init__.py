@@ -3,5 +3,15 @@ Módulo de aplicación - Contiene los casos de uso y servicios de aplicación
 """
 
 from .use_cases import BookRegistrationUseCase
+from .metrics import RegistrationMetrics
+from .aggregates import CatalogAggregates
+from .loans import BookLoanUseCase, InMemoryLoanLedger
+from .book_locks import BookLocks
+from .search_index import TrigramSearchIndex, SearchHit
+from .catalog_query import CatalogQueryEngine, QueryPage
+from .catalog_sync import CatalogSyncUseCase, SyncManifest
 
-__all__ = ['BookRegistrationUseCase']
+__all__ = ['BookRegistrationUseCase', 'RegistrationMetrics', 'CatalogAggregates', 'BookLoanUseCase',
+           'InMemoryLoanLedger', 'BookLocks',
+           'TrigramSearchIndex', 'SearchHit', 'CatalogQueryEngine', 'QueryPage',
+           'CatalogSyncUseCase', 'SyncManifest']
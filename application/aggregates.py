@@ -0,0 +1,139 @@
+import threading
+from typing import Dict, List
+from domain.codes import (
+    GENRES, LANGUAGES, AVAILABILITY_STATUSES,
+    GENRE_CODES, LANGUAGE_CODES, AVAILABILITY_CODES, categories_to_mask
+)
+from domain.entities import Book
+from domain.repositories import BookRepository
+from domain.services import SHELF_LOCATIONS, LibraryManagementService
+
+
+AGGREGATES_PREFIX = "saberx_catalog"
+
+_STATUS_COUNT = len(AVAILABILITY_STATUSES)
+
+
+class CatalogAggregates:
+    """Agregados materializados del catálogo para tableros en vivo
+
+    Mantiene títulos y copias por sección (``LibraryManagementService``) y por
+    género e idioma desglosados por estado de disponibilidad. Cada evento
+    (registro, actualización, préstamo, devolución, baja) ajusta unos pocos
+    contadores en O(1); ``rebuild`` los recalcula desde el repositorio al arrancar.
+
+    Los contadores son listas planas indexadas por los códigos de ``domain.codes``.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self.shelf_titles: List[int] = [0] * len(SHELF_LOCATIONS)
+        self.shelf_copies: List[int] = [0] * len(SHELF_LOCATIONS)
+        # Índice: código_de_género * cantidad_de_estados + código_de_estado
+        self.genre_titles: List[int] = [0] * (len(GENRES) * _STATUS_COUNT)
+        self.genre_copies: List[int] = [0] * (len(GENRES) * _STATUS_COUNT)
+        self.language_titles: List[int] = [0] * (len(LANGUAGES) * _STATUS_COUNT)
+        self.language_copies: List[int] = [0] * (len(LANGUAGES) * _STATUS_COUNT)
+
+    def rebuild(self, repository: BookRepository) -> "CatalogAggregates":
+        """Recalcula todos los contadores recorriendo el repositorio una vez"""
+        with self._lock:
+            self._reset()
+            for book in repository.iter_all():
+                self._apply(book, 1)
+        return self
+
+    def record_registered(self, book: Book):
+        """Evento: libro registrado"""
+        with self._lock:
+            self._apply(book, 1)
+
+    def record_registered_many(self, books: List[Book]):
+        """Evento: lote de libros registrados (una sola toma del candado)"""
+        with self._lock:
+            for book in books:
+                self._apply(book, 1)
+
+    def record_updated(self, before: Book, after: Book):
+        """Evento: libro modificado (también préstamos y devoluciones)
+
+        ``before`` y ``after`` son el estado anterior y el nuevo del mismo libro.
+        """
+        with self._lock:
+            self._apply(before, -1)
+            self._apply(after, 1)
+
+    record_borrowed = record_updated
+    record_returned = record_updated
+
+    def record_removed(self, book: Book):
+        """Evento: libro dado de baja"""
+        with self._lock:
+            self._apply(book, -1)
+
+    def _apply(self, book: Book, sign: int):
+        """Suma (sign=1) o resta (sign=-1) la contribución de un libro"""
+        copies = book.copies_count.value * sign
+        shelf = LibraryManagementService.calculate_shelf_code(
+            categories_to_mask(book.categories), GENRE_CODES[book.genre]
+        )
+        status = AVAILABILITY_CODES[book.availability_status]
+        genre = GENRE_CODES[book.genre] * _STATUS_COUNT + status
+        language = LANGUAGE_CODES[book.language] * _STATUS_COUNT + status
+
+        self.shelf_titles[shelf] += sign
+        self.shelf_copies[shelf] += copies
+        self.genre_titles[genre] += sign
+        self.genre_copies[genre] += copies
+        self.language_titles[language] += sign
+        self.language_copies[language] += copies
+
+    def snapshot(self) -> Dict:
+        """Copia consistente de los agregados, serializable a JSON"""
+        with self._lock:
+            return {
+                "titles": sum(self.shelf_titles),
+                "copies": sum(self.shelf_copies),
+                "shelves": {
+                    location: {"titles": self.shelf_titles[code], "copies": self.shelf_copies[code]}
+                    for code, location in enumerate(SHELF_LOCATIONS)
+                },
+                "genres": self._by_status(GENRES, self.genre_titles, self.genre_copies),
+                "languages": self._by_status(LANGUAGES, self.language_titles, self.language_copies),
+            }
+
+    @staticmethod
+    def _by_status(members, titles: List[int], copies: List[int]) -> Dict:
+        """Desglose {miembro: {estado: {titles, copies}}} de una dimensión"""
+        return {
+            member.value: {
+                status.value: {
+                    "titles": titles[code * _STATUS_COUNT + status_code],
+                    "copies": copies[code * _STATUS_COUNT + status_code],
+                }
+                for status_code, status in enumerate(AVAILABILITY_STATUSES)
+            }
+            for code, member in enumerate(members)
+        }
+
+    def to_prometheus(self) -> str:
+        """Exporta los agregados en el formato de texto de Prometheus"""
+        snapshot = self.snapshot()
+        lines = []
+        for kind, description in (("titles", "Títulos"), ("copies", "Copias")):
+            name = f"{AGGREGATES_PREFIX}_shelf_{kind}"
+            lines.append(f"# HELP {name} {description} por sección")
+            lines.append(f"# TYPE {name} gauge")
+            for location, counts in snapshot["shelves"].items():
+                lines.append(f'{name}{{shelf="{location}"}} {counts[kind]}')
+            for dimension, label, title in (("genres", "genre", "género"), ("languages", "language", "idioma")):
+                name = f"{AGGREGATES_PREFIX}_{label}_{kind}"
+                lines.append(f"# HELP {name} {description} por {title} y estado de disponibilidad")
+                lines.append(f"# TYPE {name} gauge")
+                for member, statuses in snapshot[dimension].items():
+                    for status, counts in statuses.items():
+                        lines.append(f'{name}{{{label}="{member}",status="{status}"}} {counts[kind]}')
+        return "\n".join(lines) + "\n"
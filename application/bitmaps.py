@@ -0,0 +1,89 @@
+import re
+from typing import Iterable, Iterator, Sequence
+
+
+_NONZERO_BYTE = re.compile(rb"[^\x00]")
+
+
+def to_bitmap(positions: Sequence[int]) -> int:
+    """Entero cuyo bit i está encendido si la posición i está en la secuencia"""
+    if not positions:
+        return 0
+    data = bytearray((max(positions) >> 3) + 1)
+    for position in positions:
+        data[position >> 3] |= 1 << (position & 7)
+    return int.from_bytes(data, "little")
+
+
+def iter_bits(bitmap: int) -> Iterator[int]:
+    """Posiciones de los bits encendidos, de menor a mayor"""
+    data = bitmap.to_bytes((bitmap.bit_length() + 7) // 8, "little")
+    for match in _NONZERO_BYTE.finditer(data):
+        base = match.start() << 3
+        byte = data[match.start()]
+        while byte:
+            lowest = byte & -byte
+            yield base + lowest.bit_length() - 1
+            byte ^= lowest
+
+
+class Bitmap:
+    """Mapa de bits mutable de posiciones
+
+    Encender o apagar un bit es O(1) sobre un ``bytearray``; ``to_int`` entrega el
+    mapa como ``int`` para combinarlo con otros (``&``, ``|``) en una sola operación
+    y lo conserva hasta la próxima modificación.
+    """
+
+    __slots__ = ("_data", "_count", "_value")
+
+    def __init__(self):
+        self._data = bytearray()
+        self._count = 0
+        self._value = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, position: int) -> bool:
+        index = position >> 3
+        return index < len(self._data) and bool(self._data[index] >> (position & 7) & 1)
+
+    def add(self, position: int):
+        index = position >> 3
+        if index >= len(self._data):
+            self._data.extend(bytes(index + 1 - len(self._data)))
+        bit = 1 << (position & 7)
+        if not self._data[index] & bit:
+            self._data[index] |= bit
+            self._count += 1
+            self._value = None
+
+    def update(self, positions: Iterable[int]):
+        """Enciende varios bits de una vez (carga inicial de un índice)"""
+        data = self._data
+        count = self._count
+        for position in positions:
+            index = position >> 3
+            if index >= len(data):
+                data.extend(bytes(index + 1 - len(data)))
+            bit = 1 << (position & 7)
+            if not data[index] & bit:
+                data[index] |= bit
+                count += 1
+        if count != self._count:
+            self._count = count
+            self._value = None
+
+    def discard(self, position: int):
+        index = position >> 3
+        bit = 1 << (position & 7)
+        if index < len(self._data) and self._data[index] & bit:
+            self._data[index] &= ~bit
+            self._count -= 1
+            self._value = None
+
+    def to_int(self) -> int:
+        if self._value is None:
+            self._value = int.from_bytes(self._data, "little")
+        return self._value
@@ -0,0 +1,40 @@
+import threading
+import weakref
+from domain.repositories import BookRepository
+
+
+class BookLocks:
+    """Candados por franjas de identificador de libro (``book_id % stripes``)
+
+    Toda lectura-modificación-escritura de un libro guardado (préstamos,
+    devoluciones, fusión de copias de duplicados, sincronización) toma el candado
+    de su franja; los casos de uso que operan sobre el mismo repositorio deben
+    compartir la misma instancia para no perder actualizaciones.
+    """
+
+    DEFAULT_STRIPES = 64
+
+    # Instancia compartida por repositorio (se libera junto con el repositorio)
+    _shared: "weakref.WeakKeyDictionary[BookRepository, BookLocks]" = weakref.WeakKeyDictionary()
+    _shared_lock = threading.Lock()
+
+    def __init__(self, stripes: int = DEFAULT_STRIPES):
+        if stripes < 1:
+            raise ValueError("La cantidad de franjas debe ser mayor que cero")
+        self._locks = tuple(threading.Lock() for _ in range(stripes))
+
+    def __len__(self) -> int:
+        return len(self._locks)
+
+    def for_book(self, book_id: int) -> threading.Lock:
+        """Candado de la franja del libro"""
+        return self._locks[book_id % len(self._locks)]
+
+    @classmethod
+    def for_repository(cls, repository: BookRepository) -> "BookLocks":
+        """Candados compartidos por todos los casos de uso de un repositorio"""
+        with cls._shared_lock:
+            locks = cls._shared.get(repository)
+            if locks is None:
+                locks = cls._shared[repository] = cls()
+            return locks
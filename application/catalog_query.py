@@ -0,0 +1,424 @@
+import threading
+from collections import defaultdict
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
+from domain.codes import (
+    CATEGORIES, GENRES, LANGUAGES, AVAILABILITY_STATUSES,
+    GENRE_CODES, LANGUAGE_CODES, AVAILABILITY_CODES, CATEGORY_MASK_LIMIT, categories_to_mask
+)
+from domain.dto import BookQuery
+from domain.entities import Book
+from domain.repositories import BookRepository
+from .bitmaps import Bitmap, iter_bits, to_bitmap
+
+
+QUERY_ORDER_FIELDS = ("book_id", "publication_year")
+
+# Predicados con índice de mapa de bits: campo de BookQuery -> (enum, códigos, columna)
+_BITMAP_FIELDS = (
+    ("genre", GENRES, GENRE_CODES, "Género no válido"),
+    ("language", LANGUAGES, LANGUAGE_CODES, "Idioma no válido"),
+    ("availability_status", AVAILABILITY_STATUSES, AVAILABILITY_CODES, "Estado de disponibilidad no válido"),
+)
+
+_MEMBERS = {name: members for name, members, _, _ in _BITMAP_FIELDS}
+
+# Coste relativo de ordenar un candidato frente a examinarlo
+_SORT_COST = 4
+
+# Bits encendidos de cada máscara de categorías
+_MASK_BITS = tuple(
+    tuple(bit for bit in range(len(CATEGORIES)) if mask >> bit & 1) for mask in range(CATEGORY_MASK_LIMIT)
+)
+
+
+class QueryPage(NamedTuple):
+    """Página de resultados de una consulta"""
+    books: List[Book]
+    next_cursor: Optional[str]
+    plan: str
+    examined: int
+
+
+def validate_query(query: BookQuery) -> Tuple[List[Tuple[str, int]], int, Optional[Tuple[int, ...]]]:
+    """Valida la consulta: igualdades como códigos, máscara de categorías exigidas y cursor
+
+    ValueError con el mismo mensaje para cualquier motor (índices en memoria o SQL).
+    """
+    if query.limit < 1:
+        raise ValueError("El límite debe ser mayor que cero")
+    if query.order_by not in QUERY_ORDER_FIELDS:
+        raise ValueError(f"Campo de orden no válido: {query.order_by}")
+    equalities = []
+    for name, members, codes, message in _BITMAP_FIELDS:
+        value = getattr(query, name)
+        if value is None:
+            continue
+        member = next((member for member in members if member.value == value), None)
+        if member is None:
+            raise ValueError(f"{message}: {value}")
+        equalities.append((name, codes[member]))
+    required_mask = 0
+    for value in query.categories:
+        category = next((category for category in CATEGORIES if category.value == value), None)
+        if category is None:
+            raise ValueError(f"Categoría no válida: {value}")
+        required_mask |= categories_to_mask((category,))
+    return equalities, required_mask, _parse_cursor(query)
+
+
+def _parse_cursor(query: BookQuery) -> Optional[Tuple[int, ...]]:
+    if query.cursor is None:
+        return None
+    try:
+        parts = tuple(int(part) for part in query.cursor.split(":"))
+    except ValueError:
+        raise ValueError(f"Cursor inválido: {query.cursor}")
+    if len(parts) != (2 if query.order_by == "publication_year" else 1):
+        raise ValueError(f"Cursor inválido: {query.cursor}")
+    return parts
+
+
+class CatalogQueryEngine:
+    """Consultas por varios criterios sobre índices secundarios del catálogo
+
+    Cada libro ocupa una posición (en orden de identificador) en columnas compactas
+    de año, copias y códigos. Sobre ellas se mantienen:
+
+    - un índice ordenado por año: los años presentes en una lista ordenada (bisect)
+      y, por año, las posiciones de sus libros;
+    - mapas de bits por género, idioma, estado de disponibilidad y categoría.
+
+    El planificador estima cuántas posiciones aporta cada índice aplicable y recorre
+    el más selectivo; los demás criterios se comprueban contra las columnas. La
+    paginación es por cursor (la clave del último libro entregado), así las páginas
+    siguientes no se corren cuando se registran libros nuevos.
+    """
+
+    def __init__(self, repository: BookRepository):
+        self.repository = repository
+        self._lock = threading.RLock()
+        self._book_ids = array("Q")
+        self._positions: Dict[int, int] = {}
+        self._years = array("H")
+        self._copies = array("H")
+        self._codes = {name: array("B") for name, _, _, _ in _BITMAP_FIELDS}
+        self._category_masks = array("B")
+        self._bitmaps: Dict[Tuple[str, int], Bitmap] = {}
+        self._year_keys: List[int] = []
+        self._year_positions: Dict[int, array] = {}
+        # Posiciones de libros eliminados (sus columnas quedan hasta que sean las últimas)
+        self._removed: Set[int] = set()
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def rebuild(self) -> "CatalogQueryEngine":
+        """Indexa todos los libros del repositorio"""
+        self.add_books(self.repository.iter_all())
+        return self
+
+    def add_books(self, books: Iterable[Book]):
+        """Indexa libros recién guardados (en orden de identificador) o reindexa los ya conocidos"""
+        with self._lock:
+            # Las posiciones nuevas se acumulan por clave y se vuelcan juntas en cada mapa de bits
+            pending: Dict[Tuple[str, int], List[int]] = defaultdict(list)
+            for book in books:
+                if book.book_id in self._positions:
+                    self._update(book)
+                else:
+                    self._add(book, pending)
+            for key, positions in pending.items():
+                self._bitmap(*key).update(positions)
+
+    def update(self, book: Book):
+        """Reindexa un libro modificado (préstamo, devolución, fusión de copias)"""
+        with self._lock:
+            self._update(book)
+
+    def remove(self, book_id: int):
+        """Quita un libro eliminado de los índices
+
+        Su posición sale de los mapas de bits y del índice de años; las columnas se
+        recortan cuando las posiciones eliminadas quedan al final, así un
+        identificador reutilizado (el mayor, tras borrarlo) vuelve a entrar en orden.
+        """
+        with self._lock:
+            position = self._positions.pop(book_id, None)
+            if position is None:
+                return
+            for name, column in self._codes.items():
+                self._bitmap(name, column[position]).discard(position)
+            for bit in _MASK_BITS[self._category_masks[position]]:
+                self._bitmap("category", bit).discard(position)
+            year = self._years[position]
+            bucket = self._year_positions[year]
+            bucket.pop(bisect_left(bucket, position))
+            if not bucket:
+                del self._year_positions[year]
+                self._year_keys.pop(bisect_left(self._year_keys, year))
+            self._removed.add(position)
+            while self._book_ids and len(self._book_ids) - 1 in self._removed:
+                self._removed.discard(len(self._book_ids) - 1)
+                for column in (self._book_ids, self._years, self._copies, self._category_masks,
+                               *self._codes.values()):
+                    column.pop()
+
+    def _bitmap(self, field: str, code: int) -> Bitmap:
+        bitmap = self._bitmaps.get((field, code))
+        if bitmap is None:
+            bitmap = self._bitmaps[(field, code)] = Bitmap()
+        return bitmap
+
+    def _add(self, book: Book, pending: Dict[Tuple[str, int], List[int]]):
+        if self._book_ids and book.book_id <= self._book_ids[-1]:
+            raise ValueError(f"Identificador de libro fuera de orden: {book.book_id}")
+        position = len(self._book_ids)
+        self._book_ids.append(book.book_id)
+        self._positions[book.book_id] = position
+        self._years.append(book.publication_year.value)
+        self._copies.append(book.copies_count.value)
+        for key in self._field_codes(book):
+            self._codes[key[0]].append(key[1])
+            pending[key].append(position)
+        mask = categories_to_mask(book.categories)
+        self._category_masks.append(mask)
+        for bit in _MASK_BITS[mask]:
+            pending[("category", bit)].append(position)
+        # Las posiciones nuevas son siempre las mayores: el cubo del año sigue ordenado
+        self._year_bucket(book.publication_year.value).append(position)
+
+    def _update(self, book: Book):
+        position = self._positions.get(book.book_id)
+        if position is None:
+            raise ValueError(f"Libro no encontrado: {book.book_id}")
+        self._copies[position] = book.copies_count.value
+        for name, code in self._field_codes(book):
+            column = self._codes[name]
+            if column[position] != code:
+                self._bitmap(name, column[position]).discard(position)
+                self._bitmap(name, code).add(position)
+                column[position] = code
+        mask = categories_to_mask(book.categories)
+        old_mask = self._category_masks[position]
+        if mask != old_mask:
+            for bit in _MASK_BITS[mask ^ old_mask]:
+                if mask >> bit & 1:
+                    self._bitmap("category", bit).add(position)
+                else:
+                    self._bitmap("category", bit).discard(position)
+            self._category_masks[position] = mask
+        year = book.publication_year.value
+        old_year = self._years[position]
+        if year != old_year:
+            bucket = self._year_positions[old_year]
+            bucket.pop(bisect_left(bucket, position))
+            if not bucket:
+                del self._year_positions[old_year]
+                self._year_keys.pop(bisect_left(self._year_keys, old_year))
+            insort(self._year_bucket(year), position)
+            self._years[position] = year
+
+    @staticmethod
+    def _field_codes(book: Book) -> Tuple[Tuple[str, int], ...]:
+        return (
+            ("genre", GENRE_CODES[book.genre]),
+            ("language", LANGUAGE_CODES[book.language]),
+            ("availability_status", AVAILABILITY_CODES[book.availability_status]),
+        )
+
+    def _year_bucket(self, year: int) -> array:
+        bucket = self._year_positions.get(year)
+        if bucket is None:
+            bucket = self._year_positions[year] = array("I")
+            insort(self._year_keys, year)
+        return bucket
+
+    def execute(self, query: BookQuery) -> QueryPage:
+        """Ejecuta la consulta y devuelve una página de libros con el cursor de la siguiente"""
+        equalities, required_mask, cursor = validate_query(query)
+        with self._lock:
+            kind, plan, positions = self._plan(query, equalities, required_mask, cursor)
+            check = self._residual_check(query, equalities, required_mask, kind)
+            text_check = self._text_check(query)
+
+            books: List[Book] = []
+            examined = 0
+            last_key = None
+            for position in positions:
+                examined += 1
+                if check is not None and not check(position):
+                    continue
+                book = None
+                if text_check is not None:
+                    book = self.repository.get(self._book_ids[position])
+                    if book is None or not text_check(book):
+                        continue
+                if len(books) == query.limit:
+                    # Hay al menos un resultado más: la página siguiente empieza después del último
+                    return QueryPage(books, self._cursor(query, last_key), plan, examined)
+                if book is None:
+                    book = self.repository.get(self._book_ids[position])
+                books.append(book)
+                last_key = position
+            return QueryPage(books, None, plan, examined)
+
+    def _plan(self, query: BookQuery, equalities: List[Tuple[str, int]], required_mask: int,
+              cursor: Optional[Tuple[int, ...]]) -> Tuple[str, str, Iterator[int]]:
+        """Elige el plan más barato: devuelve su tipo, su descripción y las posiciones a examinar
+
+        El coste es el número de posiciones que se espera tocar. Los planes que ya
+        entregan el orden pedido se detienen en cuanto completan la página, así que su
+        coste depende de la selectividad del resto de criterios (se suponen independientes).
+        """
+        bitmaps = [
+            (f"{name}={_MEMBERS[name][code].value}", self._bitmaps.get((name, code)) or Bitmap())
+            for name, code in equalities
+        ]
+        bitmaps += [
+            (f"category={CATEGORIES[bit].value}", self._bitmaps.get(("category", bit)) or Bitmap())
+            for bit in _MASK_BITS[required_mask]
+        ]
+        total = max(len(self._book_ids), 1)
+        wanted = query.limit + 1
+        by_year = query.order_by == "publication_year"
+        year_range = query.year_from is not None or query.year_to is not None
+        years = self._years_in_range(query.year_from, query.year_to)
+        year_count = sum(len(self._year_positions[year]) for year in years)
+        bitmap_count = min((len(bitmap) for _, bitmap in bitmaps), default=total)
+        year_selectivity = year_count / total if year_range else 1.0
+        bitmap_selectivity = bitmap_count / total
+
+        costs = {}
+        if bitmaps:
+            costs["bitmaps"] = (bitmap_count * _SORT_COST if by_year
+                                else min(bitmap_count, wanted / max(year_selectivity, 1 / total)))
+        if year_range or by_year:
+            costs["years"] = (min(year_count, wanted / max(bitmap_selectivity, 1 / total)) if by_year
+                              else year_count)
+        if not by_year:
+            costs["scan"] = min(total, wanted / max(year_selectivity * bitmap_selectivity, 1 / total))
+        kind = min(costs, key=costs.get)
+
+        if kind == "bitmaps":
+            combined = -1
+            for _, bitmap in bitmaps:
+                combined &= bitmap.to_int()
+            description = (f"mapas de bits ({' & '.join(label for label, _ in bitmaps)}): "
+                           f"≤{bitmap_count} candidatos")
+            return kind, description, self._from_positions(combined, query, cursor)
+        if kind == "years":
+            description = f"índice de años ({len(years)} años, {year_count} candidatos)"
+            if by_year:
+                return kind, description, self._by_year(years, query.descending, cursor)
+            # Las posiciones de varios años se reordenan por identificador pasando por un mapa de bits
+            positions = to_bitmap([position for year in years for position in self._year_positions[year]])
+            return kind, description, self._from_positions(positions, query, cursor)
+        return kind, f"recorrido completo ({len(self._book_ids)} libros)", self._scan(query.descending, cursor)
+
+    def _years_in_range(self, year_from: Optional[int], year_to: Optional[int]) -> List[int]:
+        """Años presentes en el rango (búsqueda binaria sobre la lista ordenada de años)"""
+        keys = self._year_keys
+        start = bisect_left(keys, year_from) if year_from is not None else 0
+        end = bisect_right(keys, year_to) if year_to is not None else len(keys)
+        return keys[start:end]
+
+    def _scan(self, descending: bool, cursor: Optional[Tuple[int, ...]]) -> Iterator[int]:
+        """Todas las posiciones en orden de identificador desde el cursor"""
+        if descending:
+            start = bisect_left(self._book_ids, cursor[-1]) if cursor else len(self._book_ids)
+            return iter(range(start - 1, -1, -1))
+        start = bisect_right(self._book_ids, cursor[-1]) if cursor else 0
+        return iter(range(start, len(self._book_ids)))
+
+    def _by_year(self, years: List[int], descending: bool, cursor: Optional[Tuple[int, ...]]) -> Iterator[int]:
+        """Posiciones en orden de (año, identificador) recorriendo el índice de años"""
+        if descending:
+            years = years[::-1]
+        for year in years:
+            bucket = self._year_positions[year]
+            if cursor is None:
+                yield from reversed(bucket) if descending else bucket
+                continue
+            cursor_year, cursor_id = cursor
+            if (year > cursor_year) if descending else (year < cursor_year):
+                continue
+            if year != cursor_year:
+                yield from reversed(bucket) if descending else bucket
+                continue
+            cut = bisect_right(self._book_ids, cursor_id) if not descending else bisect_left(self._book_ids, cursor_id)
+            index = bisect_left(bucket, cut)
+            if descending:
+                yield from reversed(bucket[:index])
+            else:
+                yield from bucket[index:]
+
+    def _from_positions(self, candidates: int, query: BookQuery,
+                        cursor: Optional[Tuple[int, ...]]) -> Iterator[int]:
+        """Ordena las posiciones candidatas (mapa de bits) según la consulta y aplica el cursor"""
+        if query.order_by == "publication_year":
+            years, book_ids = self._years, self._book_ids
+            ordered = sorted(iter_bits(candidates), key=lambda position: (years[position], position),
+                             reverse=query.descending)
+            if cursor is not None:
+                ordered = [
+                    position for position in ordered
+                    if ((years[position], book_ids[position]) < cursor if query.descending
+                        else (years[position], book_ids[position]) > cursor)
+                ]
+            return iter(ordered)
+        # Con orden por identificador el cursor recorta el mapa de bits antes de recorrerlo
+        if query.descending:
+            if cursor is not None:
+                candidates &= (1 << bisect_left(self._book_ids, cursor[-1])) - 1
+            return reversed(list(iter_bits(candidates)))
+        if cursor is not None:
+            candidates &= -1 << bisect_right(self._book_ids, cursor[-1])
+        return iter_bits(candidates)
+
+    def _residual_check(self, query: BookQuery, equalities: List[Tuple[str, int]],
+                        required_mask: int, kind: str) -> Optional[Callable[[int], bool]]:
+        """Comprobación por columnas de los criterios que el plan elegido no garantiza"""
+        checks = []
+        if kind == "scan" and self._removed:
+            removed = self._removed
+            checks.append(lambda position: position not in removed)
+        if kind != "bitmaps":
+            for name, code in equalities:
+                column = self._codes[name]
+                checks.append(lambda position, column=column, code=code: column[position] == code)
+            if required_mask:
+                masks = self._category_masks
+                checks.append(lambda position: masks[position] & required_mask == required_mask)
+        if kind != "years" and (query.year_from is not None or query.year_to is not None):
+            years = self._years
+            low = query.year_from if query.year_from is not None else 0
+            high = query.year_to if query.year_to is not None else 0xFFFF
+            checks.append(lambda position: low <= years[position] <= high)
+        if query.min_copies is not None:
+            copies = self._copies
+            minimum = query.min_copies
+            checks.append(lambda position: copies[position] >= minimum)
+        if not checks:
+            return None
+        if len(checks) == 1:
+            return checks[0]
+        return lambda position: all(check(position) for check in checks)
+
+    @staticmethod
+    def _text_check(query: BookQuery) -> Optional[Callable[[Book], bool]]:
+        """Filtro por texto contenido en título o autor (requiere leer el libro)"""
+        title = query.title_contains.lower() if query.title_contains else None
+        author = query.author_contains.lower() if query.author_contains else None
+        if title is None and author is None:
+            return None
+        return lambda book: ((title is None or title in book.title.value.lower()) and
+                             (author is None or author in book.author.value.lower()))
+
+    def _cursor(self, query: BookQuery, position: int) -> str:
+        """Cursor opaco con la clave de orden del último libro de la página"""
+        book_id = self._book_ids[position]
+        if query.order_by == "publication_year":
+            return f"{self._years[position]}:{book_id}"
+        return str(book_id)
@@ -0,0 +1,280 @@
+import time
+from array import array
+from hashlib import blake2b
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from domain.dto import BookRegistrationRequest, SyncReport
+from domain.entities import Book
+from domain.text_normalization import duplicate_key
+from .use_cases import BookRegistrationUseCase
+
+
+# Separador de campos en el texto del que se calcula el hash de contenido
+_FIELD_SEPARATOR = "\x1f"
+
+
+def content_hash(title: str, author: str, publication_year: int, genre: str, categories: Iterable[str],
+                 language: str, availability_status: str, copies_count: int, summary: Optional[str]) -> int:
+    """Hash de 64 bits de los campos de una solicitud
+
+    Las categorías se toman como conjunto (sin orden ni repeticiones), igual que en ``Book``.
+    """
+    text = _FIELD_SEPARATOR.join((
+        title, author, str(publication_year), genre, _FIELD_SEPARATOR.join(sorted(set(categories))),
+        language, availability_status, str(copies_count), summary or ""
+    ))
+    return int.from_bytes(blake2b(text.encode("utf-8", "surrogatepass"), digest_size=8).digest(), "little")
+
+
+def request_content_hash(request: BookRegistrationRequest) -> int:
+    """Hash de contenido de una fila del archivo"""
+    return content_hash(
+        request.title, request.author, request.publication_year, request.genre, request.categories,
+        request.language, request.availability_status, request.copies_count, request.summary
+    )
+
+
+def book_content_hash(book: Book) -> int:
+    """Hash de contenido de un libro guardado (igual al de la solicitud que lo creó)"""
+    return content_hash(
+        book.title.value, book.author.value, book.publication_year.value, book.genre.value,
+        (category.value for category in book.categories), book.language.value,
+        book.availability_status.value, book.copies_count.value, book.summary.value
+    )
+
+
+def key_hash(key: str) -> int:
+    """Hash de 64 bits de la clave de duplicados (título, autor y año normalizados)"""
+    return int.from_bytes(blake2b(key.encode("utf-8", "surrogatepass"), digest_size=8).digest(), "little")
+
+
+class SyncManifest:
+    """Estado de la última sincronización: por libro, el hash de su fila y el de su clave
+
+    Tres columnas paralelas de enteros de 64 bits; se guarda entre ejecuciones con
+    ``infrastructure.sync_manifest``.
+    """
+
+    COLUMNS = ("book_ids", "content_hashes", "key_hashes")
+
+    def __init__(self):
+        self.book_ids = array("Q")
+        self.content_hashes = array("Q")
+        self.key_hashes = array("Q")
+
+    def __len__(self) -> int:
+        return len(self.book_ids)
+
+    def append(self, book_id: int, content: int, key: int):
+        self.book_ids.append(book_id)
+        self.content_hashes.append(content)
+        self.key_hashes.append(key)
+
+    def copy_entry(self, source: "SyncManifest", index: int):
+        """Conserva sin cambios la entrada ``index`` de otro manifiesto"""
+        self.append(source.book_ids[index], source.content_hashes[index], source.key_hashes[index])
+
+    @classmethod
+    def from_books(cls, books: Iterable[Book]) -> "SyncManifest":
+        """Manifiesto de un catálogo existente (primera sincronización o estado perdido)"""
+        manifest = cls()
+        for book in books:
+            manifest.append(
+                book.book_id, book_content_hash(book),
+                key_hash(duplicate_key(book.title.value, book.author.value, book.publication_year.value))
+            )
+        return manifest
+
+
+class CatalogSyncUseCase:
+    """Sincroniza el catálogo con el archivo completo que un proveedor reenvía cada vez
+
+    Cada fila se identifica por la clave de duplicados (título, autor y año
+    normalizados) y se compara por un hash de sus campos con el manifiesto de la
+    sincronización anterior:
+
+    - hash conocido: la fila no cambió y solo se anota (un hash y una búsqueda);
+    - clave conocida con otro hash: se valida y reemplaza el libro (``update``);
+    - clave nueva: se registra por lotes con ``register_books``, o se adopta el
+      libro si el índice de duplicados del caso de uso ya la conoce;
+    - libros del manifiesto ausentes del archivo: se eliminan solo con
+      ``delete_missing`` (por defecto se conservan).
+
+    Solo las filas nuevas o modificadas llegan al caso de uso y al repositorio, así
+    el costo de la sincronización crece con la cantidad de cambios y no con el
+    tamaño del catálogo. Los agregados e índices del caso de uso se actualizan con
+    cada diferencia. Sin manifiesto previo se calcula uno a partir de todo el
+    catálogo; en esa primera sincronización nunca se elimina nada, porque el
+    catálogo puede tener libros registrados por otras vías (interfaz, HTTP).
+    """
+
+    DEFAULT_BATCH_SIZE = BookRegistrationUseCase.DEFAULT_BATCH_SIZE
+
+    def __init__(self, registration: BookRegistrationUseCase, manifest: Optional[SyncManifest] = None):
+        if registration.repository is None:
+            raise ValueError("La sincronización requiere un repositorio")
+        self.registration = registration
+        self.repository = registration.repository
+        self.manifest = manifest
+
+    def execute(self, requests: Iterable[BookRegistrationRequest], delete_missing: bool = False,
+                batch_size: int = DEFAULT_BATCH_SIZE, report: Optional[SyncReport] = None) -> SyncReport:
+        """Aplica las diferencias del archivo y deja en ``manifest`` el estado nuevo
+
+        Una fila inválida o repetida se informa en ``report`` y, si su libro ya
+        existía, lo conserva sin cambios hasta la próxima sincronización.
+        """
+        if batch_size < 1:
+            raise ValueError("El tamaño de lote debe ser mayor que cero")
+        report = report if report is not None else SyncReport()
+        started = time.perf_counter()
+        previous = self.manifest
+        if previous is None:
+            previous = SyncManifest.from_books(self.repository.iter_all())
+            delete_missing = False
+        by_content = dict(zip(previous.content_hashes, range(len(previous))))
+        # El índice por clave solo hace falta si alguna fila cambió
+        by_key: Optional[Dict[int, int]] = None
+        seen = bytearray(len(previous))
+        manifest = SyncManifest()
+        new_keys: Set[int] = set()
+        inserts: List[Tuple[int, Book, int, int]] = []
+
+        for row_number, request in enumerate(requests, start=1):
+            report.processed += 1
+            try:
+                digest = request_content_hash(request)
+            except (TypeError, AttributeError):
+                digest = None
+            index = by_content.get(digest)
+            if index is not None:
+                if seen[index]:
+                    report.record_failure(row_number, "Fila repetida en el archivo")
+                else:
+                    seen[index] = 1
+                    manifest.copy_entry(previous, index)
+                    report.unchanged += 1
+                continue
+
+            if by_key is None:
+                by_key = dict(zip(previous.key_hashes, range(len(previous))))
+            try:
+                book = self.registration.build_book(request)
+            except Exception as e:
+                report.record_failure(row_number, str(e))
+                self._keep_previous(request, previous, by_key, seen, manifest)
+                continue
+            digest = digest if digest is not None else book_content_hash(book)
+            key = duplicate_key(book.title.value, book.author.value, book.publication_year.value)
+            book_key = key_hash(key)
+            index = by_key.get(book_key)
+            if index is not None:
+                if seen[index]:
+                    report.record_failure(row_number, "Fila repetida en el archivo")
+                    continue
+                seen[index] = 1
+                self._update(row_number, previous.book_ids[index], book, digest, book_key, manifest, report,
+                             inserts, fallback=(previous, index))
+            elif book_key in new_keys:
+                report.record_failure(row_number, "Fila repetida en el archivo")
+            else:
+                new_keys.add(book_key)
+                existing_id = self._existing_id(key)
+                if existing_id is not None:
+                    self._update(row_number, existing_id, book, digest, book_key, manifest, report, inserts)
+                else:
+                    inserts.append((row_number, book, digest, book_key))
+            if len(inserts) >= batch_size:
+                self._insert(inserts, manifest, report)
+                inserts = []
+        if inserts:
+            self._insert(inserts, manifest, report)
+
+        missing = [index for index in range(len(previous)) if not seen[index]]
+        if delete_missing:
+            self._delete([previous.book_ids[index] for index in missing], report)
+        else:
+            for index in missing:
+                manifest.copy_entry(previous, index)
+
+        self.manifest = manifest
+        report.elapsed_seconds = time.perf_counter() - started
+        return report
+
+    @staticmethod
+    def _keep_previous(request: BookRegistrationRequest, previous: SyncManifest, by_key: Dict[int, int],
+                       seen: bytearray, manifest: SyncManifest):
+        """Una fila inválida de un libro conocido no lo elimina: se conserva la entrada anterior"""
+        try:
+            index = by_key.get(key_hash(duplicate_key(request.title, request.author, request.publication_year)))
+        except (TypeError, AttributeError):
+            return
+        if index is not None and not seen[index]:
+            seen[index] = 1
+            manifest.copy_entry(previous, index)
+
+    def _existing_id(self, key: str) -> Optional[int]:
+        """Libro del catálogo con la clave, registrado fuera de la sincronización (None sin índice)"""
+        duplicates = self.registration.duplicates
+        if duplicates is None:
+            return None
+        with duplicates.lock:
+            return duplicates.lookup(key)
+
+    def _update(self, row_number: int, book_id: int, book: Book, digest: int, book_key: int,
+                manifest: SyncManifest, report: SyncReport, inserts: List[Tuple[int, Book, int, int]],
+                fallback: Optional[Tuple[SyncManifest, int]] = None):
+        """Reemplaza el libro guardado por el de la fila y actualiza agregados e índices"""
+        registration = self.registration
+        book.book_id = book_id
+        # El mismo candado que préstamos y fusiones: ``before`` es el libro que se reemplaza
+        with registration.book_locks.for_book(book_id):
+            try:
+                before = self.repository.get(book_id)
+                if before is None:
+                    # Se eliminó fuera de la sincronización: vuelve a registrarse
+                    book.book_id = None
+                    inserts.append((row_number, book, digest, book_key))
+                    return
+                updated = self.repository.update(book)
+            except Exception as e:
+                report.record_failure(row_number, str(e))
+                if fallback is not None:
+                    manifest.copy_entry(*fallback)
+                return
+            if registration.aggregates is not None:
+                registration.aggregates.record_updated(before, updated)
+            if registration.search_index is not None:
+                registration.search_index.update(updated)
+            if registration.query_engine is not None:
+                registration.query_engine.update(updated)
+        manifest.append(book_id, digest, book_key)
+        report.updated += 1
+
+    def _insert(self, inserts: List[Tuple[int, Book, int, int]], manifest: SyncManifest, report: SyncReport):
+        """Registra un lote de filas nuevas en una transacción"""
+        # Las claves ya se buscaron en ``_existing_id``: el caso de uso no las vuelve a buscar
+        responses = self.registration.register_books([book for _, book, _, _ in inserts],
+                                                     include_book_info=False, deduplicate=False)
+        for (row_number, book, digest, book_key), response in zip(inserts, responses):
+            if response.success and book.book_id is not None:
+                manifest.append(book.book_id, digest, book_key)
+                report.inserted += 1
+            else:
+                report.record_failure(row_number, response.message)
+
+    def _delete(self, book_ids: List[int], report: SyncReport):
+        """Elimina en una operación los libros que ya no están en el archivo"""
+        books = [book for book in map(self.repository.get, book_ids) if book is not None]
+        if not books:
+            return
+        report.deleted += self.repository.delete_many([book.book_id for book in books])
+        registration = self.registration
+        for book in books:
+            if registration.aggregates is not None:
+                registration.aggregates.record_removed(book)
+            if registration.search_index is not None:
+                registration.search_index.remove(book.book_id)
+            if registration.query_engine is not None:
+                registration.query_engine.remove(book.book_id)
+            if registration.duplicates is not None:
+                registration.duplicates.remove(registration.duplicates.key_for(book))
@@ -0,0 +1,215 @@
+import sys
+import threading
+from array import array
+from math import ceil, log
+from typing import Dict, Iterable, Optional, Set
+from domain.entities import Book
+from domain.repositories import BookRepository
+from domain.text_normalization import KEY_SEPARATOR, duplicate_key
+
+
+DUPLICATE_POLICIES = ("reject", "merge")
+
+
+class BloomFilter:
+    """Filtro de Bloom sobre cadenas: sin falsos negativos, falsos positivos acotados
+
+    Usa doble hashing a partir de ``hash()`` de la cadena (que Python cachea), por lo
+    que no es persistente entre procesos: se reconstruye al arrancar.
+    """
+
+    def __init__(self, expected_items: int, false_positive_rate: float = 0.01):
+        expected_items = max(expected_items, 1)
+        self.expected_items = expected_items
+        self.false_positive_rate = false_positive_rate
+        self.size = max(64, ceil(-expected_items * log(false_positive_rate) / (log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / expected_items * log(2)))
+        self._bits = array("Q", bytes(8 * ((self.size + 63) // 64)))
+
+    def _positions(self, item: str):
+        first = hash(item)
+        second = hash((item, 0x9E3779B9)) | 1
+        size = self.size
+        return ((first + index * second) % size for index in range(self.hash_count))
+
+    def add(self, item: str):
+        """Agrega un elemento"""
+        bits = self._bits
+        for position in self._positions(item):
+            bits[position >> 6] |= 1 << (position & 63)
+
+    def __contains__(self, item: str) -> bool:
+        bits = self._bits
+        for position in self._positions(item):
+            if not bits[position >> 6] & (1 << (position & 63)):
+                return False
+        return True
+
+    def memory_usage(self) -> int:
+        """Bytes ocupados por el arreglo de bits"""
+        return self._bits.itemsize * len(self._bits)
+
+
+class DuplicateIndex:
+    """Índice de libros registrados por clave normalizada (título, autor y año)
+
+    Por defecto el índice hash clave -> identificador contiene todo el catálogo y
+    cada consulta es O(1). Para catálogos grandes, ``max_index_entries`` acota el
+    índice a las claves más recientes y un filtro de Bloom cubre el resto: una
+    clave ausente del índice y del filtro es nueva con certeza (el caso habitual al
+    importar), y solo las que el filtro da como posibles se confirman en el
+    repositorio entre los libros de ese año.
+
+    ``policy`` decide qué hacer con un duplicado: ``"reject"`` lo rechaza y
+    ``"merge"`` suma sus copias al libro existente.
+    """
+
+    def __init__(self, policy: str = "reject", max_index_entries: Optional[int] = None,
+                 expected_items: int = 1_000_000, false_positive_rate: float = 0.01):
+        if policy not in DUPLICATE_POLICIES:
+            raise ValueError(f"Política de duplicados no válida: {policy}")
+        self.policy = policy
+        self.max_index_entries = max_index_entries
+        self.false_positive_rate = false_positive_rate
+        self.repository: Optional[BookRepository] = None
+        self._keys: Dict[str, int] = {}
+        self._bloom = BloomFilter(expected_items, false_positive_rate) if max_index_entries else None
+        self._total = 0
+        # True tras rebuild: el índice (o el filtro) cubre todo el catálogo
+        self._complete = False
+        # Sin rebuild: años ya cargados completos en el índice desde el repositorio
+        self._loaded_years: Set[int] = set()
+        self.cold_lookups = 0
+        self.false_positives = 0
+        # Lo toma el caso de uso para que comprobar y registrar sea atómico
+        self.lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return self._total
+
+    @staticmethod
+    def key_for(book: Book) -> str:
+        """Clave normalizada de un libro"""
+        return duplicate_key(book.title.value, book.author.value, book.publication_year.value)
+
+    def attach(self, repository: BookRepository) -> "DuplicateIndex":
+        """Usa el repositorio sin indexarlo: los años se cargan a medida que se consultan
+
+        La primera clave de un año carga en el índice todos los libros de ese año y
+        las siguientes del mismo año se resuelven sin volver al repositorio. Pensado
+        para procesos que tocan pocos años (registrar un libro, sincronizar pocas
+        filas nuevas), donde recorrer todo el catálogo costaría más.
+        """
+        with self.lock:
+            self.repository = repository
+            self._complete = False
+            self._loaded_years.clear()
+        return self
+
+    def rebuild(self, repository: BookRepository) -> "DuplicateIndex":
+        """Indexa todos los libros del repositorio, que se usa luego para el camino frío"""
+        with self.lock:
+            self.repository = repository
+            self._complete = True
+            self._loaded_years.clear()
+            self._keys.clear()
+            self._total = 0
+            if self._bloom is not None:
+                self._bloom = BloomFilter(
+                    max(self._bloom.expected_items, 2 * repository.count()), self.false_positive_rate
+                )
+            self.add_books(repository.iter_all())
+        return self
+
+    def lookup(self, key: str) -> Optional[int]:
+        """Identificador del libro con esa clave, o None"""
+        book_id = self._keys.get(key)
+        if book_id is not None:
+            return book_id
+        if not self._complete:
+            return self._load_year(key) if self.repository is not None else None
+        if self._bloom is None or key not in self._bloom:
+            return None
+        book_id = self._lookup_cold(key)
+        if book_id is None:
+            self.false_positives += 1
+        return book_id
+
+    def _lookup_cold(self, key: str) -> Optional[int]:
+        """Confirma en el repositorio una clave que el filtro de Bloom da como posible"""
+        self.cold_lookups += 1
+        if self.repository is not None:
+            year = int(key.rsplit(KEY_SEPARATOR, 1)[1])
+            for book in self.repository.iter_by_year(year):
+                if self.key_for(book) == key:
+                    self._remember(key, book.book_id)
+                    return book.book_id
+        return None
+
+    def _load_year(self, key: str) -> Optional[int]:
+        """Sin rebuild: carga una vez los libros del año de la clave y la resuelve
+
+        Con el índice acotado las claves cargadas pueden desalojarse, así que el año
+        no queda marcado y cada consulta se confirma en el repositorio.
+        """
+        year = int(key.rsplit(KEY_SEPARATOR, 1)[1])
+        if year in self._loaded_years:
+            return None
+        self.cold_lookups += 1
+        found = None
+        for book in self.repository.iter_by_year(year):
+            book_key = self.key_for(book)
+            self._remember(book_key, book.book_id)
+            if book_key == key:
+                found = book.book_id
+        if self.max_index_entries is None:
+            self._loaded_years.add(year)
+        return found
+
+    def add(self, key: str, book_id: int):
+        """Registra la clave de un libro guardado"""
+        if key in self._keys:
+            return
+        self._remember(key, book_id)
+        self._total += 1
+        if self._bloom is not None:
+            self._bloom.add(key)
+            if self._total > self._bloom.expected_items and self._complete:
+                self._grow()
+
+    def remove(self, key: str):
+        """Olvida la clave de un libro eliminado
+
+        El filtro de Bloom no admite bajas: la clave sigue dando positivo y se
+        descarta en el repositorio como un falso positivo.
+        """
+        with self.lock:
+            if self._keys.pop(key, None) is not None:
+                self._total = max(self._total - 1, 0)
+
+    def add_books(self, books: Iterable[Book]):
+        """Registra las claves de libros ya guardados"""
+        with self.lock:
+            for book in books:
+                self.add(self.key_for(book), book.book_id)
+
+    def _remember(self, key: str, book_id: int):
+        """Guarda la clave en el índice, desalojando la más antigua si está acotado"""
+        keys = self._keys
+        keys[key] = book_id
+        if self.max_index_entries is not None and len(keys) > self.max_index_entries:
+            del keys[next(iter(keys))]
+
+    def _grow(self):
+        """Reconstruye el filtro con el doble de capacidad recorriendo el repositorio"""
+        bloom = BloomFilter(self._bloom.expected_items * 2, self.false_positive_rate)
+        for book in self.repository.iter_all():
+            bloom.add(self.key_for(book))
+        for key in self._keys:
+            bloom.add(key)
+        self._bloom = bloom
+
+    def memory_usage(self) -> int:
+        """Bytes aproximados del índice y del filtro"""
+        index = sys.getsizeof(self._keys) + sum(sys.getsizeof(key) for key in self._keys)
+        return index + (self._bloom.memory_usage() if self._bloom is not None else 0)
@@ -0,0 +1,130 @@
+from dataclasses import replace
+from typing import Dict, Optional
+from domain.dto import LoanResponse
+from domain.entities import Book
+from domain.repositories import BookRepository, LoanLedger
+from domain.services import BookValidationService
+from domain.value_objects import AvailabilityStatus, CopiesCount
+from .aggregates import CatalogAggregates
+from .book_locks import BookLocks
+from .catalog_query import CatalogQueryEngine
+
+
+class InMemoryLoanLedger(LoanLedger):
+    """Copias prestadas por libro en memoria (se pierde al terminar el proceso)"""
+
+    def __init__(self):
+        self._on_loan: Dict[int, int] = {}
+
+    def on_loan(self, book_id: int) -> int:
+        return self._on_loan.get(book_id, 0)
+
+    def record(self, book_id: int, delta: int):
+        copies = self._on_loan.get(book_id, 0) + delta
+        if copies > 0:
+            self._on_loan[book_id] = copies
+        else:
+            self._on_loan.pop(book_id, None)
+
+
+class BookLoanUseCase:
+    """Caso de uso para prestar y devolver copias de un libro
+
+    ``copies_count`` representa las copias disponibles en la biblioteca: prestar
+    las descuenta y devolver las repone. El estado pasa a ``Prestado`` cuando no
+    queda ninguna copia y vuelve a ``Disponible`` con la primera devolución.
+
+    Cada operación lee, modifica y guarda el libro bajo el candado de su franja
+    (``book_id % stripes``): operaciones sobre el mismo libro se serializan y las
+    de libros en franjas distintas no compiten entre sí. Con ``stripes=1`` se
+    obtiene un único candado global. Con la cantidad de franjas por defecto se usan
+    los ``BookLocks`` del repositorio, los mismos que toma la fusión de duplicados
+    de ``BookRegistrationUseCase``.
+
+    Las devoluciones se acotan a las copias prestadas según ``ledger`` (por defecto
+    en memoria; la línea de comandos usa uno persistente).
+    """
+
+    DEFAULT_STRIPES = BookLocks.DEFAULT_STRIPES
+
+    def __init__(self, repository: BookRepository, stripes: int = DEFAULT_STRIPES,
+                 aggregates: Optional[CatalogAggregates] = None,
+                 query_engine: Optional[CatalogQueryEngine] = None,
+                 locks: Optional[BookLocks] = None,
+                 ledger: Optional[LoanLedger] = None):
+        if locks is None:
+            locks = BookLocks.for_repository(repository) if stripes == self.DEFAULT_STRIPES else BookLocks(stripes)
+        self.repository = repository
+        self.aggregates = aggregates
+        self.query_engine = query_engine
+        self.locks = locks
+        self.ledger = ledger if ledger is not None else InMemoryLoanLedger()
+
+    def borrow(self, book_id: int, copies: int = 1) -> LoanResponse:
+        """Presta ``copies`` copias del libro"""
+        return self._change_copies(book_id, -copies, copies)
+
+    def return_copies(self, book_id: int, copies: int = 1) -> LoanResponse:
+        """Devuelve ``copies`` copias del libro"""
+        return self._change_copies(book_id, copies, copies)
+
+    def _change_copies(self, book_id: int, delta: int, requested: int) -> LoanResponse:
+        """Aplica el cambio de copias de forma atómica respecto del mismo libro"""
+        if not isinstance(requested, int) or requested < 1:
+            return LoanResponse(success=False, message="La cantidad de copias debe ser mayor que cero",
+                                book_id=book_id)
+
+        with self.locks.for_book(book_id):
+            try:
+                book = self.repository.get(book_id)
+                if book is None:
+                    return LoanResponse(success=False, message=f"Libro no encontrado: {book_id}",
+                                        book_id=book_id)
+
+                error = self._check(book, delta, self.ledger.on_loan(book_id))
+                if error is not None:
+                    return self._response(book, False, error)
+
+                copies = book.copies_count.value + delta
+                status = AvailabilityStatus.AVAILABLE if copies > 0 else AvailabilityStatus.BORROWED
+                if not BookValidationService.validate_availability_and_copies(status, copies):
+                    return self._response(book, False, "Estado de disponibilidad incoherente con las copias")
+
+                updated = self.repository.update(
+                    replace(book, copies_count=CopiesCount(copies), availability_status=status)
+                )
+                self.ledger.record(book_id, -delta)
+            except Exception as e:
+                return LoanResponse(success=False, message=f"Error al actualizar el libro: {str(e)}",
+                                    book_id=book_id)
+
+            if self.aggregates is not None:
+                self.aggregates.record_updated(book, updated)
+            if self.query_engine is not None:
+                self.query_engine.update(updated)
+
+        action = "prestadas" if delta < 0 else "devueltas"
+        return self._response(updated, True, f"{requested} copia(s) {action}")
+
+    @staticmethod
+    def _check(book: Book, delta: int, on_loan: int) -> Optional[str]:
+        """Motivo por el que no se puede aplicar el cambio, o None"""
+        if delta < 0:
+            if not book.is_available() or book.copies_count.value + delta < 0:
+                return f"No hay copias suficientes disponibles de '{book.title.value}'"
+        elif delta > on_loan:
+            return f"Solo hay {on_loan} copia(s) prestada(s) de '{book.title.value}'"
+        elif book.copies_count.value + delta > CopiesCount.MAX_COPIES:
+            return f"El número de copias no puede exceder {CopiesCount.MAX_COPIES}"
+        return None
+
+    @staticmethod
+    def _response(book: Book, success: bool, message: str) -> LoanResponse:
+        """Respuesta con el estado de copias del libro"""
+        return LoanResponse(
+            success=success,
+            message=message,
+            book_id=book.book_id,
+            copies_available=book.copies_count.value,
+            availability_status=book.availability_status.value
+        )
@@ -0,0 +1,116 @@
+import threading
+from bisect import bisect_left
+from typing import Dict, List, Tuple
+
+
+# Límites superiores (segundos) de los buckets de latencia
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4,
+    1e-3, 2.5e-3, 5e-3, 1e-2, 2.5e-2, 5e-2, 0.1, 0.25, 0.5, 1.0,
+)
+
+METRIC_PREFIX = "saberx_registration"
+
+
+class LatencyHistogram:
+    """Histograma de latencias con buckets fijos (no thread-safe por sí solo)"""
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        # Un contador por bucket más el bucket +Inf
+        self.counts: List[int] = [0] * (len(buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, seconds: float):
+        """Registra una observación"""
+        self.counts[bisect_left(self.buckets, seconds)] += 1
+        self.total += seconds
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """Pares (límite, conteo acumulado) en el formato de Prometheus"""
+        result = []
+        running = 0
+        for bound, count in zip(self.buckets, self.counts):
+            running += count
+            result.append((repr(bound), running))
+        result.append(("+Inf", running + self.counts[-1]))
+        return result
+
+    def to_dict(self) -> Dict:
+        """Representación serializable a JSON"""
+        return {
+            "count": self.count,
+            "sum_seconds": self.total,
+            "buckets": {bound: count for bound, count in self.cumulative()},
+        }
+
+
+class RegistrationMetrics:
+    """Contadores e histogramas por etapa del registro de libros
+
+    Es opcional: el caso de uso solo mide tiempos cuando recibe una instancia,
+    de modo que sin métricas el camino crítico no paga ningún costo adicional.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self.results: Dict[str, int] = {"success": 0, "failure": 0}
+        self.failures: Dict[str, int] = {}
+        self.stages: Dict[str, LatencyHistogram] = {}
+
+    def observe(self, stage: str, seconds: float):
+        """Registra la duración de una etapa"""
+        with self._lock:
+            histogram = self.stages.get(stage)
+            if histogram is None:
+                histogram = self.stages[stage] = LatencyHistogram(self.buckets)
+            histogram.observe(seconds)
+
+    def record_success(self, count: int = 1):
+        """Cuenta registros exitosos"""
+        with self._lock:
+            self.results["success"] += count
+
+    def record_failure(self, reason: str):
+        """Cuenta un registro fallido y su motivo"""
+        with self._lock:
+            self.results["failure"] += 1
+            self.failures[reason] = self.failures.get(reason, 0) + 1
+
+    def snapshot(self) -> Dict:
+        """Copia consistente de todas las métricas, serializable a JSON"""
+        with self._lock:
+            return {
+                "registrations": dict(self.results),
+                "failures": dict(self.failures),
+                "stages": {stage: histogram.to_dict() for stage, histogram in self.stages.items()},
+            }
+
+    def to_prometheus(self) -> str:
+        """Exporta las métricas en el formato de texto de Prometheus"""
+        with self._lock:
+            lines = [
+                f"# HELP {METRIC_PREFIX}s_total Registros de libros por resultado",
+                f"# TYPE {METRIC_PREFIX}s_total counter",
+            ]
+            for result, count in self.results.items():
+                lines.append(f'{METRIC_PREFIX}s_total{{result="{result}"}} {count}')
+
+            lines.append(f"# HELP {METRIC_PREFIX}_failures_total Registros fallidos por motivo")
+            lines.append(f"# TYPE {METRIC_PREFIX}_failures_total counter")
+            for reason, count in sorted(self.failures.items()):
+                lines.append(f'{METRIC_PREFIX}_failures_total{{reason="{reason}"}} {count}')
+
+            lines.append(f"# HELP {METRIC_PREFIX}_stage_seconds Duración de cada etapa del registro")
+            lines.append(f"# TYPE {METRIC_PREFIX}_stage_seconds histogram")
+            for stage, histogram in sorted(self.stages.items()):
+                for bound, count in histogram.cumulative():
+                    lines.append(
+                        f'{METRIC_PREFIX}_stage_seconds_bucket{{stage="{stage}",le="{bound}"}} {count}'
+                    )
+                lines.append(f'{METRIC_PREFIX}_stage_seconds_sum{{stage="{stage}"}} {histogram.total!r}')
+                lines.append(f'{METRIC_PREFIX}_stage_seconds_count{{stage="{stage}"}} {histogram.count}')
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,201 @@
+import threading
+from array import array
+from collections import OrderedDict
+from math import ceil
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+from domain.entities import Book
+from domain.repositories import BookRepository
+from domain.text_normalization import fold_text
+from .bitmaps import iter_bits, to_bitmap
+
+
+SEARCH_FIELDS = ("title", "author")
+
+
+class SearchHit(NamedTuple):
+    """Resultado de una búsqueda aproximada"""
+    book_id: int
+    field: str
+    score: float
+
+
+def text_trigrams(folded: str, prefix: bool = False) -> Set[str]:
+    """Trigramas de un texto ya plegado, con cada palabra rellenada con espacios
+
+    Con ``prefix=True`` la última palabra no recibe el relleno final, de modo que
+    "garc" también coincide con "garcia" (para búsquedas mientras se escribe).
+    """
+    grams = set()
+    words = folded.split()
+    last = len(words) - 1
+    for position, word in enumerate(words):
+        padded = f"  {word}" if prefix and position == last else f"  {word} "
+        for start in range(len(padded) - 2):
+            grams.add(padded[start:start + 3])
+    return grams
+
+
+class TrigramSearchIndex:
+    """Índice invertido de trigramas sobre títulos y autores para búsqueda aproximada
+
+    Cada título y cada autor es un documento; los textos se pliegan (mayúsculas,
+    acentos, puntuación) antes de partirlos en trigramas, así "Garsia Markes"
+    encuentra "García Márquez". Las listas de documentos por trigrama son arrays
+    ordenados que crecen al registrar libros.
+
+    Para contar cuántos trigramas de la consulta tiene cada documento sin recorrer
+    listas de cientos de miles de entradas en Python, cada lista se convierte en un
+    mapa de bits (un ``int``) y los conteos se suman en paralelo como planos de bits
+    (un sumador con acarreo por plano). Los mapas de las listas grandes se guardan
+    en una caché LRU y se extienden con los documentos nuevos.
+    """
+
+    def __init__(self, max_cached_bitmaps: int = 256, cache_min_documents: int = 2048,
+                 candidate_limit: int = 200):
+        self.max_cached_bitmaps = max_cached_bitmaps
+        self.cache_min_documents = cache_min_documents
+        self.candidate_limit = candidate_limit
+        self._lock = threading.Lock()
+        self._postings: Dict[str, array] = {}
+        # Trigrama -> (mapa de bits, cantidad de documentos de la lista que cubre)
+        self._bitmaps: "OrderedDict[str, Tuple[int, int]]" = OrderedDict()
+        # Por documento: libro y cantidad de trigramas. Los documentos se agregan de a
+        # pares (título, autor), así que el campo es la paridad del número de documento.
+        self._book_ids = array("Q")
+        self._gram_counts = array("H")
+        self._documents_by_book: Dict[int, int] = {}
+        self._removed = 0
+
+    def __len__(self) -> int:
+        return len(self._documents_by_book)
+
+    def rebuild(self, repository: BookRepository) -> "TrigramSearchIndex":
+        """Indexa todos los libros del repositorio"""
+        self.add_books(repository.iter_all())
+        return self
+
+    def add_books(self, books: Iterable[Book]):
+        """Indexa libros ya guardados (con identificador)"""
+        with self._lock:
+            for book in books:
+                self._add(book)
+
+    def update(self, book: Book):
+        """Reindexa un libro cuyo título o autor cambió"""
+        with self._lock:
+            self._remove(book.book_id)
+            self._add(book)
+
+    def remove(self, book_id: int):
+        """Quita un libro de los resultados"""
+        with self._lock:
+            self._remove(book_id)
+
+    def _add(self, book: Book):
+        postings = self._postings
+        first_document = len(self._book_ids)
+        for document, text in enumerate((book.title.value, book.author.value), start=first_document):
+            grams = text_trigrams(fold_text(text))
+            self._book_ids.append(book.book_id)
+            self._gram_counts.append(min(len(grams), 0xFFFF))
+            for gram in grams:
+                posting = postings.get(gram)
+                if posting is None:
+                    posting = postings[gram] = array("I")
+                posting.append(document)
+        self._documents_by_book[book.book_id] = first_document
+
+    def _remove(self, book_id: int):
+        # Los documentos quedan marcados y se excluyen al buscar
+        first_document = self._documents_by_book.pop(book_id, None)
+        if first_document is not None:
+            self._removed |= 0b11 << first_document
+
+    def _bitmap(self, gram: str) -> int:
+        """Mapa de bits de los documentos que contienen el trigrama"""
+        posting = self._postings.get(gram)
+        if not posting:
+            return 0
+        cached = self._bitmaps.get(gram)
+        if cached is not None and cached[1] == len(posting):
+            self._bitmaps.move_to_end(gram)
+            return cached[0]
+        if cached is not None:
+            bitmap = cached[0] | to_bitmap(posting[cached[1]:])
+        else:
+            bitmap = to_bitmap(posting)
+        if len(posting) >= self.cache_min_documents:
+            self._bitmaps[gram] = (bitmap, len(posting))
+            self._bitmaps.move_to_end(gram)
+            if len(self._bitmaps) > self.max_cached_bitmaps:
+                self._bitmaps.popitem(last=False)
+        return bitmap
+
+    def search(self, query: str, limit: int = 10, field: Optional[str] = None,
+               min_score: float = 0.4, prefix: bool = True) -> List[SearchHit]:
+        """Libros cuyo título o autor se parece a ``query``, del más al menos parecido
+
+        El puntaje es la fracción de trigramas de la consulta presentes en el texto;
+        a igual puntaje se prefieren los textos más cortos (más parecidos en total).
+        """
+        if field is not None and field not in SEARCH_FIELDS:
+            raise ValueError(f"Campo de búsqueda no válido: {field}")
+        grams = text_trigrams(fold_text(query), prefix)
+        if not grams:
+            return []
+
+        with self._lock:
+            document_count = len(self._book_ids)
+            if not document_count:
+                return []
+            # Suma de los mapas de bits: planes[i] es el bit i del conteo de cada documento
+            planes: List[int] = []
+            for gram in grams:
+                carry = self._bitmap(gram)
+                for index, plane in enumerate(planes):
+                    if not carry:
+                        break
+                    planes[index], carry = plane ^ carry, plane & carry
+                if carry:
+                    planes.append(carry)
+
+            candidates = (1 << document_count) - 1
+            if field is not None:
+                pattern = b"\x55" if field == SEARCH_FIELDS[0] else b"\xaa"
+                candidates &= int.from_bytes(pattern * ((document_count + 7) // 8), "little")
+            candidates &= ~self._removed
+
+            query_size = len(grams)
+            minimum = max(1, ceil(min_score * query_size))
+            selected = []
+            for shared in range(min(query_size, (1 << len(planes)) - 1), minimum - 1, -1):
+                # Documentos con exactamente ``shared`` trigramas en común
+                matching = candidates
+                for index, plane in enumerate(planes):
+                    matching &= plane if shared >> index & 1 else ~plane
+                    if not matching:
+                        break
+                for document in iter_bits(matching):
+                    selected.append((shared, document))
+                    if len(selected) >= self.candidate_limit:
+                        break
+                if len(selected) >= self.candidate_limit:
+                    break
+
+            gram_counts = self._gram_counts
+            scored = sorted(
+                ((shared / query_size, shared / (query_size + gram_counts[document] - shared), document)
+                 for shared, document in selected),
+                reverse=True
+            )
+            hits = []
+            seen = set()
+            for score, _, document in scored:
+                book_id = self._book_ids[document]
+                if book_id in seen:
+                    continue
+                seen.add(book_id)
+                hits.append(SearchHit(book_id, SEARCH_FIELDS[document & 1], round(score, 3)))
+                if len(hits) >= limit:
+                    break
+            return hits
@@ -1,45 +1,85 @@
-from typing import Set
+import threading
+import time
+from dataclasses import replace
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 from domain.entities import Book
+from domain.repositories import BookRepository
 from domain.value_objects import (
     BookTitle, Author, PublicationYear, Genre, Category,
-    Language, AvailabilityStatus, CopiesCount, BookSummary
+    Language, AvailabilityStatus, CopiesCount, BookSummary,
+    ValueObjectInterner, trusted_value
 )
-from domain.dto import BookRegistrationRequest, BookRegistrationResponse
+from domain.dto import (
+    BookRegistrationRequest, BookRegistrationResponse, BulkRegistrationStats, MalformedRowRequest,
+    RejectionReport
+)
+from domain.validation import BatchRejectedError, ERROR_FIELDS, ValidationErrorCode, validate_request
+from .aggregates import CatalogAggregates
+from .book_locks import BookLocks
+from .deduplication import DuplicateIndex
+from .metrics import RegistrationMetrics
+from .search_index import TrigramSearchIndex
+from .catalog_query import CatalogQueryEngine
+
+
+# Búsqueda directa de enums por su valor
+_GENRES_BY_VALUE = {genre.value: genre for genre in Genre}
+_CATEGORIES_BY_VALUE = {category.value: category for category in Category}
+_LANGUAGES_BY_VALUE = {language.value: language for language in Language}
+_STATUSES_BY_VALUE = {status.value: status for status in AvailabilityStatus}
+
+
+def _construct(cls, value):
+    """Crea el objeto de valor sin caché"""
+    return cls(value)
 
 
 class BookRegistrationUseCase:
     """Caso de uso para registrar un libro en la biblioteca"""
     
+    DEFAULT_BATCH_SIZE = 1000
+    
+    def __init__(self, repository: Optional[BookRepository] = None,
+                 metrics: Optional[RegistrationMetrics] = None,
+                 interner: Optional[ValueObjectInterner] = None,
+                 aggregates: Optional[CatalogAggregates] = None,
+                 duplicates: Optional[DuplicateIndex] = None,
+                 search_index: Optional[TrigramSearchIndex] = None,
+                 query_engine: Optional[CatalogQueryEngine] = None,
+                 book_locks: Optional[BookLocks] = None):
+        self.repository = repository
+        self.metrics = metrics
+        # Los agregados y los índices solo reflejan libros efectivamente guardados
+        self.aggregates = aggregates if repository is not None else None
+        self.duplicates = duplicates if repository is not None else None
+        self.search_index = search_index if repository is not None else None
+        self.query_engine = query_engine if repository is not None else None
+        # Guardar y actualizar índices ocurre bajo un mismo candado: los libros llegan a
+        # los índices en el orden de sus identificadores aunque haya varios hilos
+        self._save_lock = threading.RLock()
+        # Candados por libro compartidos con los préstamos para modificar libros ya guardados
+        if book_locks is None and repository is not None:
+            book_locks = BookLocks.for_repository(repository)
+        self.book_locks = book_locks
+        # Con un interner, los objetos de valor repetidos se comparten entre libros
+        self.interner = interner
+        self._make_value = interner.get if interner is not None else _construct
+        self._make_validated_value = interner.get if interner is not None else trusted_value
+    
     def execute(self, request: BookRegistrationRequest) -> BookRegistrationResponse:
         """Ejecuta el registro de un libro"""
+        if self.duplicates is not None:
+            return self._execute_batch([request], include_book_info=True)[0]
+        if self.metrics is not None:
+            return self._execute_instrumented(request)
         try:
-            # Convertir strings a enums y objetos de valor
-            title = BookTitle(request.title)
-            author = Author(request.author)
-            publication_year = PublicationYear(request.publication_year)
+            book = self.build_book(request)
             
-            genre = self._convert_genre(request.genre)
-            categories = self._convert_categories(request.categories)
-            language = self._convert_language(request.language)
-            availability_status = self._convert_availability_status(request.availability_status)
-            
-            copies_count = CopiesCount(request.copies_count)
-            summary = BookSummary(request.summary or "")
-            
-            # Crear entidad Book
-            book = Book(
-                title=title,
-                author=author,
-                publication_year=publication_year,
-                genre=genre,
-                categories=categories,
-                language=language,
-                availability_status=availability_status,
-                copies_count=copies_count,
-                summary=summary
-            )
-            
-            # Simular guardado (en una implementación real aquí iría el repositorio)
+            if self.repository is not None:
+                with self._save_lock:
+                    book = self.repository.save(book)
+                    self._index_saved([book])
             book_info = book.get_display_info()
             
             return BookRegistrationResponse(
@@ -49,40 +89,446 @@ class BookRegistrationUseCase:
             )
             
         except Exception as e:
-            return BookRegistrationResponse(
-                success=False,
-                message=f"Error al registrar el libro: {str(e)}"
+            return self._error_response(e)
+    
+    def execute_many(self, requests: Iterable[BookRegistrationRequest],
+                     batch_size: int = DEFAULT_BATCH_SIZE,
+                     stats: Optional[BulkRegistrationStats] = None,
+                     include_book_info: bool = True,
+                     collect_errors: bool = False,
+                     report: Optional[RejectionReport] = None,
+                     max_error_rate: Optional[float] = None,
+                     min_rows_for_threshold: int = 100) -> Iterator[BookRegistrationResponse]:
+        """Registra libros en lote de forma perezosa, devolviendo una respuesta por fila
+        
+        Las solicitudes se consumen en bloques de ``batch_size``, por lo que nunca se
+        mantiene en memoria más de un bloque. Si se entrega ``stats`` se actualiza a
+        medida que avanza la iteración (filas procesadas, errores y filas/seg).
+        
+        Con ``collect_errors`` (implícito si se entrega ``report`` o ``max_error_rate``)
+        cada solicitud se valida sin lanzar excepciones: las respuestas rechazadas
+        traen todos sus ``error_codes`` y se anotan en ``report``. Si tras validar un
+        bloque la tasa de rechazo acumulada supera ``max_error_rate`` (con al menos
+        ``min_rows_for_threshold`` filas vistas) se lanza ``BatchRejectedError`` sin
+        guardar ese bloque; los bloques anteriores ya quedaron guardados.
+        """
+        if batch_size < 1:
+            raise ValueError("El tamaño de lote debe ser mayor que cero")
+        if report is not None or max_error_rate is not None:
+            collect_errors = True
+        if collect_errors and report is None:
+            report = RejectionReport()
+        
+        iterator = iter(requests)
+        started = time.perf_counter()
+        while True:
+            batch = list(islice(iterator, batch_size))
+            if not batch:
+                break
+            
+            rejections = None
+            if collect_errors:
+                rejections = self._validate_batch(batch, report)
+                if (max_error_rate is not None and report.processed >= min_rows_for_threshold
+                        and report.error_rate > max_error_rate):
+                    raise BatchRejectedError(report, max_error_rate)
+            
+            responses = self._execute_batch(batch, include_book_info, rejections)
+            
+            if stats is not None:
+                stats.record_batch(responses, time.perf_counter() - started)
+            yield from responses
+    
+    def _validate_batch(self, batch: List[BookRegistrationRequest],
+                        report: RejectionReport) -> List[Optional[List[ValidationErrorCode]]]:
+        """Valida un bloque sin excepciones; por fila, None si es válida o sus códigos de error"""
+        first_row = report.processed + 1
+        rejections: List[Optional[List[ValidationErrorCode]]] = []
+        for index, request in enumerate(batch):
+            codes = validate_request(request)
+            if codes:
+                report.record_rejection(first_row + index, [code.value for code in codes])
+                rejections.append(codes)
+            else:
+                rejections.append(None)
+        report.processed += len(batch)
+        return rejections
+    
+    def _execute_instrumented(self, request: BookRegistrationRequest) -> BookRegistrationResponse:
+        """Variante de execute que mide cada etapa y cuenta los motivos de fallo"""
+        metrics = self.metrics
+        started = time.perf_counter()
+        try:
+            book = self._build_book_instrumented(request)
+        except Exception as e:
+            metrics.observe("execute", time.perf_counter() - started)
+            return self._error_response(e)
+        
+        try:
+            if self.repository is not None:
+                with self._save_lock:
+                    stage_started = time.perf_counter()
+                    book = self.repository.save(book)
+                    metrics.observe("persistence", time.perf_counter() - stage_started)
+                    self._index_saved([book])
+            
+            stage_started = time.perf_counter()
+            book_info = book.get_display_info()
+            metrics.observe("formatting", time.perf_counter() - stage_started)
+        except Exception as e:
+            metrics.record_failure("persistence")
+            metrics.observe("execute", time.perf_counter() - started)
+            return self._error_response(e)
+        
+        metrics.record_success()
+        metrics.observe("execute", time.perf_counter() - started)
+        return BookRegistrationResponse(
+            success=True,
+            message="Libro registrado exitosamente",
+            book_info=book_info
+        )
+    
+    def _execute_batch(self, batch: List[BookRegistrationRequest], include_book_info: bool,
+                       rejections: Optional[List[Optional[List[ValidationErrorCode]]]] = None
+                       ) -> List[BookRegistrationResponse]:
+        """Valida y construye las entidades de un bloque y las guarda en una transacción
+        
+        ``rejections`` trae el resultado de ``_validate_batch``: las filas con códigos
+        se responden sin intentar construir la entidad.
+        """
+        metrics = self.metrics
+        build_book = self.build_book if metrics is None else self._build_book_instrumented
+        responses: List[Optional[BookRegistrationResponse]] = []
+        books: List[Book] = []
+        positions: List[int] = []
+        for index, request in enumerate(batch):
+            if rejections is not None:
+                codes = rejections[index]
+                if codes:
+                    responses.append(self._rejection_response(codes))
+                    if metrics is not None:
+                        metrics.record_failure(ERROR_FIELDS[codes[0]])
+                    continue
+                positions.append(len(responses))
+                books.append(self._build_validated_book(request))
+                responses.append(None)
+                continue
+            try:
+                book = build_book(request)
+            except Exception as e:
+                responses.append(self._error_response(e))
+                continue
+            positions.append(len(responses))
+            books.append(book)
+            responses.append(None)
+        
+        self._persist(books, positions, responses, include_book_info)
+        return responses
+    
+    def register_books(self, books: List[Book], include_book_info: bool = True,
+                       deduplicate: bool = True) -> List[BookRegistrationResponse]:
+        """Guarda libros ya construidos y validados (p. ej. por procesos worker) en una transacción
+        
+        Aplica el control de duplicados y actualiza los agregados igual que ``execute_many``.
+        Con ``deduplicate=False`` el llamador ya comprobó que las claves son nuevas: no
+        se vuelven a buscar, solo se agregan al índice de duplicados.
+        """
+        responses: List[Optional[BookRegistrationResponse]] = [None] * len(books)
+        self._persist(list(books), list(range(len(books))), responses, include_book_info, deduplicate)
+        return responses
+    
+    def _persist(self, books: List[Book], positions: List[int],
+                 responses: List[Optional[BookRegistrationResponse]], include_book_info: bool,
+                 deduplicate: bool = True):
+        """Guarda los libros nuevos del bloque y completa sus respuestas"""
+        metrics = self.metrics
+        if books and self.repository is not None:
+            if self.duplicates is None:
+                saved = self._save_batch(books, positions, responses)
+            else:
+                with self.duplicates.lock:
+                    merged = []
+                    if deduplicate:
+                        books, positions, merged = self._deduplicate(books, positions, responses)
+                    saved = self._save_batch(books, positions, responses)
+                    if saved is not None:
+                        self.duplicates.add_books(saved)
+                    self._complete_merges(merged, saved, responses, include_book_info)
+            if saved is None:
+                return
+            books = saved
+        
+        stage_started = time.perf_counter()
+        for position, book in zip(positions, books):
+            responses[position] = BookRegistrationResponse(
+                success=True,
+                message="Libro registrado exitosamente",
+                book_info=book.get_display_info() if include_book_info else None
             )
+        if metrics is not None and books:
+            metrics.observe("formatting_batch", time.perf_counter() - stage_started)
+            metrics.record_success(len(books))
+    
+    def _save_batch(self, books: List[Book], positions: List[int],
+                    responses: List[Optional[BookRegistrationResponse]]) -> Optional[List[Book]]:
+        """Guarda los libros en una transacción; si falla, marca sus filas y devuelve None"""
+        metrics = self.metrics
+        if not books:
+            return books
+        stage_started = time.perf_counter()
+        with self._save_lock:
+            try:
+                books = self.repository.save_many(books)
+            except Exception as e:
+                # La transacción del lote se revierte completa: todas sus filas fallan
+                for position in positions:
+                    responses[position] = self._error_response(e)
+                    if metrics is not None:
+                        metrics.record_failure("persistence")
+                return None
+            if metrics is not None:
+                metrics.observe("persistence_batch", time.perf_counter() - stage_started)
+            self._index_saved(books)
+        return books
+    
+    def _index_saved(self, books: List[Book]):
+        """Agrega libros recién guardados a los agregados e índices (con ``_save_lock`` tomado)"""
+        if self.aggregates is not None:
+            self.aggregates.record_registered_many(books)
+        if self.search_index is not None:
+            self.search_index.add_books(books)
+        if self.query_engine is not None:
+            self.query_engine.add_books(books)
+    
+    def _deduplicate(self, books: List[Book], positions: List[int],
+                     responses: List[Optional[BookRegistrationResponse]]):
+        """Separa los duplicados (del catálogo o del mismo bloque) de los libros nuevos
+        
+        Con la política ``"reject"`` los duplicados se responden como error. Con
+        ``"merge"`` sus copias se suman al libro existente, o al libro nuevo del mismo
+        bloque, que se guarda una sola vez. Devuelve los libros a insertar, sus
+        posiciones y las fusiones con libros del bloque (pendientes de guardar).
+        """
+        duplicates = self.duplicates
+        merge = duplicates.policy == "merge"
+        pending: Dict[str, int] = {}
+        new_books: List[Book] = []
+        new_positions: List[int] = []
+        merged: List[Tuple[int, int]] = []
+        for position, book in zip(positions, books):
+            key = duplicates.key_for(book)
+            existing_id = duplicates.lookup(key)
+            pending_index = pending.get(key)
+            if existing_id is None and pending_index is None:
+                pending[key] = len(new_books)
+                new_books.append(book)
+                new_positions.append(position)
+            elif not merge:
+                responses[position] = self._duplicate_response(existing_id)
+                if self.metrics is not None:
+                    self.metrics.record_failure("duplicate")
+            elif existing_id is not None:
+                responses[position] = self._merge_into_existing(existing_id, book)
+            else:
+                target = new_books[pending_index]
+                error = self._merge_copies_error(target, book)
+                if error is not None:
+                    responses[position] = self._error_response(ValueError(error))
+                else:
+                    target.copies_count = CopiesCount(target.copies_count.value + book.copies_count.value)
+                    merged.append((position, pending_index))
+        return new_books, new_positions, merged
+    
+    def _merge_into_existing(self, book_id: int, book: Book) -> BookRegistrationResponse:
+        """Suma las copias de ``book`` al libro ya guardado (bajo el candado del libro)"""
+        with self.book_locks.for_book(book_id):
+            try:
+                existing = self.repository.get(book_id)
+                if existing is None:
+                    raise ValueError(f"Libro no encontrado: {book_id}")
+                error = self._merge_copies_error(existing, book)
+                if error is not None:
+                    raise ValueError(error)
+                copies = existing.copies_count.value + book.copies_count.value
+                status = existing.availability_status
+                if existing.copies_count.value == 0 and copies > 0:
+                    status = AvailabilityStatus.AVAILABLE
+                updated = self.repository.update(
+                    replace(existing, copies_count=CopiesCount(copies), availability_status=status)
+                )
+            except Exception as e:
+                return self._error_response(e)
+            if self.aggregates is not None:
+                self.aggregates.record_updated(existing, updated)
+            if self.query_engine is not None:
+                self.query_engine.update(updated)
+        if self.metrics is not None:
+            self.metrics.record_success()
+        return self._merged_response(updated)
+    
+    def _complete_merges(self, merged: List[Tuple[int, int]], saved: Optional[List[Book]],
+                         responses: List[Optional[BookRegistrationResponse]], include_book_info: bool):
+        """Responde las filas fusionadas con un libro del bloque según el resultado del guardado"""
+        for position, pending_index in merged:
+            if saved is None:
+                responses[position] = self._error_response(ValueError("No se guardó el libro original"))
+            else:
+                responses[position] = self._merged_response(saved[pending_index], include_book_info)
+                if self.metrics is not None:
+                    self.metrics.record_success()
+    
+    @staticmethod
+    def _merge_copies_error(existing: Book, book: Book) -> Optional[str]:
+        """Motivo por el que no se pueden sumar las copias, o None"""
+        if existing.copies_count.value + book.copies_count.value > CopiesCount.MAX_COPIES:
+            return f"Al sumar las copias se excedería el máximo de {CopiesCount.MAX_COPIES}"
+        return None
+    
+    @staticmethod
+    def _merged_response(book: Book, include_book_info: bool = True) -> BookRegistrationResponse:
+        """Respuesta de un duplicado cuyas copias se sumaron a un libro existente"""
+        return BookRegistrationResponse(
+            success=True,
+            message=f"Copias agregadas al libro existente {book.book_id} ({book.copies_count.value} en total)",
+            book_info=book.get_display_info() if include_book_info else None
+        )
+    
+    @staticmethod
+    def _duplicate_response(book_id: Optional[int]) -> BookRegistrationResponse:
+        """Respuesta de un duplicado rechazado"""
+        code = ValidationErrorCode.DUPLICATE_BOOK.value
+        where = f"libro {book_id}" if book_id is not None else "otra fila del mismo lote"
+        return BookRegistrationResponse(
+            success=False,
+            message=f"Solicitud rechazada: {code} (duplicado de {where})",
+            error_codes=[code]
+        )
+    
+    def build_book(self, request: BookRegistrationRequest) -> Book:
+        """Convierte la solicitud en objetos de valor y crea la entidad Book"""
+        return Book(**self._convert_request(request))
+    
+    def _build_validated_book(self, request: BookRegistrationRequest) -> Book:
+        """Crea la entidad de una solicitud que ya pasó ``validate_request``, sin revalidar"""
+        make_value = self._make_validated_value
+        book = object.__new__(Book)
+        book.__dict__.update(
+            title=make_value(BookTitle, request.title),
+            author=make_value(Author, request.author),
+            publication_year=make_value(PublicationYear, request.publication_year),
+            genre=_GENRES_BY_VALUE[request.genre],
+            categories={_CATEGORIES_BY_VALUE[category] for category in request.categories},
+            language=_LANGUAGES_BY_VALUE[request.language],
+            availability_status=_STATUSES_BY_VALUE[request.availability_status],
+            copies_count=make_value(CopiesCount, request.copies_count),
+            summary=make_value(BookSummary, request.summary or ""),
+            book_id=None
+        )
+        return book
+    
+    def _build_book_instrumented(self, request: BookRegistrationRequest) -> Book:
+        """Variante de build_book que mide conversión y creación de la entidad"""
+        metrics = self.metrics
+        started = time.perf_counter()
+        try:
+            fields = self._convert_request(request)
+        except Exception:
+            metrics.record_failure(self._failure_reason(request))
+            raise
+        converted = time.perf_counter()
+        metrics.observe("conversion", converted - started)
+        try:
+            book = Book(**fields)
+        except Exception:
+            metrics.record_failure("book")
+            raise
+        metrics.observe("entity", time.perf_counter() - converted)
+        return book
+    
+    def _convert_request(self, request: BookRegistrationRequest) -> Dict[str, Any]:
+        """Convierte los campos de la solicitud en enums y objetos de valor"""
+        if isinstance(request, MalformedRowRequest):
+            raise ValueError(request.error)
+        make_value = self._make_value
+        return {
+            "title": make_value(BookTitle, request.title),
+            "author": make_value(Author, request.author),
+            "publication_year": make_value(PublicationYear, request.publication_year),
+            "genre": self._convert_genre(request.genre),
+            "categories": self._convert_categories(request.categories),
+            "language": self._convert_language(request.language),
+            "availability_status": self._convert_availability_status(request.availability_status),
+            "copies_count": make_value(CopiesCount, request.copies_count),
+            "summary": make_value(BookSummary, request.summary or ""),
+        }
+    
+    def _failure_reason(self, request: BookRegistrationRequest) -> str:
+        """Identifica el primer campo inválido (solo se usa en el camino de error)"""
+        if isinstance(request, MalformedRowRequest):
+            return "row"
+        checks = (
+            ("title", lambda: BookTitle(request.title)),
+            ("author", lambda: Author(request.author)),
+            ("publication_year", lambda: PublicationYear(request.publication_year)),
+            ("genre", lambda: self._convert_genre(request.genre)),
+            ("categories", lambda: self._convert_categories(request.categories)),
+            ("language", lambda: self._convert_language(request.language)),
+            ("availability_status", lambda: self._convert_availability_status(request.availability_status)),
+            ("copies_count", lambda: CopiesCount(request.copies_count)),
+            ("summary", lambda: BookSummary(request.summary or "")),
+        )
+        for field, check in checks:
+            try:
+                check()
+            except Exception:
+                return field
+        return "unknown"
+    
+    @staticmethod
+    def _error_response(error: Exception) -> BookRegistrationResponse:
+        """Construye la respuesta de error a partir de una excepción"""
+        return BookRegistrationResponse(
+            success=False,
+            message=f"Error al registrar el libro: {str(error)}"
+        )
+    
+    @staticmethod
+    def _rejection_response(codes: List[ValidationErrorCode]) -> BookRegistrationResponse:
+        """Construye la respuesta de una solicitud rechazada por validación"""
+        values = [code.value for code in codes]
+        return BookRegistrationResponse(
+            success=False,
+            message=f"Solicitud rechazada: {', '.join(values)}",
+            error_codes=values
+        )
     
     def _convert_genre(self, genre_str: str) -> Genre:
         """Convierte string a enum Genre"""
-        for genre in Genre:
-            if genre.value == genre_str:
-                return genre
-        raise ValueError(f"Género no válido: {genre_str}")
+        genre = _GENRES_BY_VALUE.get(genre_str) if isinstance(genre_str, str) else None
+        if genre is None:
+            raise ValueError(f"Género no válido: {genre_str}")
+        return genre
     
     def _convert_categories(self, categories_list: list) -> Set[Category]:
         """Convierte lista de strings a set de Category enums"""
         categories = set()
         for cat_str in categories_list:
-            for category in Category:
-                if category.value == cat_str:
-                    categories.add(category)
-                    break
-            else:
+            category = _CATEGORIES_BY_VALUE.get(cat_str) if isinstance(cat_str, str) else None
+            if category is None:
                 raise ValueError(f"Categoría no válida: {cat_str}")
+            categories.add(category)
         return categories
     
     def _convert_language(self, language_str: str) -> Language:
         """Convierte string a enum Language"""
-        for language in Language:
-            if language.value == language_str:
-                return language
-        raise ValueError(f"Idioma no válido: {language_str}")
+        language = _LANGUAGES_BY_VALUE.get(language_str) if isinstance(language_str, str) else None
+        if language is None:
+            raise ValueError(f"Idioma no válido: {language_str}")
+        return language
     
     def _convert_availability_status(self, status_str: str) -> AvailabilityStatus:
         """Convierte string a enum AvailabilityStatus"""
-        for status in AvailabilityStatus:
-            if status.value == status_str:
-                return status
-        raise ValueError(f"Estado de disponibilidad no válido: {status_str}")
+        status = _STATUSES_BY_VALUE.get(status_str) if isinstance(status_str, str) else None
+        if status is None:
+            raise ValueError(f"Estado de disponibilidad no válido: {status_str}")
+        return status
@@ -0,0 +1,7 @@
+"""
+Módulo de benchmarks - Generador de catálogos sintéticos y mediciones de rendimiento
+"""
+
+from .synthetic import SyntheticCatalogGenerator
+
+__all__ = ['SyntheticCatalogGenerator']
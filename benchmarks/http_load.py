@@ -0,0 +1,127 @@
+"""
+Generador de carga para el servicio HTTP de registro
+
+Uso:
+    python main.py serve --port 8080 &
+    python -m benchmarks.http_load --port 8080 --connections 32 --duration 10
+    python -m benchmarks.http_load --port 8080 --batch-size 100
+
+Cada vuelta sobre las solicitudes generadas lleva su número en los títulos, así que
+con el ``--duplicates reject`` por defecto del servidor (y una base vacía) ninguna solicitud es un
+duplicado que se rechaza sin registrar nada.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from typing import Dict, List
+from .synthetic import SyntheticCatalogGenerator
+
+# Marca en el título que se reemplaza por el número de vuelta (en JSON queda como \u0000)
+ROUND_MARK = "\x00"
+
+
+async def _worker(host: str, port: int, bodies: List[List[bytes]], path: str, deadline: float,
+                  latencies: List[int], statuses: Dict[int, int], offset: int, stride: int):
+    """Envía solicitudes por una conexión keep-alive hasta el final de la prueba
+
+    Las conexiones se reparten los índices (``offset``, ``offset + stride``, ...) para
+    que ninguna repita un cuerpo que ya envió otra.
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    index = offset
+    try:
+        while time.perf_counter() < deadline:
+            round_number, position = divmod(index, len(bodies))
+            body = str(round_number).encode("ascii").join(bodies[position])
+            index += stride
+            started = time.perf_counter_ns()
+            writer.write(
+                f"POST {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n\r\n".encode("latin-1") + body
+            )
+            await writer.drain()
+
+            status_line = await reader.readline()
+            if not status_line:
+                break
+            length = 0
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                if name.strip().lower() == "content-length":
+                    length = int(value)
+            await reader.readexactly(length)
+
+            latencies.append(time.perf_counter_ns() - started)
+            status = int(status_line.split()[1])
+            statuses[status] = statuses.get(status, 0) + 1
+    finally:
+        writer.close()
+
+
+async def run_load(host: str, port: int, connections: int, duration: float,
+                   batch_size: int = 0, seed: int = 42) -> Dict:
+    """Ejecuta la prueba de carga y devuelve el resumen"""
+    generator = SyntheticCatalogGenerator(seed)
+    requests = [dict(request.__dict__, title=f"{request.title} #{ROUND_MARK}")
+                for request in generator.requests(max(1000, batch_size * 10))]
+    if batch_size:
+        path = "/books/batch"
+        bodies = [json.dumps(requests[start:start + batch_size], ensure_ascii=False).encode("utf-8")
+                  for start in range(0, len(requests), batch_size)]
+    else:
+        path = "/books"
+        bodies = [json.dumps(request, ensure_ascii=False).encode("utf-8") for request in requests]
+    # Cada cuerpo se guarda partido en la marca para armar el de cada vuelta con un join
+    mark = json.dumps(ROUND_MARK)[1:-1].encode("ascii")
+    bodies = [body.split(mark) for body in bodies]
+
+    latencies: List[int] = []
+    statuses: Dict[int, int] = {}
+    started = time.perf_counter()
+    deadline = started + duration
+    await asyncio.gather(*(
+        _worker(host, port, bodies, path, deadline, latencies, statuses, offset, connections)
+        for offset in range(connections)
+    ))
+    elapsed = time.perf_counter() - started
+
+    ordered = sorted(latencies)
+
+    def percentile(fraction: float) -> float:
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] / 1e6 if ordered else 0.0
+
+    return {
+        "requests": len(latencies),
+        "books": len(latencies) * (batch_size or 1),
+        "seconds": elapsed,
+        "requests_per_second": len(latencies) / elapsed,
+        "books_per_second": len(latencies) * (batch_size or 1) / elapsed,
+        "p50_ms": percentile(0.50),
+        "p99_ms": percentile(0.99),
+        "statuses": statuses,
+    }
+
+
+def main(argv=None) -> int:
+    """Punto de entrada de línea de comandos"""
+    parser = argparse.ArgumentParser(description="Generador de carga HTTP de Biblioteca SaberX")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--connections", type=int, default=16, help="Conexiones keep-alive concurrentes")
+    parser.add_argument("--duration", type=float, default=10.0, help="Duración en segundos")
+    parser.add_argument("--batch-size", type=int, default=0, help="Libros por solicitud (0 = /books)")
+    args = parser.parse_args(argv)
+
+    result = asyncio.run(run_load(args.host, args.port, args.connections, args.duration, args.batch_size))
+    print(json.dumps(result, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+"""
+Benchmark del journal con commit en grupo
+
+Mide la latencia de ``BookRegistrationUseCase.execute`` sobre un
+``JournaledBookRepository``, el rendimiento del registro por lotes, el tiempo de
+un snapshot y el de la recuperación al reabrir (snapshot más la cola del journal).
+
+Uso:
+    python -m benchmarks.journal_recovery --books 1000000 --tail 50000
+    python -m benchmarks.journal_recovery --sync-every 100 --sync-interval-ms 2
+"""
+
+import argparse
+import json
+import shutil
+import sys
+import tempfile
+import time
+from typing import Dict
+from application.use_cases import BookRegistrationUseCase
+from infrastructure.journal import JournaledBookRepository
+from .run import _percentiles
+from .synthetic import SyntheticCatalogGenerator
+
+
+def run(books: int = 200000, tail: int = 20000, latency_samples: int = 10000, sync_every: int = 1000,
+        sync_interval_ms: float = 10.0, directory: str = None, seed: int = 42) -> Dict:
+    """Registra ``books`` libros, toma un snapshot, agrega ``tail`` más y reabre el directorio"""
+    owned = directory is None
+    directory = directory or tempfile.mkdtemp(prefix="saberx-journal-")
+    try:
+        requests = list(SyntheticCatalogGenerator(seed).requests(books + tail + latency_samples))
+        repository = JournaledBookRepository(directory, sync_every, sync_interval_ms)
+        use_case = BookRegistrationUseCase(repository)
+
+        samples = []
+        for request in requests[:latency_samples]:
+            started = time.perf_counter_ns()
+            use_case.execute(request)
+            samples.append(time.perf_counter_ns() - started)
+
+        started = time.perf_counter()
+        for _ in use_case.execute_many(requests[latency_samples:latency_samples + books], include_book_info=False):
+            pass
+        bulk_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        repository.snapshot()
+        snapshot_seconds = time.perf_counter() - started
+
+        for _ in use_case.execute_many(requests[latency_samples + books:], include_book_info=False):
+            pass
+        repository.close()
+        syncs = repository.journal.syncs
+
+        started = time.perf_counter()
+        recovered = JournaledBookRepository(directory)
+        recovery_seconds = time.perf_counter() - started
+        result = {
+            "books": recovered.count(),
+            "execute_latency": _percentiles(samples),
+            "bulk_books_per_second": books / bulk_seconds,
+            "fsyncs": syncs,
+            "snapshot_seconds": snapshot_seconds,
+            "replayed_events": recovered.replayed_events,
+            "recovery_seconds": recovery_seconds,
+        }
+        recovered.close()
+        return result
+    finally:
+        if owned:
+            shutil.rmtree(directory, ignore_errors=True)
+
+
+def main(argv=None) -> int:
+    """Punto de entrada de línea de comandos"""
+    parser = argparse.ArgumentParser(description="Benchmark del journal de Biblioteca SaberX")
+    parser.add_argument("--books", type=int, default=200000, help="Libros antes del snapshot")
+    parser.add_argument("--tail", type=int, default=20000, help="Libros después del snapshot")
+    parser.add_argument("--latency-samples", type=int, default=10000, help="Registros individuales medidos")
+    parser.add_argument("--sync-every", type=int, default=1000, help="Eventos por fsync")
+    parser.add_argument("--sync-interval-ms", type=float, default=10.0, help="Tiempo máximo entre fsync")
+    parser.add_argument("--directory", default=None, help="Directorio del journal (por defecto, uno temporal)")
+    parser.add_argument("--json", action="store_true", help="Salida en JSON")
+    args = parser.parse_args(argv)
+
+    result = run(args.books, args.tail, args.latency_samples, args.sync_every,
+                 args.sync_interval_ms, args.directory)
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return 0
+    latency = result["execute_latency"]
+    print(f"execute: p50 {latency['p50_us']:.1f} µs, p99 {latency['p99_us']:.1f} µs")
+    print(f"registro por lotes: {result['bulk_books_per_second']:,.0f} libros/seg ({result['fsyncs']} fsync)")
+    print(f"snapshot: {result['snapshot_seconds']:.2f} s")
+    print(f"recuperación de {result['books']:,} libros: {result['recovery_seconds']:.2f} s "
+          f"({result['replayed_events']:,} eventos reproducidos)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
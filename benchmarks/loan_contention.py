@@ -0,0 +1,158 @@
+"""
+Benchmark de contención de préstamos y devoluciones
+
+Compara un candado global (``--stripes 1``) con candados por franjas variando la
+cantidad de hilos. Cada operación presta y devuelve una copia de un libro elegido
+con sesgo hacia un conjunto de libros populares.
+
+Con el catálogo en memoria todo el trabajo es CPU y el GIL limita el paralelismo;
+``--store-latency-ms`` agrega una espera por escritura (como un almacenamiento
+remoto) para observar cuánto escala cada estrategia cuando el candado se mantiene
+durante E/S.
+
+Uso:
+    python -m benchmarks.loan_contention --threads 1 2 4 8 16 --stripes 1 64
+    python -m benchmarks.loan_contention --store-latency-ms 0.5 --repository sqlite
+"""
+
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from typing import Dict, List, Sequence
+from application.loans import BookLoanUseCase
+from application.use_cases import BookRegistrationUseCase
+from domain.entities import Book
+from domain.repositories import BookRepository
+from .synthetic import SyntheticCatalogGenerator
+
+
+class _SlowStore:
+    """Envoltorio del repositorio que espera ``latency`` segundos en cada escritura"""
+
+    def __init__(self, repository: BookRepository, latency: float):
+        self._repository = repository
+        self._latency = latency
+
+    def count(self) -> int:
+        return self._repository.count()
+
+    def get(self, book_id: int):
+        return self._repository.get(book_id)
+
+    def update(self, book: Book) -> Book:
+        time.sleep(self._latency)
+        return self._repository.update(book)
+
+
+def _build_repository(kind: str, books: int, seed: int) -> BookRepository:
+    """Catálogo de prueba con libros siempre disponibles"""
+    if kind == "sqlite":
+        from infrastructure.sqlite_book_repository import SQLiteBookRepository
+        repository = SQLiteBookRepository()
+    else:
+        from infrastructure.columnar_catalog import ColumnarBookCatalog
+        repository = ColumnarBookCatalog()
+    requests = list(SyntheticCatalogGenerator(seed).requests(books))
+    for request in requests:
+        request.availability_status = "Disponible"
+        request.copies_count = 1000
+    for _ in BookRegistrationUseCase(repository).execute_many(requests, include_book_info=False):
+        pass
+    return repository
+
+
+def _choices(books: int, count: int, hot_books: int, hot_ratio: float, seed: int) -> List[int]:
+    """Identificadores a operar: ``hot_ratio`` de las operaciones cae en ``hot_books`` libros"""
+    rng = random.Random(seed)
+    return [
+        rng.randint(1, hot_books) if rng.random() < hot_ratio else rng.randint(1, books)
+        for _ in range(count)
+    ]
+
+
+def run_contention(repository, threads: int, stripes: int, operations: int,
+                   hot_books: int, hot_ratio: float, seed: int = 42) -> Dict:
+    """Ejecuta ``operations`` préstamos+devoluciones por hilo y mide el rendimiento"""
+    use_case = BookLoanUseCase(repository, stripes=stripes)
+    books = repository.count()
+    workloads = [_choices(books, operations, hot_books, hot_ratio, seed + thread) for thread in range(threads)]
+    failures = [0] * threads
+    barrier = threading.Barrier(threads + 1)
+
+    def worker(thread: int):
+        barrier.wait()
+        failed = 0
+        for book_id in workloads[thread]:
+            if not use_case.borrow(book_id).success:
+                failed += 1
+            if not use_case.return_copies(book_id).success:
+                failed += 1
+        failures[thread] = failed
+
+    pool = [threading.Thread(target=worker, args=(thread,)) for thread in range(threads)]
+    for thread in pool:
+        thread.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for thread in pool:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    total = threads * operations * 2
+    return {
+        "threads": threads,
+        "stripes": stripes,
+        "operations": total,
+        "failures": sum(failures),
+        "seconds": elapsed,
+        "operations_per_second": total / elapsed,
+    }
+
+
+def run(thread_counts: Sequence[int], stripe_counts: Sequence[int], repository_kind: str = "columnar",
+        books: int = 10000, operations: int = 2000, hot_books: int = 50, hot_ratio: float = 0.8,
+        store_latency_ms: float = 0.0, seed: int = 42) -> List[Dict]:
+    """Recorre todas las combinaciones de hilos y franjas sobre el mismo catálogo"""
+    repository = _build_repository(repository_kind, books, seed)
+    if store_latency_ms > 0:
+        repository = _SlowStore(repository, store_latency_ms / 1000)
+    results = []
+    for stripes in stripe_counts:
+        for threads in thread_counts:
+            results.append(run_contention(repository, threads, stripes, operations, hot_books, hot_ratio, seed))
+    return results
+
+
+def main(argv=None) -> int:
+    """Punto de entrada de línea de comandos"""
+    parser = argparse.ArgumentParser(description="Benchmark de contención de préstamos de Biblioteca SaberX")
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--stripes", type=int, nargs="+", default=[1, 64],
+                        help="Cantidad de franjas de candados (1 = candado global)")
+    parser.add_argument("--repository", choices=("columnar", "sqlite"), default="columnar")
+    parser.add_argument("--books", type=int, default=10000)
+    parser.add_argument("--operations", type=int, default=2000, help="Préstamos por hilo")
+    parser.add_argument("--hot-books", type=int, default=50, help="Libros populares")
+    parser.add_argument("--hot-ratio", type=float, default=0.8, help="Fracción de operaciones sobre libros populares")
+    parser.add_argument("--store-latency-ms", type=float, default=0.0,
+                        help="Espera simulada por escritura en el almacenamiento")
+    parser.add_argument("--json", action="store_true", help="Salida en JSON")
+    args = parser.parse_args(argv)
+
+    results = run(args.threads, args.stripes, args.repository, args.books, args.operations,
+                  args.hot_books, args.hot_ratio, args.store_latency_ms)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+    print(f"{'franjas':>8} {'hilos':>6} {'ops/seg':>12} {'fallos':>7}")
+    for result in results:
+        print(f"{result['stripes']:>8} {result['threads']:>6} "
+              f"{result['operations_per_second']:>12,.0f} {result['failures']:>7}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
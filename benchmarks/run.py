@@ -0,0 +1,184 @@
+"""
+Benchmarks de las capas de dominio y aplicación
+
+Uso:
+    python -m benchmarks.run --sizes 1000 100000 --output resultados.json
+    python -m benchmarks.run --compare resultados_anteriores.json
+"""
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+from application.use_cases import BookRegistrationUseCase
+from domain.value_objects import (
+    BookTitle, Author, PublicationYear, CopiesCount, BookSummary,
+    ValueObjectInterner
+)
+from .synthetic import SyntheticCatalogGenerator
+
+
+DEFAULT_SIZES = (1000, 100000)
+# Variación relativa a partir de la cual una métrica se considera regresión
+REGRESSION_THRESHOLD = 0.10
+
+
+def _percentiles(samples_ns: List[int]) -> Dict[str, float]:
+    """Percentiles de latencia en microsegundos"""
+    ordered = sorted(samples_ns)
+    count = len(ordered)
+
+    def at(fraction: float) -> float:
+        return ordered[min(count - 1, int(fraction * count))] / 1000
+
+    return {"p50_us": at(0.50), "p90_us": at(0.90), "p99_us": at(0.99),
+            "p999_us": at(0.999), "max_us": ordered[-1] / 1000}
+
+
+def _time_per_call(function: Callable, arguments: List, repeat: int = 3) -> float:
+    """Mejor tiempo medio por llamada, en nanosegundos"""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter_ns()
+        for argument in arguments:
+            function(argument)
+        best = min(best, (time.perf_counter_ns() - started) / len(arguments))
+    return best
+
+
+def run_microbenchmarks(count: int = 20000, seed: int = 42) -> Dict[str, float]:
+    """Costo por llamada (ns) de cada etapa del registro"""
+    requests = list(SyntheticCatalogGenerator(seed).requests(count))
+    use_case = BookRegistrationUseCase()
+    interned_use_case = BookRegistrationUseCase(interner=ValueObjectInterner())
+    books = [use_case.build_book(request) for request in requests]
+
+    return {
+        "book_title_ns": _time_per_call(lambda r: BookTitle(r.title), requests),
+        "author_ns": _time_per_call(lambda r: Author(r.author), requests),
+        "publication_year_ns": _time_per_call(lambda r: PublicationYear(r.publication_year), requests),
+        "copies_count_ns": _time_per_call(lambda r: CopiesCount(r.copies_count), requests),
+        "book_summary_ns": _time_per_call(lambda r: BookSummary(r.summary or ""), requests),
+        "convert_genre_ns": _time_per_call(lambda r: use_case._convert_genre(r.genre), requests),
+        "convert_categories_ns": _time_per_call(lambda r: use_case._convert_categories(r.categories), requests),
+        "convert_language_ns": _time_per_call(lambda r: use_case._convert_language(r.language), requests),
+        "convert_availability_ns": _time_per_call(
+            lambda r: use_case._convert_availability_status(r.availability_status), requests
+        ),
+        "build_book_ns": _time_per_call(use_case.build_book, requests),
+        "build_book_interned_ns": _time_per_call(interned_use_case.build_book, requests),
+        "get_display_info_ns": _time_per_call(lambda b: b.get_display_info(), books),
+        "execute_ns": _time_per_call(use_case.execute, requests),
+    }
+
+
+def run_end_to_end(size: int, seed: int = 42) -> Dict[str, float]:
+    """Rendimiento de extremo a extremo para un catálogo de ``size`` libros"""
+    use_case = BookRegistrationUseCase()
+    generator = SyntheticCatalogGenerator(seed)
+
+    # Latencia por solicitud con execute
+    latencies = []
+    started = time.perf_counter()
+    for request in generator.requests(size):
+        call_started = time.perf_counter_ns()
+        use_case.execute(request)
+        latencies.append(time.perf_counter_ns() - call_started)
+    execute_seconds = time.perf_counter() - started
+
+    # Rendimiento del registro masivo
+    started = time.perf_counter()
+    for _ in use_case.execute_many(generator.requests(size), include_book_info=False):
+        pass
+    bulk_seconds = time.perf_counter() - started
+
+    result = {
+        "size": size,
+        "execute_rows_per_second": size / execute_seconds,
+        "execute_many_rows_per_second": size / bulk_seconds,
+    }
+    result.update(_percentiles(latencies))
+    return result
+
+
+def _git_revision() -> Optional[str]:
+    """Revisión de git actual, si está disponible"""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(sizes=DEFAULT_SIZES, seed: int = 42, label: Optional[str] = None) -> Dict:
+    """Ejecuta todas las mediciones y devuelve un documento serializable a JSON"""
+    return {
+        "label": label,
+        "revision": _git_revision(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": seed,
+        "microbenchmarks": run_microbenchmarks(seed=seed),
+        "end_to_end": [run_end_to_end(size, seed) for size in sizes],
+    }
+
+
+def compare(current: Dict, baseline: Dict, threshold: float = REGRESSION_THRESHOLD) -> List[str]:
+    """Lista de regresiones entre dos resultados (tiempos más altos o tasas más bajas)"""
+    regressions = []
+    for name, value in current["microbenchmarks"].items():
+        previous = baseline.get("microbenchmarks", {}).get(name)
+        if previous and value > previous * (1 + threshold):
+            regressions.append(f"{name}: {previous:.0f} -> {value:.0f} ns")
+
+    previous_runs = {previous_run["size"]: previous_run for previous_run in baseline.get("end_to_end", [])}
+    for run_result in current["end_to_end"]:
+        previous = previous_runs.get(run_result["size"])
+        if not previous:
+            continue
+        for name, value in run_result.items():
+            old = previous.get(name)
+            if not old or name == "size":
+                continue
+            worse = value < old * (1 - threshold) if name.endswith("per_second") else value > old * (1 + threshold)
+            if worse:
+                regressions.append(f"{name}@{run_result['size']}: {old:,.1f} -> {value:,.1f}")
+    return regressions
+
+
+def main(argv=None) -> int:
+    """Punto de entrada de línea de comandos"""
+    parser = argparse.ArgumentParser(description="Benchmarks de Biblioteca SaberX")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES),
+                        help="Tamaños de catálogo para las corridas de extremo a extremo (p. ej. 1000 100000 1000000)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--label", help="Etiqueta de la versión medida")
+    parser.add_argument("--output", help="Archivo JSON donde guardar los resultados")
+    parser.add_argument("--compare", help="Resultados JSON anteriores para detectar regresiones")
+    args = parser.parse_args(argv)
+
+    results = run(args.sizes, args.seed, args.label)
+    document = json.dumps(results, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            handle.write(document)
+    else:
+        print(document)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as handle:
+            regressions = compare(results, json.load(handle))
+        for regression in regressions:
+            print(f"REGRESIÓN {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
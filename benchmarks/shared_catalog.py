@@ -0,0 +1,130 @@
+"""
+Benchmark del snapshot compartido del catálogo
+
+Publica un catálogo sintético en memoria compartida y arranca varios procesos
+que lo abren y recorren completo (columnas y textos). Informa cuánto tarda
+publicar y abrir, y la memoria privada (no compartida) de cada proceso según
+``/proc/self/smaps_rollup``. Después publica una generación nueva y mide cuánto
+tardan los procesos en pasar a ella.
+
+Uso:
+    python -m benchmarks.shared_catalog --books 1000000 --workers 4
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from typing import Dict
+from application.use_cases import BookRegistrationUseCase
+from infrastructure.columnar_catalog import ColumnarBookCatalog
+from infrastructure.shared_catalog import SharedBookCatalog, SharedCatalogPublisher
+from .synthetic import SyntheticCatalogGenerator
+
+
+def _private_kib() -> int:
+    """Memoria privada del proceso en KiB (0 si el sistema no expone smaps_rollup)"""
+    try:
+        with open("/proc/self/smaps_rollup") as handle:
+            return sum(int(line.split()[1]) for line in handle
+                       if line.startswith(("Private_Clean:", "Private_Dirty:")))
+    except OSError:
+        return 0
+
+
+def _worker(name: str, ready, switch, results):
+    """Abre el snapshot, lo recorre, informa y espera la generación siguiente"""
+    started = time.perf_counter()
+    catalog = SharedBookCatalog(name)
+    attach_seconds = time.perf_counter() - started
+    copies = sum(catalog.column("copies_count"))
+    text_bytes = sum(len(book.title.value) for book in catalog.iter_all())
+    results.put({
+        "generation": catalog.generation, "attach_seconds": attach_seconds,
+        "private_kib": _private_kib(), "copies": copies, "text_bytes": text_bytes,
+    })
+    ready.wait()
+    switch.wait()
+    started = time.perf_counter()
+    while True:
+        refreshed = catalog.refresh()
+        if refreshed is not catalog:
+            break
+        time.sleep(0.001)
+    switch_seconds = time.perf_counter() - started
+    catalog.close()
+    results.put({"generation": refreshed.generation, "count": refreshed.count(), "switch_seconds": switch_seconds})
+    refreshed.close()
+
+
+def run(books: int = 200000, workers: int = 4, seed: int = 42) -> Dict:
+    """Publica ``books`` libros, los abre desde ``workers`` procesos y publica una segunda generación"""
+    repository = ColumnarBookCatalog()
+    for _ in BookRegistrationUseCase(repository).execute_many(
+            SyntheticCatalogGenerator(seed).requests(books), include_book_info=False):
+        pass
+
+    name = f"saberx-bench-{os.getpid()}"
+    with SharedCatalogPublisher(name) as publisher:
+        started = time.perf_counter()
+        publisher.publish(repository.iter_all())
+        publish_seconds = time.perf_counter() - started
+
+        baseline = _private_kib()
+        context = multiprocessing.get_context("spawn")
+        ready = context.Barrier(workers + 1)
+        switch = context.Event()
+        results = context.Queue()
+        processes = [context.Process(target=_worker, args=(name, ready, switch, results)) for _ in range(workers)]
+        for process in processes:
+            process.start()
+        first = [results.get() for _ in processes]
+        ready.wait()
+
+        for _ in BookRegistrationUseCase(repository).execute_many(
+                SyntheticCatalogGenerator(seed + 1).requests(books // 10), include_book_info=False):
+            pass
+        publisher.publish(repository.iter_all())
+        switch.set()
+        second = [results.get() for _ in processes]
+        for process in processes:
+            process.join()
+
+    return {
+        "books": books,
+        "publish_seconds": publish_seconds,
+        "publisher_private_kib": baseline,
+        "attach_seconds": max(result["attach_seconds"] for result in first),
+        "worker_private_kib": [result["private_kib"] for result in first],
+        "switch_seconds": max(result["switch_seconds"] for result in second),
+        "generations": sorted({result["generation"] for result in second}),
+        "books_after_switch": second[0]["count"],
+    }
+
+
+def main(argv=None) -> int:
+    """Punto de entrada de línea de comandos"""
+    parser = argparse.ArgumentParser(description="Benchmark del snapshot compartido de Biblioteca SaberX")
+    parser.add_argument("--books", type=int, default=200000, help="Libros del catálogo")
+    parser.add_argument("--workers", type=int, default=4, help="Procesos lectores")
+    parser.add_argument("--json", action="store_true", help="Salida en JSON")
+    args = parser.parse_args(argv)
+
+    result = run(args.books, args.workers)
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return 0
+    print(f"publicar {result['books']:,} libros: {result['publish_seconds']:.2f} s")
+    print(f"abrir el snapshot: {result['attach_seconds'] * 1000:.2f} ms")
+    print(f"memoria privada del publicador: {result['publisher_private_kib'] / 1024:.0f} MiB")
+    print("memoria privada por lector tras recorrerlo: "
+          + ", ".join(f"{kib / 1024:.0f} MiB" for kib in result["worker_private_kib"]))
+    print(f"cambio a la generación {result['generations'][-1]} ({result['books_after_switch']:,} libros): "
+          f"{result['switch_seconds'] * 1000:.2f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
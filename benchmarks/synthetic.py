@@ -0,0 +1,157 @@
+import csv
+import json
+import random
+from pathlib import Path
+from typing import Iterator, List, Union
+from domain.dto import BookRegistrationRequest
+from domain.value_objects import Genre, Category, Language, AvailabilityStatus
+
+
+_TITLE_WORDS = (
+    "el", "la", "los", "de", "del", "en", "y", "una", "sombra", "viento", "ciudad",
+    "memoria", "historia", "tiempo", "noche", "mar", "silencio", "jardín", "camino",
+    "secreto", "luz", "guerra", "amor", "soledad", "ciencia", "universo", "código",
+    "república", "imperio", "río", "montaña", "casa", "espejo", "laberinto", "isla",
+    "invierno", "verano", "fuego", "palabra", "destino", "origen", "futuro", "máquina",
+)
+_FIRST_NAMES = (
+    "Gabriel", "Isabel", "Jorge", "Mario", "Julio", "Laura", "John", "Mary", "Victor",
+    "Albert", "Marguerite", "Thomas", "Hermann", "Franz", "Ana", "Lucía", "Carlos",
+    "Elena", "Pablo", "Rosa", "William", "Virginia", "Émile", "Günter",
+)
+_LAST_NAMES = (
+    "García Márquez", "Allende", "Borges", "Vargas Llosa", "Cortázar", "Smith",
+    "Johnson", "Brown", "Hugo", "Camus", "Duras", "Mann", "Hesse", "Kafka", "Pérez",
+    "Fernández", "Rodríguez", "López", "Martínez", "Woolf", "Zola", "Grass", "Neruda",
+)
+_SUMMARY_WORDS = _TITLE_WORDS + (
+    "narra", "cuenta", "explora", "describe", "familia", "generaciones", "pueblo",
+    "investigación", "descubrimiento", "viaje", "personaje", "protagonista", "época",
+    "conflicto", "sociedad", "naturaleza", "humanidad", "poder", "libertad", "muerte",
+)
+
+# Mezcla de categorías por género: (categorías, peso relativo)
+_CATEGORY_MIX = {
+    Genre.FICTION: (
+        ([Category.NOVEL], 60),
+        ([Category.POETRY], 15),
+        ([Category.NOVEL, Category.HISTORY], 12),
+        ([Category.NOVEL, Category.POETRY], 5),
+        ([Category.NOVEL, Category.SCIENCE], 5),
+        ([Category.POETRY, Category.BIOGRAPHY], 3),
+    ),
+    Genre.NON_FICTION: (
+        ([Category.HISTORY], 30),
+        ([Category.SCIENCE], 25),
+        ([Category.BIOGRAPHY], 15),
+        ([Category.TECHNOLOGY], 15),
+        ([Category.SCIENCE, Category.TECHNOLOGY], 10),
+        ([Category.HISTORY, Category.BIOGRAPHY], 5),
+    ),
+}
+_LANGUAGE_WEIGHTS = ((Language.SPANISH, 55), (Language.ENGLISH, 30),
+                     (Language.FRENCH, 9), (Language.GERMAN, 6))
+
+
+class SyntheticCatalogGenerator:
+    """Genera solicitudes de registro realistas y reproducibles a partir de una semilla
+
+    Los títulos tienen entre 1 y 8 palabras, los autores nombre y apellido(s) y el
+    resumen sigue una distribución sesgada (vacío en ~15% de los casos, hasta 1000
+    caracteres). Una fracción configurable de filas es inválida.
+    """
+
+    def __init__(self, seed: int = 42, invalid_ratio: float = 0.0):
+        self.seed = seed
+        self.invalid_ratio = invalid_ratio
+
+    def requests(self, count: int) -> Iterator[BookRegistrationRequest]:
+        """Genera perezosamente ``count`` solicitudes"""
+        rng = random.Random(self.seed)
+        for _ in range(count):
+            request = self._request(rng)
+            if self.invalid_ratio and rng.random() < self.invalid_ratio:
+                request = self._corrupt(rng, request)
+            yield request
+
+    def _request(self, rng: random.Random) -> BookRegistrationRequest:
+        """Construye una solicitud válida"""
+        genre = Genre.FICTION if rng.random() < 0.6 else Genre.NON_FICTION
+        categories = self._weighted(rng, _CATEGORY_MIX[genre])
+        copies = min(1000, int(rng.expovariate(1 / 4)))
+        available = copies > 0 and rng.random() < 0.8
+        return BookRegistrationRequest(
+            title=self._title(rng),
+            author=f"{rng.choice(_FIRST_NAMES)} {rng.choice(_LAST_NAMES)}",
+            publication_year=min(2024, max(1, int(rng.gauss(1975, 35)))),
+            genre=genre.value,
+            categories=[category.value for category in categories],
+            language=self._weighted(rng, _LANGUAGE_WEIGHTS).value,
+            availability_status=(AvailabilityStatus.AVAILABLE if available
+                                 else AvailabilityStatus.BORROWED).value,
+            copies_count=copies,
+            summary=self._summary(rng)
+        )
+
+    @staticmethod
+    def _weighted(rng: random.Random, options):
+        """Elige una opción según su peso"""
+        values, weights = zip(*options)
+        return rng.choices(values, weights=weights)[0]
+
+    @staticmethod
+    def _title(rng: random.Random) -> str:
+        """Título de 1 a 8 palabras"""
+        words = rng.choices(_TITLE_WORDS, k=rng.randint(1, 8))
+        return " ".join(words).capitalize()
+
+    @staticmethod
+    def _summary(rng: random.Random) -> str:
+        """Resumen con largo sesgado hacia textos cortos"""
+        if rng.random() < 0.15:
+            return ""
+        target = min(999, int(rng.lognormvariate(5.3, 0.7)))
+        words: List[str] = []
+        length = 0
+        while length < target:
+            word = rng.choice(_SUMMARY_WORDS)
+            words.append(word)
+            length += len(word) + 1
+        return " ".join(words)[:target].strip().capitalize() + "."
+
+    @staticmethod
+    def _corrupt(rng: random.Random, request: BookRegistrationRequest) -> BookRegistrationRequest:
+        """Introduce un error típico de catálogos sucios"""
+        kind = rng.randrange(5)
+        if kind == 0:
+            request.title = ""
+        elif kind == 1:
+            request.publication_year = rng.choice([0, 2100, -5])
+        elif kind == 2:
+            request.categories = []
+        elif kind == 3:
+            request.language = "Klingon"
+        else:
+            request.copies_count = -1
+        return request
+
+    def write_csv(self, path: Union[str, Path], count: int):
+        """Escribe un catálogo CSV compatible con ``read_csv_requests``"""
+        fields = ("title", "author", "publication_year", "genre", "categories",
+                  "language", "availability_status", "copies_count", "summary")
+        with open(path, "w", newline="", encoding="utf-8") as handle:
+            writer = csv.writer(handle)
+            writer.writerow(fields)
+            for request in self.requests(count):
+                writer.writerow((
+                    request.title, request.author, request.publication_year, request.genre,
+                    ";".join(request.categories), request.language,
+                    request.availability_status, request.copies_count, request.summary
+                ))
+
+    def write_jsonl(self, path: Union[str, Path], count: int):
+        """Escribe un catálogo JSONL compatible con ``read_jsonl_requests``"""
+        with open(path, "w", encoding="utf-8") as handle:
+            for request in self.requests(count):
+                handle.write(json.dumps(request.__dict__, ensure_ascii=False))
+                handle.write("\n")
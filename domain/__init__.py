@@ -5,15 +5,29 @@ Módulo de dominio - Contiene las entidades, objetos de valor y DTOs del negocio
 from .entities import Book
 from .value_objects import (
     Genre, Category, Language, AvailabilityStatus,
-    BookTitle, Author, PublicationYear, CopiesCount, BookSummary
+    BookTitle, Author, PublicationYear, CopiesCount, BookSummary,
+    ValueObjectInterner
 )
-from .dto import BookRegistrationRequest, BookRegistrationResponse
+from .dto import (
+    BookRegistrationRequest, MalformedRowRequest, BookRegistrationResponse, BulkRegistrationStats, RejectionReport,
+    LoanResponse, BookQuery, ExportStats, SyncReport
+)
+from .validation import ValidationErrorCode, BatchRejectedError, validate_request
 from .services import BookValidationService, LibraryManagementService
+from .repositories import BookRepository, LoanLedger
+from .codes import categories_to_mask, mask_to_categories
+from .language_matcher import LanguageIndicatorMatcher
 
 __all__ = [
     'Book',
     'Genre', 'Category', 'Language', 'AvailabilityStatus',
     'BookTitle', 'Author', 'PublicationYear', 'CopiesCount', 'BookSummary',
-    'BookRegistrationRequest', 'BookRegistrationResponse',
-    'BookValidationService', 'LibraryManagementService'
+    'ValueObjectInterner',
+    'BookRegistrationRequest', 'MalformedRowRequest', 'BookRegistrationResponse', 'BulkRegistrationStats', 'RejectionReport',
+    'LoanResponse', 'BookQuery', 'ExportStats', 'SyncReport',
+    'ValidationErrorCode', 'BatchRejectedError', 'validate_request',
+    'BookValidationService', 'LibraryManagementService',
+    'BookRepository', 'LoanLedger',
+    'categories_to_mask', 'mask_to_categories',
+    'LanguageIndicatorMatcher'
 ]
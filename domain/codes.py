@@ -0,0 +1,38 @@
+from typing import Dict, Iterable, Set, Tuple
+from .value_objects import Genre, Category, Language, AvailabilityStatus
+
+
+# Códigos compactos (uint8) de cada enum: el código es la posición en la declaración.
+# No reordenar los miembros de los enums: los códigos se persisten en formatos binarios.
+GENRES: Tuple[Genre, ...] = tuple(Genre)
+LANGUAGES: Tuple[Language, ...] = tuple(Language)
+AVAILABILITY_STATUSES: Tuple[AvailabilityStatus, ...] = tuple(AvailabilityStatus)
+CATEGORIES: Tuple[Category, ...] = tuple(Category)
+
+GENRE_CODES: Dict[Genre, int] = {genre: code for code, genre in enumerate(GENRES)}
+LANGUAGE_CODES: Dict[Language, int] = {language: code for code, language in enumerate(LANGUAGES)}
+AVAILABILITY_CODES: Dict[AvailabilityStatus, int] = {
+    status: code for code, status in enumerate(AVAILABILITY_STATUSES)
+}
+
+# Cada categoría ocupa un bit: el conjunto completo cabe en una máscara de 6 bits
+CATEGORY_BITS: Dict[Category, int] = {category: 1 << bit for bit, category in enumerate(CATEGORIES)}
+CATEGORY_MASK_LIMIT = 1 << len(CATEGORIES)
+
+_CATEGORIES_BY_MASK: Tuple[frozenset, ...] = tuple(
+    frozenset(category for category, bit in CATEGORY_BITS.items() if mask & bit)
+    for mask in range(CATEGORY_MASK_LIMIT)
+)
+
+
+def categories_to_mask(categories: Iterable[Category]) -> int:
+    """Convierte un conjunto de categorías en su máscara de bits"""
+    mask = 0
+    for category in categories:
+        mask |= CATEGORY_BITS[category]
+    return mask
+
+
+def mask_to_categories(mask: int) -> Set[Category]:
+    """Convierte una máscara de bits en un nuevo set de categorías"""
+    return set(_CATEGORIES_BY_MASK[mask])
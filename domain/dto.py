@@ -1,5 +1,5 @@
-from dataclasses import dataclass
-from typing import List, Optional
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
 
 
 @dataclass
@@ -16,9 +16,194 @@ class BookRegistrationRequest:
     summary: Optional[str] = ""
 
 
+@dataclass
+class MalformedRowRequest(BookRegistrationRequest):
+    """Fila de un archivo que no se pudo leer como solicitud (JSON inválido o que no es un objeto)
+
+    Viaja por la importación como cualquier otra fila y se rechaza sola, con
+    ``error`` (el motivo con su número de línea) como mensaje.
+    """
+    line_number: int = 0
+    reason: str = ""
+
+    @classmethod
+    def at_line(cls, line_number: int, reason: str) -> "MalformedRowRequest":
+        return cls(title="", author="", publication_year=None, genre="", categories=[], language="",
+                   availability_status="", copies_count=None, summary="",
+                   line_number=line_number, reason=reason)
+
+    @property
+    def error(self) -> str:
+        return f"Línea {self.line_number}: {self.reason}"
+
+
 @dataclass
 class BookRegistrationResponse:
     """DTO para respuesta de registro de libro"""
     success: bool
     message: str
     book_info: Optional[str] = None
+    error_codes: Optional[List[str]] = None
+
+
+@dataclass
+class LoanResponse:
+    """DTO para respuesta de préstamo o devolución de copias"""
+    success: bool
+    message: str
+    book_id: Optional[int] = None
+    copies_available: Optional[int] = None
+    availability_status: Optional[str] = None
+
+
+@dataclass
+class BulkRegistrationStats:
+    """DTO con las estadísticas de un registro masivo de libros"""
+    processed: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    elapsed_seconds: float = 0.0
+    
+    @property
+    def rows_per_second(self) -> float:
+        """Filas procesadas por segundo"""
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return self.processed / self.elapsed_seconds
+    
+    def record_batch(self, responses: List[BookRegistrationResponse], elapsed_seconds: float) -> None:
+        """Acumula el resultado de un bloque de respuestas"""
+        succeeded = sum(1 for response in responses if response.success)
+        self.processed += len(responses)
+        self.succeeded += succeeded
+        self.failed += len(responses) - succeeded
+        self.elapsed_seconds = elapsed_seconds
+
+
+@dataclass
+class ExportStats:
+    """DTO con las estadísticas de una exportación del catálogo"""
+    books: int = 0
+    bytes_written: int = 0
+    elapsed_seconds: float = 0.0
+    
+    @property
+    def books_per_second(self) -> float:
+        """Libros escritos por segundo"""
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return self.books / self.elapsed_seconds
+    
+    @property
+    def megabytes_per_second(self) -> float:
+        """MB (10^6 bytes) escritos por segundo"""
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return self.bytes_written / 1e6 / self.elapsed_seconds
+
+
+@dataclass
+class RejectionReport:
+    """DTO con las filas rechazadas de una importación y sus códigos de error
+    
+    ``rows`` guarda como máximo ``max_rows`` filas (None = sin límite); los conteos
+    por código cubren siempre todas las filas rechazadas.
+    """
+    processed: int = 0
+    rejected: int = 0
+    code_counts: Dict[str, int] = field(default_factory=dict)
+    rows: List[Dict[str, Any]] = field(default_factory=list)
+    max_rows: Optional[int] = None
+    
+    @property
+    def error_rate(self) -> float:
+        """Fracción de filas rechazadas"""
+        if self.processed == 0:
+            return 0.0
+        return self.rejected / self.processed
+    
+    def record_rejection(self, row_number: int, codes: List[str]) -> None:
+        """Agrega una fila rechazada (``processed`` se actualiza aparte)"""
+        self.rejected += 1
+        for code in codes:
+            self.code_counts[code] = self.code_counts.get(code, 0) + 1
+        if self.max_rows is None or len(self.rows) < self.max_rows:
+            self.rows.append({"row": row_number, "codes": codes})
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Representación serializable a JSON"""
+        return {
+            "processed": self.processed,
+            "rejected": self.rejected,
+            "error_rate": self.error_rate,
+            "code_counts": dict(sorted(self.code_counts.items())),
+            "rows": list(self.rows),
+            "rows_truncated": self.rejected > len(self.rows),
+        }
+
+
+@dataclass
+class SyncReport:
+    """DTO con las diferencias aplicadas por una sincronización del catálogo
+    
+    ``failures`` guarda como máximo ``max_failures`` filas con error (None = sin
+    límite); ``failed`` las cuenta todas.
+    """
+    processed: int = 0
+    unchanged: int = 0
+    inserted: int = 0
+    updated: int = 0
+    deleted: int = 0
+    failed: int = 0
+    elapsed_seconds: float = 0.0
+    failures: List[Dict[str, Any]] = field(default_factory=list)
+    max_failures: Optional[int] = 1000
+    
+    @property
+    def rows_per_second(self) -> float:
+        """Filas del archivo procesadas por segundo"""
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return self.processed / self.elapsed_seconds
+    
+    def record_failure(self, row_number: int, message: str) -> None:
+        """Agrega una fila que no se pudo aplicar"""
+        self.failed += 1
+        if self.max_failures is None or len(self.failures) < self.max_failures:
+            self.failures.append({"row": row_number, "message": message})
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Representación serializable a JSON"""
+        return {
+            "processed": self.processed,
+            "unchanged": self.unchanged,
+            "inserted": self.inserted,
+            "updated": self.updated,
+            "deleted": self.deleted,
+            "failed": self.failed,
+            "elapsed_seconds": self.elapsed_seconds,
+            "failures": list(self.failures),
+            "failures_truncated": self.failed > len(self.failures),
+        }
+
+
+@dataclass
+class BookQuery:
+    """DTO para consultar el catálogo por varios criterios (los omitidos no filtran)
+    
+    ``categories`` exige todas las indicadas. ``cursor`` es el ``next_cursor`` de la
+    página anterior con el mismo orden.
+    """
+    genre: Optional[str] = None
+    language: Optional[str] = None
+    availability_status: Optional[str] = None
+    categories: List[str] = field(default_factory=list)
+    year_from: Optional[int] = None
+    year_to: Optional[int] = None
+    min_copies: Optional[int] = None
+    title_contains: Optional[str] = None
+    author_contains: Optional[str] = None
+    order_by: str = "book_id"
+    descending: bool = False
+    limit: int = 20
+    cursor: Optional[str] = None
@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import Set
+from typing import Optional, Set
 from .value_objects import (
     BookTitle, Author, PublicationYear, Genre, Category, 
     Language, AvailabilityStatus, CopiesCount, BookSummary
@@ -18,12 +18,15 @@ class Book:
     availability_status: AvailabilityStatus
     copies_count: CopiesCount
     summary: BookSummary
+    book_id: Optional[int] = None
+    
+    MAX_CATEGORIES = 5
     
     def __post_init__(self):
         if not self.categories:
             raise ValueError("El libro debe tener al menos una categoría")
-        if len(self.categories) > 5:
-            raise ValueError("El libro no puede tener más de 5 categorías")
+        if len(self.categories) > self.MAX_CATEGORIES:
+            raise ValueError(f"El libro no puede tener más de {self.MAX_CATEGORIES} categorías")
     
     def is_available(self) -> bool:
         """Verifica si el libro está disponible"""
@@ -0,0 +1,112 @@
+from collections import deque
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Union
+from .value_objects import Language
+
+
+# Indicadores por defecto; el orden de las claves define la prioridad ante empates
+DEFAULT_LANGUAGE_INDICATORS: Dict[Language, List[str]] = {
+    Language.SPANISH: ['garcía', 'márquez', 'allende', 'borges', 'vargas', 'llosa'],
+    Language.ENGLISH: ['smith', 'johnson', 'brown', 'davis', 'miller', 'wilson'],
+    Language.FRENCH: ['dumas', 'hugo', 'flaubert', 'proust', 'camus', 'sartre'],
+    Language.GERMAN: ['goethe', 'schiller', 'mann', 'kafka', 'hesse', 'brecht'],
+}
+
+
+def load_indicator_dictionary(path: Union[str, Path], encoding: str = "utf-8") -> List[str]:
+    """Carga un diccionario de indicadores: una palabra por línea, '#' para comentarios"""
+    indicators = []
+    with open(path, encoding=encoding) as handle:
+        for line in handle:
+            word = line.split("#", 1)[0].strip()
+            if word:
+                indicators.append(word)
+    return indicators
+
+
+class LanguageIndicatorMatcher:
+    """Autómata Aho-Corasick que busca todos los indicadores de idioma en una sola pasada
+
+    Se compila una vez a partir de los diccionarios; el costo de cada búsqueda depende
+    del largo del nombre y no de la cantidad de indicadores cargados.
+    """
+
+    def __init__(self, dictionaries: Mapping[Language, Iterable[str]],
+                 default_language: Language = Language.SPANISH):
+        self.default_language = default_language
+        self.languages = tuple(dictionaries)
+        self._transitions: List[Dict[str, int]] = [{}]
+        self._outputs: List[int] = [0]
+        for priority, language in enumerate(self.languages):
+            for indicator in dictionaries[language]:
+                self._add_pattern(indicator.lower(), 1 << priority)
+        self._fail = self._build_failure_links()
+
+    @classmethod
+    def from_files(cls, paths: Mapping[Language, Union[str, Path]],
+                   default_language: Language = Language.SPANISH) -> "LanguageIndicatorMatcher":
+        """Compila el autómata a partir de un archivo de diccionario por idioma"""
+        return cls(
+            {language: load_indicator_dictionary(path) for language, path in paths.items()},
+            default_language
+        )
+
+    def _add_pattern(self, pattern: str, output: int):
+        """Inserta un patrón en el trie"""
+        if not pattern:
+            return
+        node = 0
+        for char in pattern:
+            next_node = self._transitions[node].get(char)
+            if next_node is None:
+                next_node = len(self._transitions)
+                self._transitions[node][char] = next_node
+                self._transitions.append({})
+                self._outputs.append(0)
+            node = next_node
+        self._outputs[node] |= output
+
+    def _build_failure_links(self) -> List[int]:
+        """Calcula los enlaces de fallo por recorrido en anchura y propaga las salidas"""
+        fail = [0] * len(self._transitions)
+        queue = deque(self._transitions[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._transitions[node].items():
+                fallback = fail[node]
+                while fallback and char not in self._transitions[fallback]:
+                    fallback = fail[fallback]
+                candidate = self._transitions[fallback].get(char, 0)
+                fail[child] = candidate if candidate != child else 0
+                self._outputs[child] |= self._outputs[fail[child]]
+                queue.append(child)
+        return fail
+
+    def match_mask(self, text: str) -> int:
+        """Máscara con un bit por idioma cuyos indicadores aparecen en el texto"""
+        transitions = self._transitions
+        outputs = self._outputs
+        fail = self._fail
+        node = 0
+        mask = 0
+        for char in text.lower():
+            while node and char not in transitions[node]:
+                node = fail[node]
+            node = transitions[node].get(char, 0)
+            mask |= outputs[node]
+            if mask & 1:
+                # El idioma de mayor prioridad ya apareció: no hace falta seguir
+                break
+        return mask
+
+    def suggest(self, author_name: str) -> Language:
+        """Sugiere el idioma de mayor prioridad entre los indicadores encontrados"""
+        mask = self.match_mask(author_name)
+        if not mask:
+            return self.default_language
+        return self.languages[(mask & -mask).bit_length() - 1]
+
+    def suggest_many(self, author_names: Iterable[str]) -> List[Language]:
+        """Sugiere idiomas para una columna completa de autores"""
+        suggest = self.suggest
+        return [suggest(name) for name in author_names]
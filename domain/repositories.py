@@ -0,0 +1,67 @@
+from abc import ABC, abstractmethod
+from typing import Iterable, Iterator, List, Optional
+from .entities import Book
+
+
+# Campos por los que se puede ordenar una página de libros
+BOOK_SORT_FIELDS = (
+    "book_id", "title", "author", "publication_year", "genre",
+    "language", "availability_status", "copies_count"
+)
+
+
+class BookRepository(ABC):
+    """Puerto de persistencia para la entidad Book"""
+    
+    @abstractmethod
+    def save(self, book: Book) -> Book:
+        """Guarda un libro y devuelve la entidad con su identificador asignado"""
+    
+    @abstractmethod
+    def save_many(self, books: Iterable[Book]) -> List[Book]:
+        """Guarda varios libros en una sola operación atómica"""
+    
+    @abstractmethod
+    def update(self, book: Book) -> Book:
+        """Reemplaza el libro con el mismo identificador; ValueError si no existe"""
+    
+    @abstractmethod
+    def delete_many(self, book_ids: Iterable[int]) -> int:
+        """Elimina los libros indicados en una sola operación atómica; devuelve cuántos existían"""
+    
+    @abstractmethod
+    def get(self, book_id: int) -> Optional[Book]:
+        """Obtiene un libro por su identificador"""
+    
+    @abstractmethod
+    def count(self) -> int:
+        """Cantidad de libros almacenados"""
+    
+    @abstractmethod
+    def iter_all(self) -> Iterator[Book]:
+        """Recorre perezosamente todos los libros en orden de identificador"""
+    
+    def iter_by_year(self, publication_year: int) -> Iterator[Book]:
+        """Recorre los libros de un año de publicación (por defecto, filtrando iter_all)"""
+        return (book for book in self.iter_all() if book.publication_year.value == publication_year)
+    
+    @abstractmethod
+    def find_page(self, offset: int, limit: int, order_by: str = "book_id",
+                  descending: bool = False) -> List[Book]:
+        """Obtiene una ventana de libros ordenada por uno de BOOK_SORT_FIELDS"""
+
+
+class LoanLedger(ABC):
+    """Puerto del registro de copias prestadas por libro
+
+    Acota las devoluciones a lo efectivamente prestado. Quien lo usa serializa las
+    operaciones de un mismo libro (candado de su franja).
+    """
+
+    @abstractmethod
+    def on_loan(self, book_id: int) -> int:
+        """Copias del libro prestadas y todavía no devueltas"""
+
+    @abstractmethod
+    def record(self, book_id: int, delta: int):
+        """Suma ``delta`` copias prestadas (negativo al devolver)"""
@@ -1,22 +1,101 @@
-from typing import Set
+from typing import Iterable, List, Sequence, Set, Tuple
+from .entities import Book
 from .value_objects import Category, Genre, Language, AvailabilityStatus
+from .codes import GENRES, GENRE_CODES, CATEGORY_BITS, CATEGORY_MASK_LIMIT, categories_to_mask
+from .language_matcher import DEFAULT_LANGUAGE_INDICATORS, LanguageIndicatorMatcher
+
+
+FICTION_CATEGORIES_MASK = categories_to_mask({Category.NOVEL, Category.POETRY})
+NON_FICTION_CATEGORIES_MASK = categories_to_mask(
+    {Category.SCIENCE, Category.HISTORY, Category.BIOGRAPHY, Category.TECHNOLOGY}
+)
+
+# Ubicaciones posibles; el código de estante es la posición en esta tupla
+SHELF_LOCATIONS: Tuple[str, ...] = (
+    "Sección A - Novelas",
+    "Sección B - Poesía",
+    "Sección C - Ficción General",
+    "Sección D - Ciencias",
+    "Sección E - Historia",
+    "Sección F - Biografías",
+    "Sección G - Tecnología",
+    "Sección H - No Ficción General",
+)
+
+# Prioridad de categorías para ubicar cada género: (bit de categoría, código de estante)
+_SHELF_PRIORITY = {
+    Genre.FICTION: (
+        (CATEGORY_BITS[Category.NOVEL], 0),
+        (CATEGORY_BITS[Category.POETRY], 1),
+    ),
+    Genre.NON_FICTION: (
+        (CATEGORY_BITS[Category.SCIENCE], 3),
+        (CATEGORY_BITS[Category.HISTORY], 4),
+        (CATEGORY_BITS[Category.BIOGRAPHY], 5),
+        (CATEGORY_BITS[Category.TECHNOLOGY], 6),
+    ),
+}
+_SHELF_FALLBACK = {Genre.FICTION: 2, Genre.NON_FICTION: 7}
+
+
+def _build_shelf_code(genre: Genre, mask: int) -> int:
+    """Calcula el código de estante para un género y una máscara de categorías"""
+    for bit, shelf_code in _SHELF_PRIORITY[genre]:
+        if mask & bit:
+            return shelf_code
+    return _SHELF_FALLBACK[genre]
+
+
+# Tablas precalculadas indexadas por código_de_género * CATEGORY_MASK_LIMIT + máscara
+_VALID_COMBINATION_TABLE: Tuple[bool, ...] = tuple(
+    bool(mask & (FICTION_CATEGORIES_MASK if genre == Genre.FICTION else NON_FICTION_CATEGORIES_MASK))
+    for genre in GENRES for mask in range(CATEGORY_MASK_LIMIT)
+)
+_SHELF_CODE_TABLE: Tuple[int, ...] = tuple(
+    _build_shelf_code(genre, mask)
+    for genre in GENRES for mask in range(CATEGORY_MASK_LIMIT)
+)
+
+
+def _lookup_batch(table: Tuple, genre_codes: Sequence[int], category_masks: Sequence[int]):
+    """Consulta una tabla para columnas completas de códigos y máscaras
+
+    Acepta cualquier secuencia (listas, ``array.array``); si recibe arrays de NumPy
+    la consulta se vectoriza y devuelve un array de NumPy.
+    """
+    if len(genre_codes) != len(category_masks):
+        raise ValueError("Las columnas de géneros y categorías deben tener el mismo largo")
+    if hasattr(genre_codes, "__array__") and hasattr(category_masks, "__array__"):
+        import numpy as np
+        indexes = np.asarray(genre_codes, dtype=np.intp) * CATEGORY_MASK_LIMIT + category_masks
+        return np.asarray(table)[indexes]
+    return [table[genre * CATEGORY_MASK_LIMIT + mask] for genre, mask in zip(genre_codes, category_masks)]
 
 
 class BookValidationService:
     """Servicio para validaciones específicas de libros"""
     
+    # Autómata de indicadores de idioma, compilado una sola vez
+    language_matcher = LanguageIndicatorMatcher(DEFAULT_LANGUAGE_INDICATORS)
+    
     @staticmethod
     def validate_categories_combination(categories: Set[Category], genre: Genre) -> bool:
         """Valida que las categorías seleccionadas sean coherentes con el género"""
-        fiction_categories = {Category.NOVEL, Category.POETRY}
-        non_fiction_categories = {Category.SCIENCE, Category.HISTORY, Category.BIOGRAPHY, Category.TECHNOLOGY}
-        
-        if genre == Genre.FICTION:
-            # Para ficción, debe tener al menos una categoría de ficción
-            return any(cat in fiction_categories for cat in categories)
-        else:
-            # Para no ficción, debe tener al menos una categoría de no ficción
-            return any(cat in non_fiction_categories for cat in categories)
+        # Ficción requiere al menos una categoría de ficción; no ficción, una de no ficción
+        return BookValidationService.validate_category_mask(
+            categories_to_mask(categories), GENRE_CODES[genre]
+        )
+    
+    @staticmethod
+    def validate_category_mask(category_mask: int, genre_code: int) -> bool:
+        """Valida la combinación a partir de la máscara de categorías y el código de género"""
+        return _VALID_COMBINATION_TABLE[genre_code * CATEGORY_MASK_LIMIT + category_mask]
+    
+    @staticmethod
+    def validate_categories_combination_batch(genre_codes: Sequence[int],
+                                              category_masks: Sequence[int]) -> List[bool]:
+        """Valida en lote columnas de códigos de género y máscaras de categorías"""
+        return _lookup_batch(_VALID_COMBINATION_TABLE, genre_codes, category_masks)
     
     @staticmethod
     def validate_availability_and_copies(availability: AvailabilityStatus, copies: int) -> bool:
@@ -25,24 +104,21 @@ class BookValidationService:
             return False  # No puede estar disponible si no hay copias
         return True
     
-    @staticmethod
-    def suggest_language_for_author(author_name: str) -> Language:
-        """Sugiere un idioma basado en el nombre del autor (lógica simple)"""
-        spanish_indicators = ['garcía', 'márquez', 'allende', 'borges', 'vargas', 'llosa']
-        english_indicators = ['smith', 'johnson', 'brown', 'davis', 'miller', 'wilson']
-        
-        author_lower = author_name.lower()
-        
-        for indicator in spanish_indicators:
-            if indicator in author_lower:
-                return Language.SPANISH
-                
-        for indicator in english_indicators:
-            if indicator in author_lower:
-                return Language.ENGLISH
-        
-        # Por defecto, español
-        return Language.SPANISH
+    @classmethod
+    def suggest_language_for_author(cls, author_name: str) -> Language:
+        """Sugiere un idioma basado en los indicadores presentes en el nombre del autor"""
+        # Sin coincidencias se usa el idioma por defecto (español)
+        return cls.language_matcher.suggest(author_name)
+    
+    @classmethod
+    def suggest_languages_for_authors(cls, author_names: Iterable[str]) -> List[Language]:
+        """Sugiere idiomas para una columna completa de autores"""
+        return cls.language_matcher.suggest_many(author_names)
+    
+    @classmethod
+    def configure_language_indicators(cls, matcher: LanguageIndicatorMatcher):
+        """Reemplaza el autómata de indicadores (p. ej. con diccionarios cargados de archivos)"""
+        cls.language_matcher = matcher
 
 
 class LibraryManagementService:
@@ -51,24 +127,26 @@ class LibraryManagementService:
     @staticmethod
     def calculate_shelf_location(genre: Genre, categories: Set[Category]) -> str:
         """Calcula la ubicación sugerida en la biblioteca"""
-        if genre == Genre.FICTION:
-            if Category.NOVEL in categories:
-                return "Sección A - Novelas"
-            elif Category.POETRY in categories:
-                return "Sección B - Poesía"
-            else:
-                return "Sección C - Ficción General"
-        else:
-            if Category.SCIENCE in categories:
-                return "Sección D - Ciencias"
-            elif Category.HISTORY in categories:
-                return "Sección E - Historia"
-            elif Category.BIOGRAPHY in categories:
-                return "Sección F - Biografías"
-            elif Category.TECHNOLOGY in categories:
-                return "Sección G - Tecnología"
-            else:
-                return "Sección H - No Ficción General"
+        shelf_code = LibraryManagementService.calculate_shelf_code(
+            categories_to_mask(categories), GENRE_CODES[genre]
+        )
+        return SHELF_LOCATIONS[shelf_code]
+    
+    @staticmethod
+    def calculate_shelf_code(category_mask: int, genre_code: int) -> int:
+        """Código de estante (posición en SHELF_LOCATIONS) para una máscara y un género"""
+        return _SHELF_CODE_TABLE[genre_code * CATEGORY_MASK_LIMIT + category_mask]
+    
+    @staticmethod
+    def calculate_shelf_codes_batch(genre_codes: Sequence[int],
+                                    category_masks: Sequence[int]) -> List[int]:
+        """Calcula en lote los códigos de estante de columnas completas"""
+        return _lookup_batch(_SHELF_CODE_TABLE, genre_codes, category_masks)
+    
+    @staticmethod
+    def estimate_book_reading_time(book: Book) -> str:
+        """Estima el tiempo de lectura con el largo guardado del resumen (no lo descomprime)"""
+        return LibraryManagementService.estimate_reading_time(book.summary.length, book.genre)
     
     @staticmethod
     def estimate_reading_time(summary_length: int, genre: Genre) -> str:
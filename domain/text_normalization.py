@@ -0,0 +1,35 @@
+"""
+Normalización de textos para comparar títulos y autores
+
+Pliega mayúsculas y acentos y reduce la puntuación a espacios, de modo que
+"García Márquez", "garcia  marquez" y "GARCÍA-MÁRQUEZ" producen el mismo texto.
+"""
+
+import re
+import unicodedata
+
+
+_NON_WORD = re.compile(r"[\W_]+")
+
+# Separador entre las partes de una clave; no puede aparecer en un texto plegado
+KEY_SEPARATOR = "\x1f"
+
+
+def _fold_accents(text: str) -> str:
+    """Quita las marcas diacríticas (la ñ queda como n)"""
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(character for character in decomposed if not unicodedata.combining(character))
+
+
+def fold_text(text: str) -> str:
+    """Texto en minúsculas, sin acentos, con la puntuación y los espacios reducidos a uno"""
+    if text.isascii():
+        folded = text.lower()
+    else:
+        folded = _fold_accents(text).casefold()
+    return " ".join(_NON_WORD.sub(" ", folded).split())
+
+
+def duplicate_key(title: str, author: str, publication_year: int) -> str:
+    """Clave normalizada que identifica un mismo libro: título, autor y año"""
+    return f"{fold_text(title)}{KEY_SEPARATOR}{fold_text(author)}{KEY_SEPARATOR}{publication_year}"
@@ -0,0 +1,166 @@
+"""
+Validación sin excepciones - Códigos de error estructurados por campo
+
+``validate_request`` aplica las mismas reglas que los objetos de valor y la entidad
+Book, pero en lugar de lanzar ``ValueError`` en el primer campo inválido devuelve
+todos los errores de la solicitud como códigos compactos.
+"""
+
+from enum import Enum
+from typing import Dict, List
+from .dto import BookRegistrationRequest, MalformedRowRequest, RejectionReport
+from .entities import Book
+from .value_objects import (
+    Genre, Category, Language, AvailabilityStatus,
+    BookTitle, Author, PublicationYear, CopiesCount, BookSummary
+)
+
+
+class ValidationErrorCode(Enum):
+    """Códigos de error de validación; la decena identifica el campo (E19x: duplicados, E20x: fila ilegible)"""
+    TITLE_MISSING = "E101"
+    TITLE_TOO_LONG = "E102"
+    AUTHOR_MISSING = "E111"
+    AUTHOR_TOO_LONG = "E112"
+    YEAR_NOT_INTEGER = "E121"
+    YEAR_OUT_OF_RANGE = "E122"
+    GENRE_INVALID = "E131"
+    CATEGORIES_EMPTY = "E141"
+    CATEGORIES_TOO_MANY = "E142"
+    CATEGORY_INVALID = "E143"
+    LANGUAGE_INVALID = "E151"
+    STATUS_INVALID = "E161"
+    COPIES_NOT_INTEGER = "E171"
+    COPIES_NEGATIVE = "E172"
+    COPIES_TOO_MANY = "E173"
+    SUMMARY_NOT_TEXT = "E181"
+    SUMMARY_TOO_LONG = "E182"
+    DUPLICATE_BOOK = "E191"
+    ROW_MALFORMED = "E201"
+
+
+ERROR_MESSAGES: Dict[ValidationErrorCode, str] = {
+    ValidationErrorCode.TITLE_MISSING: "El título no puede estar vacío",
+    ValidationErrorCode.TITLE_TOO_LONG: f"El título no puede exceder {BookTitle.MAX_LENGTH} caracteres",
+    ValidationErrorCode.AUTHOR_MISSING: "El autor no puede estar vacío",
+    ValidationErrorCode.AUTHOR_TOO_LONG: f"El nombre del autor no puede exceder {Author.MAX_LENGTH} caracteres",
+    ValidationErrorCode.YEAR_NOT_INTEGER: "El año debe ser un número válido",
+    ValidationErrorCode.YEAR_OUT_OF_RANGE: (
+        f"El año de publicación debe estar entre {PublicationYear.MIN_YEAR} y {PublicationYear.MAX_YEAR}"
+    ),
+    ValidationErrorCode.GENRE_INVALID: "Género no válido",
+    ValidationErrorCode.CATEGORIES_EMPTY: "El libro debe tener al menos una categoría",
+    ValidationErrorCode.CATEGORIES_TOO_MANY: f"El libro no puede tener más de {Book.MAX_CATEGORIES} categorías",
+    ValidationErrorCode.CATEGORY_INVALID: "Categoría no válida",
+    ValidationErrorCode.LANGUAGE_INVALID: "Idioma no válido",
+    ValidationErrorCode.STATUS_INVALID: "Estado de disponibilidad no válido",
+    ValidationErrorCode.COPIES_NOT_INTEGER: "El número de copias debe ser un número válido",
+    ValidationErrorCode.COPIES_NEGATIVE: "El número de copias no puede ser negativo",
+    ValidationErrorCode.COPIES_TOO_MANY: f"El número de copias no puede exceder {CopiesCount.MAX_COPIES}",
+    ValidationErrorCode.SUMMARY_NOT_TEXT: "El resumen debe ser texto",
+    ValidationErrorCode.SUMMARY_TOO_LONG: f"El resumen no puede exceder {BookSummary.MAX_LENGTH} caracteres",
+    ValidationErrorCode.DUPLICATE_BOOK: "Ya existe un libro con el mismo título, autor y año",
+    ValidationErrorCode.ROW_MALFORMED: "La fila no es un objeto JSON válido",
+}
+
+# Campo de la solicitud al que pertenece cada código (mismos nombres que las métricas)
+ERROR_FIELDS: Dict[ValidationErrorCode, str] = {
+    code: field
+    for field, prefix in (
+        ("title", "E10"), ("author", "E11"), ("publication_year", "E12"), ("genre", "E13"),
+        ("categories", "E14"), ("language", "E15"), ("availability_status", "E16"),
+        ("copies_count", "E17"), ("summary", "E18"), ("duplicate", "E19"), ("row", "E20"),
+    )
+    for code in ValidationErrorCode if code.value.startswith(prefix)
+}
+
+_GENRE_VALUES = frozenset(genre.value for genre in Genre)
+_CATEGORY_VALUES = frozenset(category.value for category in Category)
+_LANGUAGE_VALUES = frozenset(language.value for language in Language)
+_STATUS_VALUES = frozenset(status.value for status in AvailabilityStatus)
+
+
+class BatchRejectedError(Exception):
+    """Se superó el umbral de errores de una importación; el lote en curso no se guardó"""
+
+    def __init__(self, report: RejectionReport, max_error_rate: float):
+        super().__init__(
+            f"Importación detenida: {report.rejected} de {report.processed} filas rechazadas "
+            f"({report.error_rate:.1%} supera el máximo de {max_error_rate:.1%})"
+        )
+        self.report = report
+        self.max_error_rate = max_error_rate
+
+
+def validate_request(request: BookRegistrationRequest) -> List[ValidationErrorCode]:
+    """Devuelve todos los errores de la solicitud (lista vacía si es válida), sin lanzar excepciones"""
+    if isinstance(request, MalformedRowRequest):
+        return [ValidationErrorCode.ROW_MALFORMED]
+    errors: List[ValidationErrorCode] = []
+
+    title = request.title
+    if not isinstance(title, str) or not (title := title.strip()):
+        errors.append(ValidationErrorCode.TITLE_MISSING)
+    elif len(title) > BookTitle.MAX_LENGTH:
+        errors.append(ValidationErrorCode.TITLE_TOO_LONG)
+
+    author = request.author
+    if not isinstance(author, str) or not (author := author.strip()):
+        errors.append(ValidationErrorCode.AUTHOR_MISSING)
+    elif len(author) > Author.MAX_LENGTH:
+        errors.append(ValidationErrorCode.AUTHOR_TOO_LONG)
+
+    year = request.publication_year
+    if not isinstance(year, int):
+        errors.append(ValidationErrorCode.YEAR_NOT_INTEGER)
+    elif year < PublicationYear.MIN_YEAR or year > PublicationYear.MAX_YEAR:
+        errors.append(ValidationErrorCode.YEAR_OUT_OF_RANGE)
+
+    if not isinstance(request.genre, str) or request.genre not in _GENRE_VALUES:
+        errors.append(ValidationErrorCode.GENRE_INVALID)
+
+    categories = request.categories
+    if not categories:
+        errors.append(ValidationErrorCode.CATEGORIES_EMPTY)
+    elif not isinstance(categories, (list, tuple, set, frozenset)) or not _known_categories(categories):
+        errors.append(ValidationErrorCode.CATEGORY_INVALID)
+    elif len(categories) > Book.MAX_CATEGORIES and len(set(categories)) > Book.MAX_CATEGORIES:
+        # Las repetidas cuentan una vez, igual que el set de la entidad
+        errors.append(ValidationErrorCode.CATEGORIES_TOO_MANY)
+
+    if not isinstance(request.language, str) or request.language not in _LANGUAGE_VALUES:
+        errors.append(ValidationErrorCode.LANGUAGE_INVALID)
+
+    status = request.availability_status
+    if not isinstance(status, str) or status not in _STATUS_VALUES:
+        errors.append(ValidationErrorCode.STATUS_INVALID)
+
+    copies = request.copies_count
+    if not isinstance(copies, int):
+        errors.append(ValidationErrorCode.COPIES_NOT_INTEGER)
+    elif copies < 0:
+        errors.append(ValidationErrorCode.COPIES_NEGATIVE)
+    elif copies > CopiesCount.MAX_COPIES:
+        errors.append(ValidationErrorCode.COPIES_TOO_MANY)
+
+    summary = request.summary
+    if summary and not isinstance(summary, str):
+        errors.append(ValidationErrorCode.SUMMARY_NOT_TEXT)
+    elif summary and len(summary) > BookSummary.MAX_LENGTH:
+        errors.append(ValidationErrorCode.SUMMARY_TOO_LONG)
+
+    return errors
+
+
+def _known_categories(categories) -> bool:
+    """True si todas las categorías son valores válidos de Category"""
+    try:
+        return _CATEGORY_VALUES.issuperset(categories)
+    except TypeError:
+        # Algún elemento no es hashable, así que tampoco es una categoría
+        return False
+
+
+def describe_errors(codes: List[ValidationErrorCode]) -> str:
+    """Mensaje legible de una lista de códigos (solo para mostrar, no en el camino rápido)"""
+    return "; ".join(f"{code.value} {ERROR_MESSAGES[code]}" for code in codes)
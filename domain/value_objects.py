@@ -1,6 +1,9 @@
+import threading
+import weakref
+from collections import OrderedDict
 from enum import Enum
 from dataclasses import dataclass
-from typing import Set
+from typing import Any, Set, Type, TypeVar
 
 
 class Genre(Enum):
@@ -38,11 +41,13 @@ class BookTitle:
     """Título del libro"""
     value: str
     
+    MAX_LENGTH = 200
+    
     def __post_init__(self):
         if not self.value or not self.value.strip():
             raise ValueError("El título no puede estar vacío")
-        if len(self.value.strip()) > 200:
-            raise ValueError("El título no puede exceder 200 caracteres")
+        if len(self.value.strip()) > self.MAX_LENGTH:
+            raise ValueError(f"El título no puede exceder {self.MAX_LENGTH} caracteres")
 
 
 @dataclass(frozen=True)
@@ -50,11 +55,13 @@ class Author:
     """Autor del libro"""
     value: str
     
+    MAX_LENGTH = 100
+    
     def __post_init__(self):
         if not self.value or not self.value.strip():
             raise ValueError("El autor no puede estar vacío")
-        if len(self.value.strip()) > 100:
-            raise ValueError("El nombre del autor no puede exceder 100 caracteres")
+        if len(self.value.strip()) > self.MAX_LENGTH:
+            raise ValueError(f"El nombre del autor no puede exceder {self.MAX_LENGTH} caracteres")
 
 
 @dataclass(frozen=True)
@@ -62,9 +69,14 @@ class PublicationYear:
     """Año de publicación"""
     value: int
     
+    MIN_YEAR = 1
+    MAX_YEAR = 2024
+    
     def __post_init__(self):
-        if self.value < 1 or self.value > 2024:
-            raise ValueError("El año de publicación debe estar entre 1 y 2024")
+        if not isinstance(self.value, int):
+            raise ValueError("El año debe ser un número válido")
+        if self.value < self.MIN_YEAR or self.value > self.MAX_YEAR:
+            raise ValueError(f"El año de publicación debe estar entre {self.MIN_YEAR} y {self.MAX_YEAR}")
 
 
 @dataclass(frozen=True)
@@ -72,11 +84,15 @@ class CopiesCount:
     """Número de copias"""
     value: int
     
+    MAX_COPIES = 1000
+    
     def __post_init__(self):
+        if not isinstance(self.value, int):
+            raise ValueError("El número de copias debe ser un número válido")
         if self.value < 0:
             raise ValueError("El número de copias no puede ser negativo")
-        if self.value > 1000:
-            raise ValueError("El número de copias no puede exceder 1000")
+        if self.value > self.MAX_COPIES:
+            raise ValueError(f"El número de copias no puede exceder {self.MAX_COPIES}")
 
 
 @dataclass(frozen=True)
@@ -84,6 +100,83 @@ class BookSummary:
     """Resumen del libro"""
     value: str
     
+    MAX_LENGTH = 1000
+    
     def __post_init__(self):
-        if self.value and len(self.value) > 1000:
-            raise ValueError("El resumen no puede exceder 1000 caracteres")
+        if self.value and not isinstance(self.value, str):
+            raise ValueError("El resumen debe ser texto")
+        if self.value and len(self.value) > self.MAX_LENGTH:
+            raise ValueError(f"El resumen no puede exceder {self.MAX_LENGTH} caracteres")
+    
+    @property
+    def length(self) -> int:
+        """Cantidad de caracteres (las variantes comprimidas la guardan sin descomprimir)"""
+        return len(self.value) if self.value else 0
+
+
+ValueObject = TypeVar("ValueObject")
+
+
+def trusted_value(cls: Type[ValueObject], value: Any) -> ValueObject:
+    """Crea el objeto de valor congelado sin ejecutar __post_init__
+
+    Solo para valores ya validados: leídos de un almacenamiento propio o
+    comprobados antes por ``validate_request``.
+    """
+    instance = object.__new__(cls)
+    object.__setattr__(instance, "value", value)
+    return instance
+
+
+class ValueObjectInterner:
+    """Caché flyweight de objetos de valor ya validados
+    
+    Entradas iguales devuelven la misma instancia compartida, por lo que la validación
+    de ``__post_init__`` se ejecuta una sola vez por valor distinto. El tamaño se acota
+    con desalojo LRU; con ``weak=True`` las instancias se liberan en cuanto ningún libro
+    las referencia y no hay límite de tamaño.
+    """
+    
+    def __init__(self, maxsize: int = 100_000, weak: bool = False):
+        if maxsize < 1:
+            raise ValueError("El tamaño del caché debe ser mayor que cero")
+        self.maxsize = maxsize
+        self.weak = weak
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._cache = weakref.WeakValueDictionary() if weak else OrderedDict()
+    
+    def get(self, cls: Type[ValueObject], value: Any) -> ValueObject:
+        """Devuelve la instancia compartida de ``cls(value)``, creándola si no existe"""
+        key = (cls, type(value), value)
+        cache = self._cache
+        with self._lock:
+            try:
+                instance = cache.get(key)
+            except TypeError:
+                # Valores no hashables no se comparten: se validan como siempre
+                return cls(value)
+            if instance is not None:
+                self.hits += 1
+                if not self.weak:
+                    cache.move_to_end(key)
+                return instance
+            
+            # Los valores inválidos lanzan ValueError y no se guardan en el caché
+            instance = cls(value)
+            self.misses += 1
+            cache[key] = instance
+            if not self.weak and len(cache) > self.maxsize:
+                cache.popitem(last=False)
+        return instance
+    
+    def __len__(self) -> int:
+        return len(self._cache)
+    
+    def clear(self):
+        """Vacía el caché"""
+        with self._lock:
+            self._cache.clear()
+            self.hits = 0
+            self.misses = 0
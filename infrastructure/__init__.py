@@ -1,7 +1,44 @@
 """
 Módulo de infraestructura - Contiene implementaciones específicas de tecnología
+
+Los submódulos se importan de forma perezosa: acceder a ``BookRegistrationGUI``
+carga tkinter, pero usar la línea de comandos o el repositorio no.
 """
 
-from .gui_interface import BookRegistrationGUI
+from importlib import import_module
+
+_EXPORTS = {
+    'BookRegistrationGUI': '.gui_interface',
+    'CatalogBrowser': '.catalog_browser',
+    'read_requests': '.catalog_readers',
+    'read_csv_requests': '.catalog_readers',
+    'read_jsonl_requests': '.catalog_readers',
+    'export_catalog': '.catalog_writers',
+    'write_catalog_export': '.catalog_writers',
+    'SQLiteBookRepository': '.sqlite_book_repository',
+    'SQLiteLoanLedger': '.sqlite_book_repository',
+    'ColumnarBookCatalog': '.columnar_catalog',
+    'MetricsSnapshotWriter': '.metrics_exporter',
+    'BookRegistrationHTTPService': '.http_service',
+    'ParallelCatalogImporter': '.parallel_import',
+    'JournaledBookRepository': '.journal',
+    'RegistrationJournal': '.journal',
+    'MappedBookCatalog': '.mapped_catalog',
+    'write_catalog': '.mapped_catalog',
+    'SharedBookCatalog': '.shared_catalog',
+    'SharedCatalogPublisher': '.shared_catalog',
+    'SummaryCodec': '.summary_codec',
+    'read_sync_manifest': '.sync_manifest',
+    'write_sync_manifest': '.sync_manifest',
+}
+
+__all__ = list(_EXPORTS)
+
 
-__all__ = ['BookRegistrationGUI']
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
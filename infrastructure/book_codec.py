@@ -0,0 +1,102 @@
+"""
+Codificación binaria compacta de libros
+
+Cada registro es una cabecera fija seguida de los textos en UTF-8:
+
+    book_id u64 | año u16 | copias u16 | género u8 | idioma u8 | estado u8 |
+    máscara de categorías u8 | largo título u16 | largo autor u16 | largo resumen u16
+
+Los enums se guardan con los códigos de ``domain.codes``.
+"""
+
+import struct
+from typing import Iterable, Iterator, List, Tuple
+from domain.codes import (
+    GENRES, LANGUAGES, AVAILABILITY_STATUSES,
+    GENRE_CODES, LANGUAGE_CODES, AVAILABILITY_CODES,
+    categories_to_mask, mask_to_categories
+)
+from domain.entities import Book
+from domain.value_objects import (
+    BookTitle, Author, PublicationYear, CopiesCount, BookSummary, trusted_value
+)
+
+
+RECORD_HEADER = struct.Struct("<QHHBBBBHHH")
+
+
+def encode_book(book: Book) -> bytes:
+    """Codifica un libro en un registro binario"""
+    title = book.title.value.encode("utf-8")
+    author = book.author.value.encode("utf-8")
+    summary = (book.summary.value or "").encode("utf-8")
+    return RECORD_HEADER.pack(
+        book.book_id or 0,
+        book.publication_year.value,
+        book.copies_count.value,
+        GENRE_CODES[book.genre],
+        LANGUAGE_CODES[book.language],
+        AVAILABILITY_CODES[book.availability_status],
+        categories_to_mask(book.categories),
+        len(title), len(author), len(summary)
+    ) + title + author + summary
+
+
+def encode_books(books: Iterable[Book]) -> bytes:
+    """Codifica una secuencia de libros en un único bloque de bytes"""
+    return b"".join(encode_book(book) for book in books)
+
+
+def decode_book(buffer, offset: int = 0, trusted: bool = False) -> Tuple[Book, int]:
+    """Decodifica el registro en ``offset``; devuelve el libro y el offset siguiente
+
+    Con ``trusted=True`` se omiten las validaciones de los objetos de valor: solo debe
+    usarse con datos que ya fueron validados al codificarlos.
+    """
+    (book_id, year, copies, genre, language, status, mask,
+     title_length, author_length, summary_length) = RECORD_HEADER.unpack_from(buffer, offset)
+    start = offset + RECORD_HEADER.size
+    title_end = start + title_length
+    author_end = title_end + author_length
+    summary_end = author_end + summary_length
+    title = bytes(buffer[start:title_end]).decode("utf-8")
+    author = bytes(buffer[title_end:author_end]).decode("utf-8")
+    summary = bytes(buffer[author_end:summary_end]).decode("utf-8")
+
+    make = trusted_value if trusted else _validated_value
+    fields = {
+        "title": make(BookTitle, title),
+        "author": make(Author, author),
+        "publication_year": make(PublicationYear, year),
+        "genre": GENRES[genre],
+        "categories": mask_to_categories(mask),
+        "language": LANGUAGES[language],
+        "availability_status": AVAILABILITY_STATUSES[status],
+        "copies_count": make(CopiesCount, copies),
+        "summary": make(BookSummary, summary),
+        "book_id": book_id or None,
+    }
+    if trusted:
+        book = object.__new__(Book)
+        book.__dict__.update(fields)
+    else:
+        book = Book(**fields)
+    return book, summary_end
+
+
+def decode_books(buffer, trusted: bool = False) -> List[Book]:
+    """Decodifica todos los registros de un bloque"""
+    return list(iter_books(buffer, trusted))
+
+
+def iter_books(buffer, trusted: bool = False) -> Iterator[Book]:
+    """Recorre perezosamente los registros de un bloque"""
+    offset = 0
+    end = len(buffer)
+    while offset < end:
+        book, offset = decode_book(buffer, offset, trusted)
+        yield book
+
+
+def _validated_value(cls, value):
+    return cls(value)
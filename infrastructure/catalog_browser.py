@@ -0,0 +1,245 @@
+import tkinter as tk
+from tkinter import ttk
+from typing import Callable, Dict, List, Optional, Tuple
+from domain.entities import Book
+from domain.repositories import BookRepository
+
+
+class CatalogBrowser:
+    """Vista paginada y virtualizada del catálogo
+
+    El Treeview solo contiene las filas visibles; la barra de desplazamiento
+    representa el catálogo completo y cada movimiento pide al repositorio la
+    ventana correspondiente (con un bloque de prefetch alrededor). El orden por
+    columna se resuelve en el repositorio.
+
+    Las lecturas no corren en el hilo de la interfaz: ``run_query(task, on_done)``
+    ejecuta ``task`` en segundo plano y luego llama a ``on_done`` con su resultado en
+    el hilo de Tk. Mientras una lectura está en curso, los pedidos nuevos se reducen
+    al último, que se atiende al terminar.
+    """
+
+    VISIBLE_ROWS = 25
+    # Cantidad de filas que se piden al repositorio por bloque
+    FETCH_SIZE = 100
+
+    COLUMNS: Tuple[Tuple[str, str, int], ...] = (
+        ("book_id", "ID", 60),
+        ("title", "Título", 220),
+        ("author", "Autor", 160),
+        ("publication_year", "Año", 60),
+        ("genre", "Género", 90),
+        ("language", "Idioma", 80),
+        ("availability_status", "Estado", 90),
+        ("copies_count", "Copias", 60),
+    )
+
+    def __init__(self, parent, repository: Optional[BookRepository],
+                 run_query: Callable[[Callable, Callable], None]):
+        self.repository = repository
+        self.total = 0
+        self.offset = 0
+        self.order_by = "book_id"
+        self.descending = False
+        self._run_query = run_query
+        # Bloques ya leídos: índice de bloque -> filas
+        self._blocks: Dict[int, List[Tuple]] = {}
+        self._loading = False
+        # Último pedido llegado durante una lectura: (offset, releer la cantidad de libros)
+        self._pending: Optional[Tuple[int, bool]] = None
+        self._create_widgets(parent)
+
+    def _create_widgets(self, parent):
+        """Crear la tabla, la barra de desplazamiento y la barra de estado"""
+        self.frame = ttk.Frame(parent, padding="10")
+        self.frame.pack(fill="both", expand=True)
+
+        toolbar = ttk.Frame(self.frame)
+        toolbar.pack(fill="x", pady=(0, 5))
+        ttk.Button(toolbar, text="Actualizar", command=self.refresh).pack(side="left")
+        self.status_var = tk.StringVar(value="")
+        ttk.Label(toolbar, textvariable=self.status_var).pack(side="left", padx=10)
+
+        table_frame = ttk.Frame(self.frame)
+        table_frame.pack(fill="both", expand=True)
+
+        column_ids = [column for column, _, _ in self.COLUMNS]
+        self.tree = ttk.Treeview(table_frame, columns=column_ids, show="headings",
+                                 height=self.VISIBLE_ROWS, selectmode="browse")
+        for column, heading, width in self.COLUMNS:
+            self.tree.heading(column, text=heading, command=lambda c=column: self._sort_by(c))
+            self.tree.column(column, width=width, stretch=column in ("title", "author"))
+
+        # La barra no está ligada al Treeview: representa la posición en todo el catálogo
+        self.scrollbar = ttk.Scrollbar(table_frame, orient="vertical", command=self._on_scroll)
+        self.tree.pack(side="left", fill="both", expand=True)
+        self.scrollbar.pack(side="right", fill="y")
+
+        self.tree.bind("<MouseWheel>", self._on_mousewheel)
+        self.tree.bind("<Button-4>", lambda e: self._scroll_to(self.offset - 3))
+        self.tree.bind("<Button-5>", lambda e: self._scroll_to(self.offset + 3))
+
+    def refresh(self):
+        """Relee la cantidad de libros y vuelve a dibujar la ventana actual"""
+        self._load(self.offset, reload=True)
+
+    def _sort_by(self, column: str):
+        """Ordena por columna; un segundo clic invierte el sentido"""
+        if self.order_by == column:
+            self.descending = not self.descending
+        else:
+            self.order_by = column
+            self.descending = False
+        self._load(0, reload=True)
+
+    def _on_scroll(self, action: str, amount: str, unit: Optional[str] = None):
+        """Traduce los comandos de la barra a un desplazamiento en el catálogo"""
+        if action == "moveto":
+            self._scroll_to(int(float(amount) * self.total))
+        elif action == "scroll":
+            step = self.VISIBLE_ROWS if unit == "pages" else 1
+            self._scroll_to(self.offset + int(amount) * step)
+
+    def _on_mousewheel(self, event):
+        """Desplazamiento con la rueda del mouse"""
+        self._scroll_to(self.offset - int(event.delta / 120) * 3)
+        return "break"
+
+    def _scroll_to(self, offset: int):
+        """Muestra la ventana que comienza en ``offset``, leyendo antes los bloques que falten"""
+        offset = self._clamp(offset, self.total)
+        # Con una lectura en curso el pedido espera su turno: puede venir un orden nuevo
+        if not self._loading and all(index in self._blocks
+                                     for index in self._block_indexes(offset, self.total)):
+            self._render(offset)
+        else:
+            self._load(offset, reload=False)
+
+    def _load(self, offset: int, reload: bool):
+        """Lee en segundo plano los bloques de la ventana (y la cantidad de libros si ``reload``)"""
+        if self.repository is None:
+            self._blocks.clear()
+            self.total = 0
+            self._render(0)
+            return
+        if self._loading:
+            pending_reload = self._pending is not None and self._pending[1]
+            self._pending = (offset, reload or pending_reload)
+            return
+        self._loading = True
+        self.status_var.set("Cargando...")
+
+        # La tarea solo recibe copias: el estado del navegador se toca en el hilo de Tk
+        repository = self.repository
+        order_by, descending = self.order_by, self.descending
+        cached = frozenset() if reload else frozenset(self._blocks)
+        known_total = self.total
+
+        def task():
+            total = repository.count() if reload else known_total
+            start = self._clamp(offset, total)
+            blocks = {
+                index: [self._to_row(book) for book in repository.find_page(
+                    index * self.FETCH_SIZE, self.FETCH_SIZE, order_by, descending)]
+                for index in self._block_indexes(start, total) if index not in cached
+            }
+            return reload, total, start, blocks
+
+        def run():
+            try:
+                return task()
+            except Exception as e:
+                return e
+
+        self._run_query(run, self._on_loaded)
+
+    def _on_loaded(self, result):
+        """Aplica una lectura terminada y atiende el último pedido que haya quedado"""
+        self._loading = False
+        if isinstance(result, Exception):
+            self._pending = None
+            self.status_var.set(f"Error al leer el catálogo: {result}")
+            return
+        reload, total, start, blocks = result
+        if reload:
+            self._blocks.clear()
+        self.total = total
+        self._blocks.update(blocks)
+        # Se descartan los bloques lejanos para mantener la memoria acotada
+        first_index = start // self.FETCH_SIZE
+        for cached_index in list(self._blocks):
+            if abs(cached_index - first_index) > 2:
+                del self._blocks[cached_index]
+
+        if self._pending is not None:
+            offset, pending_reload = self._pending
+            self._pending = None
+            if pending_reload:
+                self._load(offset, reload=True)
+            else:
+                self._scroll_to(offset)
+            return
+        self._render(start)
+
+    def _render(self, offset: int):
+        """Dibuja la ventana que comienza en ``offset`` con los bloques ya leídos"""
+        self.offset = offset
+        rows = self._window(offset, self.VISIBLE_ROWS)
+
+        self.tree.delete(*self.tree.get_children())
+        for row in rows:
+            self.tree.insert("", "end", values=row)
+
+        if self.total:
+            first = self.offset / self.total
+            last = min(1.0, (self.offset + self.VISIBLE_ROWS) / self.total)
+            self.scrollbar.set(first, last)
+            self.status_var.set(
+                f"Libros {self.offset + 1}-{self.offset + len(rows)} de {self.total}"
+            )
+        else:
+            self.scrollbar.set(0.0, 1.0)
+            self.status_var.set("Sin libros registrados" if self.repository is not None
+                                else "Sin repositorio configurado")
+
+    def _window(self, offset: int, size: int) -> List[Tuple]:
+        """Filas de la ventana, tomadas de los bloques ya leídos"""
+        rows: List[Tuple] = []
+        position = offset
+        end = min(offset + size, self.total)
+        while position < end:
+            block_index = position // self.FETCH_SIZE
+            block = self._blocks.get(block_index)
+            if not block:
+                break
+            start = position - block_index * self.FETCH_SIZE
+            rows.extend(block[start:start + (end - position)])
+            position = (block_index + 1) * self.FETCH_SIZE
+        return rows
+
+    @classmethod
+    def _clamp(cls, offset: int, total: int) -> int:
+        """Primer offset válido para una ventana completa"""
+        return max(0, min(offset, total - cls.VISIBLE_ROWS))
+
+    @classmethod
+    def _block_indexes(cls, offset: int, total: int) -> range:
+        """Índices de los bloques que cubren la ventana que comienza en ``offset``"""
+        end = min(offset + cls.VISIBLE_ROWS, total)
+        if end <= offset:
+            return range(0)
+        return range(offset // cls.FETCH_SIZE, (end - 1) // cls.FETCH_SIZE + 1)
+
+    @staticmethod
+    def _to_row(book: Book) -> Tuple:
+        """Valores de la fila para un libro"""
+        return (
+            book.book_id,
+            book.title.value,
+            book.author.value,
+            book.publication_year.value,
+            book.genre.value,
+            book.language.value,
+            book.availability_status.value,
+            book.copies_count.value,
+        )
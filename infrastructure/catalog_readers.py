@@ -0,0 +1,104 @@
+import csv
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Union
+from domain.dto import BookRegistrationRequest, MalformedRowRequest
+
+
+# Separador de categorías dentro de una celda CSV
+CATEGORY_SEPARATOR = ";"
+
+REQUEST_FIELDS = (
+    "title", "author", "publication_year", "genre", "categories",
+    "language", "availability_status", "copies_count", "summary"
+)
+
+
+def read_requests(path: Union[str, Path], encoding: str = "utf-8") -> Iterator[BookRegistrationRequest]:
+    """Lee solicitudes de registro desde un archivo CSV o JSONL según su extensión"""
+    suffix = Path(path).suffix.lower()
+    if suffix == ".csv":
+        return read_csv_requests(path, encoding)
+    if suffix in (".jsonl", ".ndjson"):
+        return read_jsonl_requests(path, encoding)
+    raise ValueError(f"Formato de archivo no soportado: {suffix or path}")
+
+
+def read_csv_requests(path: Union[str, Path], encoding: str = "utf-8") -> Iterator[BookRegistrationRequest]:
+    """Genera perezosamente solicitudes de registro a partir de un CSV con cabecera
+
+    Las columnas deben llamarse como los campos de ``BookRegistrationRequest`` y las
+    categorías se separan con ``;`` dentro de su celda.
+    """
+    with open(path, newline="", encoding=encoding) as handle:
+        for row in csv.DictReader(handle):
+            yield row_to_request(row)
+
+
+def read_jsonl_requests(path: Union[str, Path], encoding: str = "utf-8") -> Iterator[BookRegistrationRequest]:
+    """Genera perezosamente solicitudes de registro a partir de un archivo JSONL
+
+    Una línea que no es un objeto JSON no detiene la lectura: se entrega como
+    ``MalformedRowRequest``, que la importación rechaza como a cualquier fila inválida.
+    """
+    with open(path, encoding=encoding) as handle:
+        for line_number, line in enumerate(handle, start=1):
+            line = line.strip()
+            if line:
+                yield jsonl_line_to_request(line, line_number)
+
+
+def jsonl_line_to_request(line: str, line_number: int) -> BookRegistrationRequest:
+    """Convierte una línea JSONL en solicitud; ``MalformedRowRequest`` si no es un objeto JSON"""
+    try:
+        row = json.loads(line)
+    except json.JSONDecodeError as e:
+        return MalformedRowRequest.at_line(line_number, f"JSON inválido ({e.msg})")
+    if not isinstance(row, dict):
+        return MalformedRowRequest.at_line(line_number, "se esperaba un objeto JSON")
+    return row_to_request(row)
+
+
+def row_to_request(row: Dict[str, Any]) -> BookRegistrationRequest:
+    """Convierte una fila leída del archivo en un BookRegistrationRequest
+
+    Los valores numéricos que no se pueden convertir se conservan tal cual para que
+    la validación del dominio los rechace con su mensaje habitual.
+    """
+    return BookRegistrationRequest(
+        title=_to_str(row.get("title")),
+        author=_to_str(row.get("author")),
+        publication_year=_to_int(row.get("publication_year")),
+        genre=_to_str(row.get("genre")),
+        categories=_to_categories(row.get("categories")),
+        language=_to_str(row.get("language")),
+        availability_status=_to_str(row.get("availability_status")),
+        copies_count=_to_int(row.get("copies_count")),
+        summary=_to_str(row.get("summary"))
+    )
+
+
+def _to_str(value: Any) -> str:
+    """Normaliza un valor de texto, tratando los vacíos como cadena vacía"""
+    if value is None:
+        return ""
+    return str(value).strip()
+
+
+def _to_int(value: Any) -> Any:
+    """Convierte a entero si es posible; si no, devuelve el valor original"""
+    if isinstance(value, int):
+        return value
+    try:
+        return int(str(value).strip())
+    except (TypeError, ValueError):
+        return value
+
+
+def _to_categories(value: Any) -> List[str]:
+    """Convierte la celda de categorías en una lista de strings"""
+    if value is None:
+        return []
+    if isinstance(value, list):
+        return [_to_str(item) for item in value if _to_str(item)]
+    return [item.strip() for item in str(value).split(CATEGORY_SEPARATOR) if item.strip()]
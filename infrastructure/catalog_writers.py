@@ -0,0 +1,137 @@
+import sys
+import time
+from itertools import islice
+from json.encoder import encode_basestring
+from pathlib import Path
+from typing import BinaryIO, Callable, Dict, Iterable, List, Optional, Union
+from domain.codes import (
+    GENRES, LANGUAGES, AVAILABILITY_STATUSES, CATEGORY_MASK_LIMIT, categories_to_mask, mask_to_categories
+)
+from domain.dto import ExportStats
+from domain.entities import Book
+from .catalog_readers import CATEGORY_SEPARATOR, REQUEST_FIELDS
+
+
+EXPORT_FIELDS = ("book_id",) + REQUEST_FIELDS
+EXPORT_FORMATS = ("csv", "jsonl", "text")
+
+DEFAULT_CHUNK_BOOKS = 2000
+DEFAULT_BUFFER_BYTES = 1024 * 1024
+
+# Separador entre libros del informe legible
+TEXT_SEPARATOR = "\n" + "=" * 50 + "\n"
+
+# Fragmentos JSON precalculados de los enums y de cada combinación de categorías
+_JSON_ENUMS = {member: encode_basestring(member.value) for members in (GENRES, LANGUAGES, AVAILABILITY_STATUSES)
+               for member in members}
+_SORTED_CATEGORIES = tuple(
+    sorted(category.value for category in mask_to_categories(mask)) for mask in range(CATEGORY_MASK_LIMIT)
+)
+_JSON_CATEGORIES = tuple(
+    "[" + ", ".join(encode_basestring(value) for value in values) + "]" for values in _SORTED_CATEGORIES
+)
+_CSV_CATEGORIES = tuple(CATEGORY_SEPARATOR.join(values) for values in _SORTED_CATEGORIES)
+
+
+def export_format_for(path: Union[str, Path]) -> str:
+    """Formato de exportación según la extensión del archivo (CSV si no se reconoce)"""
+    suffix = Path(path).suffix.lower()
+    if suffix in (".jsonl", ".ndjson"):
+        return "jsonl"
+    if suffix == ".txt":
+        return "text"
+    return "csv"
+
+
+def write_catalog_export(books: Iterable[Book], output: BinaryIO, export_format: str,
+                         chunk_books: int = DEFAULT_CHUNK_BOOKS,
+                         stats: Optional[ExportStats] = None) -> ExportStats:
+    """Escribe los libros en ``output`` (flujo binario) en CSV, JSONL o el formato legible
+
+    Los libros se consumen en bloques de ``chunk_books``: cada bloque se convierte
+    en un único texto, se codifica y se escribe de una vez, así la memoria no crece
+    con el tamaño del catálogo. ``stats`` (si se entrega) se actualiza por bloque.
+    """
+    render = _RENDERERS.get(export_format)
+    if render is None:
+        raise ValueError(f"Formato de exportación no válido: {export_format}")
+    if chunk_books < 1:
+        raise ValueError("El tamaño de bloque debe ser mayor que cero")
+    stats = stats if stats is not None else ExportStats()
+    started = time.perf_counter()
+    if export_format == "csv":
+        stats.bytes_written += output.write(",".join(EXPORT_FIELDS).encode("utf-8") + b"\r\n")
+
+    books = iter(books)
+    while True:
+        chunk = list(islice(books, chunk_books))
+        if not chunk:
+            break
+        data = render(chunk).encode("utf-8")
+        output.write(data)
+        stats.books += len(chunk)
+        stats.bytes_written += len(data)
+        stats.elapsed_seconds = time.perf_counter() - started
+    output.flush()
+    stats.elapsed_seconds = time.perf_counter() - started
+    return stats
+
+
+def export_catalog(path: Union[str, Path], books: Iterable[Book], export_format: Optional[str] = None,
+                   chunk_books: int = DEFAULT_CHUNK_BOOKS,
+                   buffer_bytes: int = DEFAULT_BUFFER_BYTES) -> ExportStats:
+    """Exporta los libros a un archivo (``-`` es la salida estándar) con un búfer de ``buffer_bytes``"""
+    export_format = export_format or export_format_for(path)
+    if str(path) == "-":
+        return write_catalog_export(books, sys.stdout.buffer, export_format, chunk_books)
+    with open(path, "wb", buffering=buffer_bytes) as output:
+        return write_catalog_export(books, output, export_format, chunk_books)
+
+
+def _render_csv(books: List[Book]) -> str:
+    """Filas CSV de un bloque, iguales a las de ``csv.writer`` (mismas columnas que la importación)"""
+    text = _csv_text
+    return "".join([
+        f"{book.book_id},{text(book.title.value)},{text(book.author.value)},{book.publication_year.value},"
+        f"{text(book.genre.value)},{_CSV_CATEGORIES[categories_to_mask(book.categories)]},"
+        f"{text(book.language.value)},{text(book.availability_status.value)},{book.copies_count.value},"
+        f"{text(book.summary.value)}\r\n"
+        for book in books
+    ])
+
+
+def _csv_text(value: Optional[str]) -> str:
+    """Celda CSV con las comillas mínimas (``csv.QUOTE_MINIMAL``)"""
+    if value is None:
+        return ""
+    if "," in value or '"' in value or "\n" in value or "\r" in value:
+        return '"' + value.replace('"', '""') + '"'
+    return value
+
+
+def _render_jsonl(books: List[Book]) -> str:
+    """Un objeto JSON por línea, igual al de ``json.dumps(..., ensure_ascii=False)``"""
+    enums = _JSON_ENUMS
+    return "".join([
+        f'{{"book_id": {book.book_id}, "title": {encode_basestring(book.title.value)}, '
+        f'"author": {encode_basestring(book.author.value)}, '
+        f'"publication_year": {book.publication_year.value}, "genre": {enums[book.genre]}, '
+        f'"categories": {_JSON_CATEGORIES[categories_to_mask(book.categories)]}, '
+        f'"language": {enums[book.language]}, "availability_status": {enums[book.availability_status]}, '
+        f'"copies_count": {book.copies_count.value}, "summary": {_json_text(book.summary.value)}}}\n'
+        for book in books
+    ])
+
+
+def _json_text(value: Optional[str]) -> str:
+    return "null" if value is None else encode_basestring(value)
+
+
+def _render_text(books: List[Book]) -> str:
+    """El formato de ``Book.get_display_info``, un libro tras otro"""
+    return "".join([book.get_display_info() + TEXT_SEPARATOR for book in books])
+
+
+_RENDERERS: Dict[str, Callable[[List[Book]], str]] = {
+    "csv": _render_csv, "jsonl": _render_jsonl, "text": _render_text,
+}
@@ -0,0 +1,546 @@
+"""
+Interfaz de línea de comandos - Registro, importación, consulta y exportación sin GUI
+
+Los módulos pesados (casos de uso, repositorio, sqlite3, csv) se importan dentro de
+cada subcomando para que ``--help`` y los trabajos pequeños arranquen rápido.
+"""
+
+import argparse
+import os
+import sys
+from typing import List, Optional
+
+
+DEFAULT_DATABASE_PATH = "biblioteca_saberx.db"
+DUPLICATE_CHOICES = ("reject", "merge", "allow")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Construye el parser con todos los subcomandos"""
+    parser = argparse.ArgumentParser(
+        prog="main.py",
+        description="Biblioteca SaberX - Sistema de registro de libros. "
+                    "Sin argumentos abre la interfaz gráfica."
+    )
+    parser.add_argument("--db", default=DEFAULT_DATABASE_PATH,
+                        help=f"Base de datos SQLite (por defecto: {DEFAULT_DATABASE_PATH})")
+    parser.add_argument("--journal", metavar="DIRECTORIO", default=None,
+                        help="Usar un catálogo en memoria con journal en este directorio en lugar de SQLite")
+    parser.add_argument("--catalog", metavar="ARCHIVO", default=None,
+                        help="Consultar un catálogo binario (.sxcat) de solo lectura en lugar de SQLite")
+    parser.add_argument("--shared", metavar="NOMBRE", default=None,
+                        help="Consultar el snapshot en memoria compartida publicado con 'publish'")
+    subparsers = parser.add_subparsers(dest="command", metavar="COMANDO")
+
+    register = subparsers.add_parser("register", help="Registrar un libro")
+    register.add_argument("--title", required=True, help="Título")
+    register.add_argument("--author", required=True, help="Autor")
+    register.add_argument("--year", type=int, required=True, help="Año de publicación")
+    register.add_argument("--genre", required=True, help="Género (Ficción, No Ficción)")
+    register.add_argument("--category", dest="categories", action="append", required=True,
+                          help="Categoría (repetible)")
+    register.add_argument("--language", default="Español", help="Idioma")
+    register.add_argument("--status", default="Disponible", help="Estado de disponibilidad")
+    register.add_argument("--copies", type=int, default=1, help="Número de copias")
+    register.add_argument("--summary", default="", help="Resumen")
+    _add_duplicates_argument(register)
+    register.set_defaults(handler=_register)
+
+    import_parser = subparsers.add_parser("import", help="Importar un catálogo CSV o JSONL")
+    import_parser.add_argument("file", help="Archivo .csv, .jsonl o .ndjson")
+    import_parser.add_argument("--batch-size", type=int, default=1000, help="Filas por transacción")
+    import_parser.add_argument("--validate-only", action="store_true",
+                               help="Solo validar, sin guardar en la base de datos")
+    import_parser.add_argument("--show-errors", action="store_true",
+                               help="Mostrar el error de cada fila rechazada")
+    import_parser.add_argument("--workers", type=int, default=1,
+                               help="Procesos de validación en paralelo (1 = sin paralelismo)")
+    _add_duplicates_argument(import_parser)
+    import_parser.add_argument("--collect-errors", action="store_true",
+                               help="Validar sin excepciones, informando todos los códigos de error por fila")
+    import_parser.add_argument("--max-error-rate", type=float, default=None,
+                               help="Detener la importación si la fracción de filas rechazadas lo supera")
+    import_parser.add_argument("--rejection-report", metavar="ARCHIVO", default=None,
+                               help="Guardar el informe de filas rechazadas en JSON")
+    import_parser.set_defaults(handler=_import)
+
+    sync = subparsers.add_parser("sync", help="Sincronizar con el catálogo completo de un proveedor aplicando "
+                                              "solo altas, cambios y bajas")
+    sync.add_argument("file", help="Archivo .csv, .jsonl o .ndjson con el catálogo completo")
+    sync.add_argument("--state", required=True, metavar="ARCHIVO",
+                      help="Estado de la sincronización anterior (se crea a partir del catálogo si no existe)")
+    sync.add_argument("--delete-missing", action="store_true",
+                      help="Eliminar los libros de sincronizaciones anteriores que ya no están en el archivo "
+                           "(nunca en la primera sincronización)")
+    sync.add_argument("--batch-size", type=int, default=1000, help="Filas nuevas por transacción")
+    sync.add_argument("--show-errors", action="store_true", help="Mostrar el error de cada fila")
+    sync.add_argument("--json", action="store_true", help="Informe de diferencias en JSON")
+    _add_duplicates_argument(sync)
+    sync.set_defaults(handler=_sync)
+
+    query = subparsers.add_parser("query", help="Consultar libros registrados por varios criterios")
+    query.add_argument("--title", help="Texto contenido en el título")
+    query.add_argument("--author", help="Texto contenido en el autor")
+    query.add_argument("--genre", help="Género exacto")
+    query.add_argument("--language", help="Idioma exacto")
+    query.add_argument("--status", help="Estado de disponibilidad exacto")
+    query.add_argument("--category", action="append", default=[],
+                       help="Categoría exigida (se puede repetir)")
+    query.add_argument("--year-from", type=int, help="Año mínimo")
+    query.add_argument("--year-to", type=int, help="Año máximo")
+    query.add_argument("--min-copies", type=int, help="Copias disponibles mínimas")
+    query.add_argument("--order-by", choices=("book_id", "publication_year"), default="book_id",
+                       help="Orden de los resultados")
+    query.add_argument("--desc", action="store_true", help="Orden descendente")
+    query.add_argument("--cursor", default=None, help="Cursor de la página anterior")
+    query.add_argument("--limit", type=int, default=20, help="Cantidad máxima de resultados")
+    query.add_argument("--explain", action="store_true", help="Mostrar el plan elegido")
+    query.set_defaults(handler=_query)
+
+    search = subparsers.add_parser("search", help="Búsqueda aproximada por título o autor")
+    search.add_argument("text", help="Texto a buscar (tolera errores de tipeo y acentos)")
+    search.add_argument("--field", choices=("title", "author"), default=None,
+                        help="Buscar solo en el título o solo en el autor")
+    search.add_argument("--limit", type=int, default=10, help="Cantidad máxima de resultados")
+    search.set_defaults(handler=_search)
+
+    export = subparsers.add_parser("export", help="Exportar el catálogo")
+    export.add_argument("file", help="Archivo de salida ('-' para la salida estándar)")
+    export.add_argument("--format", choices=("csv", "jsonl", "text", "binary"), default=None,
+                        help="Formato (por defecto se deduce de la extensión)")
+    _add_compress_argument(export)
+    export.set_defaults(handler=_export)
+
+    for name, help_text in (("borrow", "Prestar copias de un libro"), ("return", "Devolver copias de un libro")):
+        loan = subparsers.add_parser(name, help=help_text)
+        loan.add_argument("book_id", type=int, help="Identificador del libro")
+        loan.add_argument("--copies", type=int, default=1, help="Número de copias")
+        loan.set_defaults(handler=_loan)
+
+    stats = subparsers.add_parser("stats", help="Títulos y copias por sección, género e idioma")
+    stats.add_argument("--format", choices=("text", "json", "prometheus"), default="text",
+                       help="Formato de salida")
+    stats.set_defaults(handler=_stats)
+
+    snapshot = subparsers.add_parser("snapshot", help="Compactar el journal en un snapshot (requiere --journal)")
+    snapshot.set_defaults(handler=_snapshot)
+
+    publish = subparsers.add_parser("publish", help="Publicar el catálogo en memoria compartida para otros procesos")
+    publish.add_argument("--name", default="saberx-catalogo", help="Nombre del snapshot compartido")
+    publish.add_argument("--watch", type=float, default=None, metavar="SEGUNDOS",
+                         help="Volver a publicar cuando cambie la cantidad de libros (revisa cada SEGUNDOS)")
+    _add_compress_argument(publish)
+    publish.set_defaults(handler=_publish)
+
+    serve = subparsers.add_parser("serve", help="Servicio HTTP JSON de registro")
+    serve.add_argument("--host", default="127.0.0.1", help="Dirección de escucha")
+    serve.add_argument("--port", type=int, default=8080, help="Puerto")
+    serve.add_argument("--max-in-flight", type=int, default=64,
+                       help="Solicitudes simultáneas antes de responder 503")
+    serve.add_argument("--workers", type=int, default=4, help="Hilos para el caso de uso")
+    _add_duplicates_argument(serve)
+    serve.set_defaults(handler=_serve)
+
+    return parser
+
+
+def _add_duplicates_argument(parser: argparse.ArgumentParser):
+    """Opción común para el tratamiento de libros duplicados (mismo título, autor y año)"""
+    parser.add_argument("--duplicates", choices=DUPLICATE_CHOICES, default="reject",
+                        help="Duplicados: rechazar, sumar sus copias al existente o permitirlos "
+                             "(por defecto: reject)")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Punto de entrada de la línea de comandos"""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if getattr(args, "handler", None) is None:
+        parser.print_help()
+        return 2
+    try:
+        status = args.handler(args)
+        # Lo que quede en el búfer también puede encontrarse con la tubería cerrada
+        sys.stdout.flush()
+        return status
+    except BrokenPipeError:
+        # El consumidor cerró la tubería (por ejemplo ``| head``): no es un error. La salida
+        # se redirige a devnull para que el vaciado final al terminar tampoco falle
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 0
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+
+def _open_repository(args):
+    """Abre el catálogo de --catalog o --shared, el repositorio con journal de --journal o el SQLite de --db"""
+    if args.catalog:
+        from infrastructure.mapped_catalog import MappedBookCatalog
+        return MappedBookCatalog(args.catalog)
+    if args.shared:
+        from infrastructure.shared_catalog import SharedBookCatalog
+        return SharedBookCatalog(args.shared)
+    if args.journal:
+        import atexit
+        from infrastructure.journal import JournaledBookRepository
+        repository = JournaledBookRepository(args.journal)
+        # Los eventos pendientes del commit en grupo se sincronizan al salir
+        atexit.register(repository.close)
+        return repository
+    from infrastructure.sqlite_book_repository import SQLiteBookRepository
+    return SQLiteBookRepository(args.db)
+
+
+def _duplicate_index(args, repository, rebuild: bool = True):
+    """Índice de duplicados según --duplicates (None con 'allow')"""
+    if repository is None or args.duplicates == "allow":
+        return None
+    from application.deduplication import DuplicateIndex
+    index = DuplicateIndex(args.duplicates)
+    return index.rebuild(repository) if rebuild else index.attach(repository)
+
+
+def _register(args) -> int:
+    """Subcomando register"""
+    from application.use_cases import BookRegistrationUseCase
+    from domain.dto import BookRegistrationRequest
+
+    request = BookRegistrationRequest(
+        title=args.title,
+        author=args.author,
+        publication_year=args.year,
+        genre=args.genre,
+        categories=args.categories,
+        language=args.language,
+        availability_status=args.status,
+        copies_count=args.copies,
+        summary=args.summary
+    )
+    repository = _open_repository(args)
+    # Para un solo libro basta con consultar el año en el repositorio, sin indexar todo
+    duplicates = _duplicate_index(args, repository, rebuild=False)
+    response = BookRegistrationUseCase(repository, duplicates=duplicates).execute(request)
+    if not response.success:
+        print(response.message, file=sys.stderr)
+        return 1
+    print(response.book_info)
+    return 0
+
+
+def _import(args) -> int:
+    """Subcomando import"""
+    from application.use_cases import BookRegistrationUseCase
+    from domain.dto import BulkRegistrationStats, RejectionReport
+    from domain.validation import BatchRejectedError
+    from domain.value_objects import ValueObjectInterner
+    from infrastructure.catalog_readers import read_requests
+
+    collect_errors = args.collect_errors or args.max_error_rate is not None or bool(args.rejection_report)
+    if collect_errors and args.workers > 1:
+        raise ValueError("--collect-errors, --max-error-rate y --rejection-report requieren --workers 1")
+
+    repository = None if args.validate_only else _open_repository(args)
+    duplicates = _duplicate_index(args, repository)
+    stats = BulkRegistrationStats()
+    report = RejectionReport() if collect_errors else None
+    if args.workers > 1:
+        from infrastructure.parallel_import import ParallelCatalogImporter
+        responses = ParallelCatalogImporter(
+            repository, args.workers, duplicates=duplicates
+        ).import_file(args.file, stats)
+    else:
+        use_case = BookRegistrationUseCase(repository, interner=ValueObjectInterner(), duplicates=duplicates)
+        responses = use_case.execute_many(
+            read_requests(args.file), batch_size=args.batch_size, stats=stats, include_book_info=False,
+            report=report, max_error_rate=args.max_error_rate
+        )
+
+    aborted = None
+    try:
+        for row_number, response in enumerate(responses, start=1):
+            if args.show_errors and not response.success:
+                print(f"Fila {row_number}: {response.message}", file=sys.stderr)
+    except BatchRejectedError as e:
+        aborted = e
+    finally:
+        if args.rejection_report:
+            _write_rejection_report(args.rejection_report, report)
+
+    action = "validadas" if args.validate_only else "registradas"
+    print(
+        f"{stats.processed} filas procesadas: {stats.succeeded} {action}, {stats.failed} con error "
+        f"({stats.elapsed_seconds:.2f} s, {stats.rows_per_second:,.0f} filas/seg)"
+    )
+    if report is not None and report.code_counts:
+        print("Errores por código: " + ", ".join(
+            f"{code}={count}" for code, count in sorted(report.code_counts.items())
+        ))
+    if aborted is not None:
+        print(f"Error: {aborted}", file=sys.stderr)
+    return 0 if stats.failed == 0 and aborted is None else 1
+
+
+def _sync(args) -> int:
+    """Subcomando sync"""
+    from application.catalog_sync import CatalogSyncUseCase
+    from application.use_cases import BookRegistrationUseCase
+    from domain.value_objects import ValueObjectInterner
+    from infrastructure.catalog_readers import read_requests
+    from infrastructure.sync_manifest import read_sync_manifest, write_sync_manifest
+
+    repository = _open_repository(args)
+    manifest = read_sync_manifest(args.state) if os.path.exists(args.state) else None
+    # La primera sincronización recorre igual todo el catálogo: el índice se carga completo.
+    # Con estado previo solo se cargan los años de las claves nuevas.
+    use_case = BookRegistrationUseCase(repository, interner=ValueObjectInterner(),
+                                       duplicates=_duplicate_index(args, repository, rebuild=manifest is None))
+    sync = CatalogSyncUseCase(use_case, manifest)
+    report = sync.execute(read_requests(args.file), delete_missing=args.delete_missing,
+                          batch_size=args.batch_size)
+    if hasattr(repository, "wait_durable"):
+        # El estado no debe adelantarse a los cambios que el journal todavía no escribió
+        repository.wait_durable()
+    write_sync_manifest(args.state, sync.manifest)
+
+    if args.json:
+        import json
+        print(json.dumps(report.to_dict(), ensure_ascii=False, indent=2))
+    else:
+        if args.show_errors:
+            for failure in report.failures:
+                print(f"Fila {failure['row']}: {failure['message']}", file=sys.stderr)
+        print(
+            f"{report.processed} filas procesadas: {report.unchanged} sin cambios, {report.inserted} altas, "
+            f"{report.updated} modificaciones, {report.deleted} bajas, {report.failed} con error "
+            f"({report.elapsed_seconds:.2f} s, {report.rows_per_second:,.0f} filas/seg)"
+        )
+    return 0 if report.failed == 0 else 1
+
+
+def _write_rejection_report(path: str, report) -> None:
+    """Escribe el informe de rechazos en JSON"""
+    import json
+
+    with open(path, "w", encoding="utf-8") as handle:
+        json.dump(report.to_dict(), handle, ensure_ascii=False, indent=2)
+        handle.write("\n")
+
+
+def _query(args) -> int:
+    """Subcomando query"""
+    from application.catalog_query import CatalogQueryEngine
+    from domain.dto import BookQuery
+
+    repository = _open_repository(args)
+    # Una sola consulta: SQLite la resuelve con sus índices; los demás catálogos usan el motor en memoria
+    if hasattr(repository, "execute_query"):
+        execute = repository.execute_query
+    else:
+        execute = CatalogQueryEngine(repository).rebuild().execute
+    try:
+        page = execute(BookQuery(
+            genre=args.genre, language=args.language, availability_status=args.status,
+            categories=args.category, year_from=args.year_from, year_to=args.year_to,
+            min_copies=args.min_copies, title_contains=args.title, author_contains=args.author,
+            order_by=args.order_by, descending=args.desc, limit=args.limit, cursor=args.cursor
+        ))
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    if args.explain:
+        print(f"Plan: {page.plan}; {page.examined} posiciones examinadas", file=sys.stderr)
+    for book in page.books:
+        print(_format_book(book))
+    if not page.books:
+        print("No se encontraron libros")
+    if page.next_cursor is not None:
+        print(f"Siguiente página: --cursor {page.next_cursor}")
+    return 0
+
+
+def _search(args) -> int:
+    """Subcomando search"""
+    from application.search_index import TrigramSearchIndex
+
+    repository = _open_repository(args)
+    hits = TrigramSearchIndex().rebuild(repository).search(args.text, limit=args.limit, field=args.field)
+    if not hits:
+        print("No se encontraron libros")
+        return 0
+    for hit in hits:
+        book = repository.get(hit.book_id)
+        if book is not None:
+            print(f"{hit.score:.2f} {_format_book(book)}")
+    return 0
+
+
+def _format_book(book) -> str:
+    """Línea de salida de un libro para query y search"""
+    return (f"[{book.book_id}] {book.title.value} - {book.author.value} "
+            f"({book.publication_year.value}) {book.genre.value}, {book.language.value}, "
+            f"{book.availability_status.value}, {book.copies_count.value} copias")
+
+
+def _add_compress_argument(parser: argparse.ArgumentParser):
+    parser.add_argument("--compress-summaries", action="store_true",
+                        help="Comprimir los resúmenes con un diccionario entrenado sobre el catálogo "
+                             "(solo formato binario y memoria compartida)")
+
+
+def _summary_codec(args, repository):
+    """Codec de resúmenes entrenado con una muestra del catálogo, o None sin --compress-summaries"""
+    if not getattr(args, "compress_summaries", False):
+        return None
+    from itertools import islice
+    from infrastructure.summary_codec import SummaryCodec
+
+    sample = (book.summary.value for book in islice(repository.iter_all(), 20000) if book.summary.value)
+    return SummaryCodec.train(sample)
+
+
+def _export(args) -> int:
+    """Subcomando export"""
+    from infrastructure.catalog_writers import export_catalog, export_format_for
+
+    export_format = args.format or ("binary" if args.file.endswith(".sxcat") else export_format_for(args.file))
+    if args.compress_summaries and export_format != "binary":
+        raise ValueError("--compress-summaries solo se aplica al formato binario")
+    if export_format == "binary":
+        from infrastructure.mapped_catalog import write_catalog
+        if args.file == "-":
+            raise ValueError("El formato binario requiere un archivo de salida")
+        repository = _open_repository(args)
+        count = write_catalog(args.file, repository.iter_all(), _summary_codec(args, repository))
+        print(f"{count} libros exportados", file=sys.stderr)
+        return 0
+    stats = export_catalog(args.file, _open_repository(args).iter_all(), export_format)
+    print(f"{stats.books} libros exportados ({stats.bytes_written / 1e6:.1f} MB, "
+          f"{stats.megabytes_per_second:.1f} MB/s)", file=sys.stderr)
+    return 0
+
+
+def _loan(args) -> int:
+    """Subcomandos borrow y return"""
+    from application.loans import BookLoanUseCase
+    from infrastructure.sqlite_book_repository import SQLiteLoanLedger
+
+    repository = _open_repository(args)
+    # Las copias prestadas se guardan junto al catálogo para acotar las devoluciones entre ejecuciones
+    ledger = None
+    if args.journal:
+        ledger = SQLiteLoanLedger(os.path.join(args.journal, "loans.db"))
+    elif not (args.catalog or args.shared):
+        ledger = SQLiteLoanLedger(args.db)
+    use_case = BookLoanUseCase(repository, ledger=ledger)
+    if args.command == "borrow":
+        response = use_case.borrow(args.book_id, args.copies)
+    else:
+        response = use_case.return_copies(args.book_id, args.copies)
+    if not response.success:
+        print(response.message, file=sys.stderr)
+        return 1
+    print(f"{response.message}: {response.copies_available} disponibles ({response.availability_status})")
+    return 0
+
+
+def _stats(args) -> int:
+    """Subcomando stats"""
+    from application.aggregates import CatalogAggregates
+
+    aggregates = CatalogAggregates().rebuild(_open_repository(args))
+    if args.format == "prometheus":
+        sys.stdout.write(aggregates.to_prometheus())
+        return 0
+    snapshot = aggregates.snapshot()
+    if args.format == "json":
+        import json
+        print(json.dumps(snapshot, ensure_ascii=False, indent=2))
+        return 0
+
+    print(f"{snapshot['titles']} títulos, {snapshot['copies']} copias")
+    print("\nPor sección:")
+    for location, counts in snapshot["shelves"].items():
+        print(f"  {location:<32} {counts['titles']:>8} títulos {counts['copies']:>10} copias")
+    for dimension, title in (("genres", "género"), ("languages", "idioma")):
+        print(f"\nPor {title}:")
+        for member, statuses in snapshot[dimension].items():
+            detail = ", ".join(
+                f"{status}: {counts['titles']} títulos/{counts['copies']} copias"
+                for status, counts in statuses.items()
+            )
+            print(f"  {member:<12} {detail}")
+    return 0
+
+
+def _snapshot(args) -> int:
+    """Subcomando snapshot"""
+    if not args.journal:
+        raise ValueError("El subcomando snapshot requiere --journal")
+    repository = _open_repository(args)
+    generation = repository.snapshot()
+    print(f"Snapshot {generation}: {repository.count()} libros "
+          f"({repository.replayed_events} eventos reproducidos al abrir)")
+    return 0
+
+
+def _publish(args) -> int:
+    """Subcomando publish: mantiene el snapshot publicado hasta Ctrl+C o SIGTERM"""
+    import signal
+    import time
+    from infrastructure.shared_catalog import SharedCatalogPublisher
+
+    # SIGTERM también sale por el with y elimina los segmentos
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    repository = _open_repository(args)
+    with SharedCatalogPublisher(args.name) as publisher:
+        count = repository.count()
+        summary_codec = _summary_codec(args, repository)
+        publisher.publish(repository.iter_all(), summary_codec)
+        print(f"Generación {publisher.generation}: {count} libros en '{args.name}'", file=sys.stderr)
+        try:
+            while True:
+                time.sleep(args.watch or 3600)
+                if args.watch and repository.count() != count:
+                    count = repository.count()
+                    publisher.publish(repository.iter_all(), summary_codec)
+                    print(f"Generación {publisher.generation}: {count} libros", file=sys.stderr)
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+
+def _serve(args) -> int:
+    """Subcomando serve"""
+    import asyncio
+    from application.aggregates import CatalogAggregates
+    from application.catalog_query import CatalogQueryEngine
+    from application.search_index import TrigramSearchIndex
+    from application.use_cases import BookRegistrationUseCase
+    from infrastructure.http_service import BookRegistrationHTTPService
+
+    repository = _open_repository(args)
+    aggregates = CatalogAggregates().rebuild(repository)
+    search_index = TrigramSearchIndex().rebuild(repository)
+    query_engine = CatalogQueryEngine(repository).rebuild()
+    service = BookRegistrationHTTPService(
+        BookRegistrationUseCase(repository, aggregates=aggregates,
+                                duplicates=_duplicate_index(args, repository),
+                                search_index=search_index, query_engine=query_engine), args.host, args.port,
+        max_in_flight=args.max_in_flight, workers=args.workers, aggregates=aggregates,
+        search_index=search_index, query_engine=query_engine
+    )
+
+    async def run():
+        await service.start()
+        print(f"Escuchando en http://{service.host}:{service.port}", file=sys.stderr)
+        try:
+            await service.serve_forever()
+        finally:
+            await service.close()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+    return 0
@@ -0,0 +1,347 @@
+import sys
+import threading
+from array import array
+from bisect import bisect_left
+from itertools import compress
+from types import SimpleNamespace
+from typing import Iterable, Iterator, List, Optional, Tuple
+from domain.codes import (
+    GENRES, LANGUAGES, AVAILABILITY_STATUSES,
+    GENRE_CODES, LANGUAGE_CODES, AVAILABILITY_CODES,
+    categories_to_mask, mask_to_categories
+)
+from domain.entities import Book
+from domain.repositories import BookRepository, BOOK_SORT_FIELDS
+from domain.value_objects import (
+    BookTitle, Author, PublicationYear, CopiesCount, BookSummary, trusted_value
+)
+from .summary_codec import SummaryCodec
+
+
+# Libros que los recorridos arman por cada toma del candado (tramos cortos: no retienen
+# tantos objetos como para disparar recolecciones del GC)
+_ITER_CHUNK = 64
+
+
+class ColumnarBookCatalog(BookRepository):
+    """Catálogo en memoria organizado por columnas de arrays compactos
+
+    Cada libro ocupa una posición en arrays tipados: enums como códigos uint8,
+    categorías como máscara de 6 bits, año y copias como uint16 y los textos
+    (título, autor y resumen, contiguos) en un único buffer UTF-8 compartido.
+    Las entidades ``Book`` se construyen bajo demanda al consultarlas.
+
+    Con ``summary_codec`` los resúmenes se guardan comprimidos con su diccionario
+    y los libros los entregan como ``CompressedSummary``, que se descomprime solo
+    al leer su texto.
+    """
+
+    # Columnas de arrays tipados, en el orden en que se copian y se guardan
+    COLUMNS = (
+        "book_ids", "text_offsets", "title_lengths", "author_lengths", "summary_lengths",
+        "publication_years", "copies_counts", "genre_codes", "language_codes",
+        "availability_codes", "category_masks"
+    )
+
+    def __init__(self, summary_codec: Optional[SummaryCodec] = None):
+        self._lock = threading.RLock()
+        self.summary_codec = summary_codec
+        self.book_ids = array("Q")
+        self.text_offsets = array("Q")
+        self.title_lengths = array("H")
+        self.author_lengths = array("H")
+        self.summary_lengths = array("H")
+        self.publication_years = array("H")
+        self.copies_counts = array("H")
+        self.genre_codes = array("B")
+        self.language_codes = array("B")
+        self.availability_codes = array("B")
+        self.category_masks = array("B")
+        self.text_buffer = bytearray()
+        # Permutaciones ordenadas por campo, se invalidan al agregar o modificar libros
+        self._sort_orders = {}
+
+    def __len__(self) -> int:
+        return len(self.book_ids)
+
+    def save(self, book: Book) -> Book:
+        """Agrega un libro al catálogo y le asigna un identificador"""
+        return self.save_many([book])[0]
+
+    def save_many(self, books: Iterable[Book]) -> List[Book]:
+        """Agrega varios libros; los identificadores deben ser crecientes
+
+        El lote se valida y codifica completo antes de agregar nada: si un libro no
+        entra, el catálogo y los identificadores de los libros quedan como estaban.
+        """
+        books = list(books)
+        with self._lock:
+            rows = self._encode_rows(books)
+            for row in rows:
+                self._append(row)
+            for book, row in zip(books, rows):
+                book.book_id = row[0]
+            if books:
+                self._sort_orders.clear()
+        return books
+
+    def _encode_rows(self, books: List[Book]) -> List[Tuple]:
+        """Identificador y columnas codificadas de cada libro; ValueError si un identificador no es creciente"""
+        last_id = self.book_ids[-1] if self.book_ids else 0
+        rows = []
+        for book in books:
+            if book.book_id is None:
+                book_id = last_id + 1
+            elif book.book_id <= last_id:
+                raise ValueError(f"Identificador de libro fuera de orden: {book.book_id}")
+            else:
+                book_id = book.book_id
+            rows.append((
+                book_id, book.title.value.encode("utf-8"), book.author.value.encode("utf-8"),
+                self._encode_summary(book.summary), book.publication_year.value, book.copies_count.value,
+                GENRE_CODES[book.genre], LANGUAGE_CODES[book.language],
+                AVAILABILITY_CODES[book.availability_status], categories_to_mask(book.categories)
+            ))
+            last_id = book_id
+        return rows
+
+    def _append(self, row: Tuple):
+        """Agrega a las columnas un libro ya codificado"""
+        (book_id, title, author, summary, year, copies,
+         genre_code, language_code, availability_code, category_mask) = row
+        self.book_ids.append(book_id)
+        self.text_offsets.append(len(self.text_buffer))
+        self.title_lengths.append(len(title))
+        self.author_lengths.append(len(author))
+        self.summary_lengths.append(len(summary))
+        self.text_buffer += title
+        self.text_buffer += author
+        self.text_buffer += summary
+
+        self.publication_years.append(year)
+        self.copies_counts.append(copies)
+        self.genre_codes.append(genre_code)
+        self.language_codes.append(language_code)
+        self.availability_codes.append(availability_code)
+        self.category_masks.append(category_mask)
+
+    def update(self, book: Book) -> Book:
+        """Reescribe en su lugar las columnas del libro
+
+        Los campos de ancho fijo se sobrescriben; si cambia algún texto, los textos
+        nuevos se agregan al final del buffer (el espacio anterior no se recupera).
+        """
+        with self._lock:
+            index = self.index_of(book.book_id) if book.book_id is not None else None
+            if index is None:
+                raise ValueError(f"Libro no encontrado: {book.book_id}")
+
+            title = book.title.value.encode("utf-8")
+            author = book.author.value.encode("utf-8")
+            summary = self._encode_summary(book.summary)
+            start = self.text_offsets[index]
+            end = start + self.title_lengths[index] + self.author_lengths[index] + self.summary_lengths[index]
+            changed = set()
+            if self.text_buffer[start:end] != title + author + summary:
+                self.text_offsets[index] = len(self.text_buffer)
+                self.title_lengths[index] = len(title)
+                self.author_lengths[index] = len(author)
+                self.summary_lengths[index] = len(summary)
+                self.text_buffer += title
+                self.text_buffer += author
+                self.text_buffer += summary
+                changed.update(("title", "author"))
+
+            for field, column, value in (
+                ("publication_year", self.publication_years, book.publication_year.value),
+                ("copies_count", self.copies_counts, book.copies_count.value),
+                ("genre", self.genre_codes, GENRE_CODES[book.genre]),
+                ("language", self.language_codes, LANGUAGE_CODES[book.language]),
+                ("availability_status", self.availability_codes, AVAILABILITY_CODES[book.availability_status]),
+                ("category_mask", self.category_masks, categories_to_mask(book.categories)),
+            ):
+                if column[index] != value:
+                    column[index] = value
+                    changed.add(field)
+            # Solo se descartan las permutaciones de los campos modificados
+            for field in changed:
+                self._sort_orders.pop(field, None)
+        return book
+
+    def delete_many(self, book_ids: Iterable[int]) -> int:
+        """Quita los libros compactando cada columna en una pasada
+
+        Como en ``update``, los textos de los libros eliminados quedan en el buffer.
+        """
+        with self._lock:
+            indexes = {index for index in map(self.index_of, book_ids) if index is not None}
+            if not indexes:
+                return 0
+            keep = bytes(index not in indexes for index in range(len(self.book_ids)))
+            for name in self.COLUMNS:
+                column = getattr(self, name)
+                setattr(self, name, array(column.typecode, compress(column, keep)))
+            self._sort_orders.clear()
+        return len(indexes)
+
+    def get(self, book_id: int) -> Optional[Book]:
+        """Obtiene un libro por su identificador (búsqueda binaria)"""
+        with self._lock:
+            index = self.index_of(book_id)
+            return self.book_at(index) if index is not None else None
+
+    def index_of(self, book_id: int) -> Optional[int]:
+        """Posición del libro en las columnas, o None si no existe"""
+        index = bisect_left(self.book_ids, book_id)
+        if index < len(self.book_ids) and self.book_ids[index] == book_id:
+            return index
+        return None
+
+    def book_at(self, index: int) -> Book:
+        """Construye la entidad Book de la posición indicada
+
+        Los valores se validaron al guardarlos: la entidad y sus objetos de valor se
+        arman sin volver a ejecutar las validaciones.
+        """
+        return self._build_book(self, index)
+
+    def _build_book(self, columns, index: int) -> Book:
+        """Arma el libro de la posición a partir de ``columns`` (el catálogo o una toma de sus columnas)"""
+        start = columns.text_offsets[index]
+        title_end = start + columns.title_lengths[index]
+        author_end = title_end + columns.author_lengths[index]
+        summary_end = author_end + columns.summary_lengths[index]
+        text = columns.text_buffer
+        book = object.__new__(Book)
+        book.__dict__.update(
+            title=trusted_value(BookTitle, text[start:title_end].decode("utf-8")),
+            author=trusted_value(Author, text[title_end:author_end].decode("utf-8")),
+            publication_year=trusted_value(PublicationYear, columns.publication_years[index]),
+            genre=GENRES[columns.genre_codes[index]],
+            categories=mask_to_categories(columns.category_masks[index]),
+            language=LANGUAGES[columns.language_codes[index]],
+            availability_status=AVAILABILITY_STATUSES[columns.availability_codes[index]],
+            copies_count=trusted_value(CopiesCount, columns.copies_counts[index]),
+            summary=self._decode_summary(text[author_end:summary_end]),
+            book_id=columns.book_ids[index]
+        )
+        return book
+
+    def _columns(self) -> SimpleNamespace:
+        """Referencias a las columnas actuales (llamar con el candado tomado)
+
+        ``delete_many`` reemplaza las columnas por otras nuevas: un recorrido que
+        empezó antes sigue sobre las que tomó y no mezcla posiciones de ambas.
+        """
+        return SimpleNamespace(text_buffer=self.text_buffer, **{name: getattr(self, name) for name in self.COLUMNS})
+
+    def _encode_summary(self, summary: BookSummary) -> bytes:
+        """Bytes guardados del resumen: UTF-8 o, con codec, el resumen comprimido"""
+        if self.summary_codec is None:
+            return (summary.value or "").encode("utf-8")
+        # Un resumen que ya viene de este catálogo no se descomprime para volver a comprimirlo
+        return self.summary_codec.encode_summary(summary)
+
+    def _decode_summary(self, data: bytearray) -> BookSummary:
+        if self.summary_codec is None:
+            return trusted_value(BookSummary, data.decode("utf-8"))
+        return self.summary_codec.summary(data)
+
+    def count(self) -> int:
+        """Cantidad de libros almacenados"""
+        return len(self.book_ids)
+
+    def iter_all(self) -> Iterator[Book]:
+        """Recorre los libros en orden de identificador construyéndolos bajo demanda
+
+        Recorre las columnas que había al empezar; cada tramo se arma bajo el candado
+        para no leer un ``update`` a medias.
+        """
+        with self._lock:
+            columns = self._columns()
+        total = len(columns.book_ids)
+        for start in range(0, total, _ITER_CHUNK):
+            with self._lock:
+                books = [self._build_book(columns, index) for index in range(start, min(start + _ITER_CHUNK, total))]
+            yield from books
+
+    def iter_by_year(self, publication_year: int) -> Iterator[Book]:
+        """Recorre los libros de un año filtrando la columna de años sin construir los demás"""
+        with self._lock:
+            columns = self._columns()
+        years = columns.publication_years
+        total = len(years)
+        for start in range(0, total, _ITER_CHUNK):
+            with self._lock:
+                books = [
+                    self._build_book(columns, index) for index in range(start, min(start + _ITER_CHUNK, total))
+                    if years[index] == publication_year
+                ]
+            yield from books
+
+    def find_page(self, offset: int, limit: int, order_by: str = "book_id",
+                  descending: bool = False) -> List[Book]:
+        """Obtiene una ventana ordenada construyendo solo los libros de la ventana"""
+        with self._lock:
+            order = self._sort_order(order_by)
+            total = len(order)
+            start = max(offset, 0)
+            end = min(start + limit, total)
+            if descending:
+                indexes = [order[total - 1 - position] for position in range(start, end)]
+            else:
+                indexes = order[start:end]
+            return [self.book_at(index) for index in indexes]
+
+    def _sort_order(self, order_by: str):
+        """Permutación de posiciones ordenada por el campo indicado (cacheada)"""
+        if order_by not in BOOK_SORT_FIELDS:
+            raise ValueError(f"Campo de orden no válido: {order_by}")
+        if order_by == "book_id":
+            return range(len(self.book_ids))
+        order = self._sort_orders.get(order_by)
+        if order is None:
+            key = self._sort_key(order_by)
+            order = array("I", sorted(range(len(self.book_ids)), key=key))
+            self._sort_orders[order_by] = order
+        return order
+
+    def _sort_key(self, order_by: str):
+        """Función que obtiene el valor del campo para una posición"""
+        if order_by == "title":
+            return lambda index: self._text_at(index, 0)
+        if order_by == "author":
+            return lambda index: self._text_at(index, 1)
+        if order_by == "genre":
+            return lambda index: GENRES[self.genre_codes[index]].value
+        if order_by == "language":
+            return lambda index: LANGUAGES[self.language_codes[index]].value
+        if order_by == "availability_status":
+            return lambda index: AVAILABILITY_STATUSES[self.availability_codes[index]].value
+        column = self.publication_years if order_by == "publication_year" else self.copies_counts
+        return column.__getitem__
+
+    def _text_at(self, index: int, field: int) -> str:
+        """Texto de la posición: 0 = título, 1 = autor"""
+        start = self.text_offsets[index]
+        if field == 1:
+            start += self.title_lengths[index]
+            length = self.author_lengths[index]
+        else:
+            length = self.title_lengths[index]
+        return self.text_buffer[start:start + length].decode("utf-8")
+
+    def memory_usage(self) -> int:
+        """Bytes ocupados por las columnas y el buffer de textos"""
+        columns = [getattr(self, name) for name in self.COLUMNS]
+        return sum(sys.getsizeof(column) for column in columns) + sys.getsizeof(self.text_buffer)
+
+    def copy(self) -> "ColumnarBookCatalog":
+        """Copia consistente del catálogo (copia de memoria de cada columna, sin construir libros)"""
+        clone = ColumnarBookCatalog(self.summary_codec)
+        with self._lock:
+            for name in self.COLUMNS:
+                setattr(clone, name, getattr(self, name)[:])
+            clone.text_buffer = self.text_buffer[:]
+        return clone
+
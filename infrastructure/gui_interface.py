@@ -1,19 +1,44 @@
+import queue
+import threading
 import tkinter as tk
-from tkinter import ttk, messagebox, scrolledtext
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from tkinter import ttk, messagebox, scrolledtext, filedialog
+from typing import Callable, List, Optional
 from application.use_cases import BookRegistrationUseCase
-from domain.dto import BookRegistrationRequest
+from domain.dto import BookRegistrationRequest, BookRegistrationResponse, BulkRegistrationStats
+from domain.entities import Book
 from domain.value_objects import Genre, Category, Language, AvailabilityStatus
+from infrastructure.catalog_browser import CatalogBrowser
+from infrastructure.catalog_readers import read_requests
 
 
 class BookRegistrationGUI:
     """Interfaz gráfica para registro de libros"""
     
-    def __init__(self):
+    # Intervalo de sondeo de resultados del worker (~60 fps)
+    POLL_INTERVAL_MS = 16
+    # Pausa sin teclear antes de buscar sugerencias, y cuántas mostrar
+    SEARCH_DELAY_MS = 150
+    SUGGESTION_LIMIT = 8
+    
+    def __init__(self, use_case: Optional[BookRegistrationUseCase] = None):
         self.root = tk.Tk()
-        self.use_case = BookRegistrationUseCase()
+        self.use_case = use_case or BookRegistrationUseCase()
+        # El caso de uso se ejecuta en un hilo aparte; los resultados vuelven por la cola
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="registro")
+        self._results: "queue.Queue[tuple]" = queue.Queue()
+        self._cancel_event = threading.Event()
+        # Las lecturas (sugerencias y páginas del catálogo) usan su propio hilo para no
+        # esperar detrás de una importación
+        self._search_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="busqueda")
+        self._search_after_id: Optional[str] = None
+        self._search_sequence = 0
+        self._suggestions: List[Book] = []
         self._setup_window()
         self._create_widgets()
+        self.root.protocol("WM_DELETE_WINDOW", self._on_close)
+        self.root.after(self.POLL_INTERVAL_MS, self._poll_results)
         
     def _setup_window(self):
         """Configuración inicial de la ventana"""
@@ -29,9 +54,25 @@ class BookRegistrationGUI:
     
     def _create_widgets(self):
         """Crear todos los widgets de la interfaz"""
+        # Pestañas: registro y catálogo
+        notebook = ttk.Notebook(self.root)
+        notebook.pack(fill="both", expand=True)
+        
+        registration_tab = ttk.Frame(notebook)
+        catalog_tab = ttk.Frame(notebook)
+        notebook.add(registration_tab, text="Registro")
+        notebook.add(catalog_tab, text="Catálogo")
+        
+        # Navegador del catálogo, se actualiza al abrir su pestaña
+        self.catalog_browser = CatalogBrowser(catalog_tab, self.use_case.repository, self._run_query)
+        notebook.bind(
+            "<<NotebookTabChanged>>",
+            lambda e: self.catalog_browser.refresh() if notebook.select() == str(catalog_tab) else None
+        )
+        
         # Frame principal con scrollbar
-        main_canvas = tk.Canvas(self.root)
-        scrollbar = ttk.Scrollbar(self.root, orient="vertical", command=main_canvas.yview)
+        main_canvas = tk.Canvas(registration_tab)
+        scrollbar = ttk.Scrollbar(registration_tab, orient="vertical", command=main_canvas.yview)
         scrollable_frame = ttk.Frame(main_canvas)
         
         scrollable_frame.bind(
@@ -92,6 +133,15 @@ class BookRegistrationGUI:
         self.year_entry = ttk.Entry(details_frame, width=20)
         self.year_entry.grid(row=2, column=1, padx=5, pady=5, sticky="w")
         
+        # Sugerencias de libros ya registrados mientras se escribe el título o el autor
+        self.suggestions_list = tk.Listbox(details_frame, height=self.SUGGESTION_LIMIT)
+        self.suggestions_list.grid(row=3, column=1, padx=5, pady=(0, 5), sticky="ew")
+        self.suggestions_list.grid_remove()
+        self.suggestions_list.bind("<<ListboxSelect>>", self._on_suggestion_selected)
+        if self.use_case.search_index is not None:
+            self.title_entry.bind("<KeyRelease>", lambda e: self._schedule_search("title"))
+            self.author_entry.bind("<KeyRelease>", lambda e: self._schedule_search("author"))
+        
         details_frame.columnconfigure(1, weight=1)
     
     def _create_genre_category_frame(self, parent):
@@ -177,13 +227,92 @@ class BookRegistrationGUI:
         buttons_frame.pack(fill="x", padx=10, pady=20)
         
         # Botón Registrar
-        register_btn = ttk.Button(buttons_frame, text="Registrar Libro", 
-                                 command=self._register_book, style="Accent.TButton")
-        register_btn.pack(side="left", padx=10)
+        self.register_btn = ttk.Button(buttons_frame, text="Registrar Libro", 
+                                      command=self._register_book, style="Accent.TButton")
+        self.register_btn.pack(side="left", padx=10)
         
         # Botón Limpiar
         clear_btn = ttk.Button(buttons_frame, text="Limpiar", command=self._clear_form)
         clear_btn.pack(side="left", padx=10)
+        
+        # Botón Importar catálogo (CSV/JSONL)
+        self.import_btn = ttk.Button(buttons_frame, text="Importar Catálogo", command=self._import_catalog)
+        self.import_btn.pack(side="left", padx=10)
+        
+        # Botón Cancelar (solo activo durante operaciones largas)
+        self.cancel_btn = ttk.Button(buttons_frame, text="Cancelar", command=self._cancel_operation,
+                                     state="disabled")
+        self.cancel_btn.pack(side="left", padx=10)
+        
+        # Indicador de progreso y estado
+        progress_frame = ttk.Frame(parent)
+        progress_frame.pack(fill="x", padx=10, pady=(0, 20))
+        
+        self.progress_bar = ttk.Progressbar(progress_frame, mode="indeterminate", length=200)
+        self.progress_bar.pack(side="left", padx=10)
+        
+        self.status_var = tk.StringVar(value="Listo")
+        ttk.Label(progress_frame, textvariable=self.status_var).pack(side="left", padx=10)
+    
+    def _schedule_search(self, field: str):
+        """Reprograma la búsqueda de sugerencias tras cada tecla (debounce)"""
+        if self._search_after_id is not None:
+            self.root.after_cancel(self._search_after_id)
+        self._search_after_id = self.root.after(self.SEARCH_DELAY_MS, lambda: self._start_search(field))
+    
+    def _start_search(self, field: str):
+        """Lanza la búsqueda del texto actual del campo en el hilo de búsqueda"""
+        self._search_after_id = None
+        entry = self.title_entry if field == "title" else self.author_entry
+        text = entry.get().strip()
+        # Cada búsqueda invalida las anteriores que todavía no respondieron
+        self._search_sequence += 1
+        if len(text) < 2:
+            self._show_suggestions((self._search_sequence, []))
+            return
+        self._search_executor.submit(self._search_task, self._search_sequence, text, field)
+    
+    def _search_task(self, sequence: int, text: str, field: str):
+        """Tarea del hilo de búsqueda: publica los libros encontrados por la cola"""
+        try:
+            hits = self.use_case.search_index.search(text, limit=self.SUGGESTION_LIMIT, field=field)
+            books = [self.use_case.repository.get(hit.book_id) for hit in hits]
+        except Exception:
+            books = []
+        self._results.put((self._show_suggestions, (sequence, [book for book in books if book is not None])))
+    
+    def _show_suggestions(self, payload: tuple):
+        """Muestra las sugerencias si corresponden a la última búsqueda"""
+        sequence, books = payload
+        if sequence != self._search_sequence:
+            return
+        self._suggestions = books
+        self.suggestions_list.delete(0, tk.END)
+        for book in books:
+            self.suggestions_list.insert(
+                tk.END, f"{book.title.value} — {book.author.value} ({book.publication_year.value})"
+            )
+        if books:
+            self.suggestions_list.grid()
+        else:
+            self.suggestions_list.grid_remove()
+    
+    def _on_suggestion_selected(self, _event):
+        """Completa título, autor y año con la sugerencia elegida"""
+        selection = self.suggestions_list.curselection()
+        if not selection:
+            return
+        book = self._suggestions[selection[0]]
+        for entry, value in ((self.title_entry, book.title.value), (self.author_entry, book.author.value),
+                             (self.year_entry, str(book.publication_year.value))):
+            entry.delete(0, tk.END)
+            entry.insert(0, value)
+        self._hide_suggestions()
+    
+    def _hide_suggestions(self):
+        """Oculta las sugerencias y descarta las búsquedas en curso"""
+        self._search_sequence += 1
+        self._show_suggestions((self._search_sequence, []))
     
     def _register_book(self):
         """Registrar un nuevo libro"""
@@ -242,25 +371,153 @@ class BookRegistrationGUI:
                 summary=self.summary_text.get("1.0", tk.END).strip()
             )
             
-            # Ejecutar caso de uso
-            response = self.use_case.execute(request)
-            
-            if response.success:
-                # Mostrar información en terminal (consola)
-                print("\n" + "="*50)
-                print("LIBRO REGISTRADO EXITOSAMENTE")
-                print("="*50)
-                print(response.book_info)
-                print("="*50 + "\n")
-                
-                messagebox.showinfo("Éxito", "Libro registrado exitosamente. Verifique la información en la terminal.")
-                self._clear_form()
-            else:
-                messagebox.showerror("Error", response.message)
+            # Ejecutar caso de uso en segundo plano
+            self.status_var.set("Registrando libro...")
+            self._run_in_background(lambda: self.use_case.execute(request), self._on_book_registered)
                 
         except Exception as e:
             messagebox.showerror("Error", f"Error inesperado: {str(e)}")
     
+    def _on_book_registered(self, response: BookRegistrationResponse):
+        """Procesa la respuesta del registro en el hilo de la interfaz"""
+        if response.success:
+            # Mostrar información en terminal (consola)
+            print("\n" + "="*50)
+            print("LIBRO REGISTRADO EXITOSAMENTE")
+            print("="*50)
+            print(response.book_info)
+            print("="*50 + "\n")
+            
+            self.status_var.set("Libro registrado")
+            messagebox.showinfo("Éxito", "Libro registrado exitosamente. Verifique la información en la terminal.")
+            self._clear_form()
+        else:
+            self.status_var.set("Error en el registro")
+            messagebox.showerror("Error", response.message)
+    
+    def _import_catalog(self):
+        """Importar un catálogo CSV/JSONL en segundo plano"""
+        path = filedialog.askopenfilename(
+            title="Importar catálogo",
+            filetypes=[("Catálogos", "*.csv *.jsonl *.ndjson"), ("Todos los archivos", "*.*")]
+        )
+        if not path:
+            return
+        
+        self._cancel_event.clear()
+        self.cancel_btn.configure(state="normal")
+        self.status_var.set("Importando catálogo...")
+        self._run_in_background(lambda: self._import_task(path), self._on_import_finished)
+    
+    def _import_task(self, path: str) -> BulkRegistrationStats:
+        """Tarea del worker: registra el catálogo y publica el avance por la cola"""
+        stats = BulkRegistrationStats()
+        reported = 0
+        # Al cancelar se cierran los generadores ya mismo, sin esperar al recolector
+        with closing(read_requests(path)) as requests, \
+                closing(self.use_case.execute_many(requests, stats=stats, include_book_info=False)) as responses:
+            for _ in responses:
+                if self._cancel_event.is_set():
+                    break
+                if stats.processed != reported:
+                    reported = stats.processed
+                    progress = BulkRegistrationStats(
+                        stats.processed, stats.succeeded, stats.failed, stats.elapsed_seconds
+                    )
+                    self._results.put((self._on_import_progress, progress))
+        return stats
+    
+    def _on_import_progress(self, stats: BulkRegistrationStats):
+        """Actualiza el estado con el avance de la importación"""
+        self.status_var.set(
+            f"Importando... {stats.processed} filas ({stats.rows_per_second:,.0f} filas/seg)"
+        )
+    
+    def _on_import_finished(self, stats: BulkRegistrationStats):
+        """Informa el resultado de la importación"""
+        prefix = "Importación cancelada" if self._cancel_event.is_set() else "Importación finalizada"
+        summary = (
+            f"{prefix}: {stats.succeeded} registrados, {stats.failed} con error "
+            f"({stats.rows_per_second:,.0f} filas/seg)"
+        )
+        self.status_var.set(summary)
+        messagebox.showinfo("Importación", summary)
+    
+    def _cancel_operation(self):
+        """Solicita la cancelación de la operación en curso"""
+        self._cancel_event.set()
+        self.status_var.set("Cancelando...")
+    
+    def _run_in_background(self, task: Callable, on_done: Callable):
+        """Ejecuta la tarea en el worker y entrega el resultado en el hilo de la interfaz"""
+        self._set_busy(True)
+        
+        def worker():
+            try:
+                result = task()
+            except Exception as e:
+                self._results.put((self._on_task_failed, e))
+            else:
+                self._results.put((on_done, result))
+            finally:
+                self._results.put((self._on_task_finished, None))
+        
+        self._executor.submit(worker)
+    
+    def _run_query(self, task: Callable, on_done: Callable):
+        """Ejecuta una lectura en el hilo de búsqueda y entrega el resultado en el de la interfaz"""
+        def worker():
+            try:
+                result = task()
+            except Exception as e:
+                self._results.put((self._on_task_failed, e))
+            else:
+                self._results.put((on_done, result))
+        
+        self._search_executor.submit(worker)
+    
+    def _poll_results(self):
+        """Atiende los mensajes del worker sin bloquear el bucle de eventos"""
+        try:
+            while True:
+                callback, payload = self._results.get_nowait()
+                try:
+                    callback(payload)
+                except Exception as e:
+                    # Un callback con error no debe cortar la entrega de los siguientes
+                    self._on_task_failed(e)
+        except queue.Empty:
+            pass
+        finally:
+            self.root.after(self.POLL_INTERVAL_MS, self._poll_results)
+    
+    def _on_task_failed(self, error: Exception):
+        """Muestra errores inesperados ocurridos en el worker"""
+        self.status_var.set("Error")
+        messagebox.showerror("Error", f"Error inesperado: {str(error)}")
+    
+    def _on_task_finished(self, _):
+        """Restaura los controles al terminar una tarea"""
+        self._set_busy(False)
+    
+    def _set_busy(self, busy: bool):
+        """Activa o desactiva los controles mientras hay una tarea en curso"""
+        state = "disabled" if busy else "normal"
+        self.register_btn.configure(state=state)
+        self.import_btn.configure(state=state)
+        if busy:
+            self.progress_bar.start(self.POLL_INTERVAL_MS)
+        else:
+            self.progress_bar.stop()
+            self.cancel_btn.configure(state="disabled")
+    
+    def _on_close(self):
+        """Cancela el trabajo pendiente y cierra la ventana"""
+        self._cancel_event.set()
+        self._executor.shutdown(wait=False)
+        self._search_executor.shutdown(wait=False)
+        self.root.destroy()
+    
     def _clear_form(self):
         """Limpiar todos los campos del formulario"""
         # Limpiar entries
@@ -283,6 +540,8 @@ class BookRegistrationGUI:
         
         # Limpiar texto
         self.summary_text.delete("1.0", tk.END)
+        
+        self._hide_suggestions()
     
     def run(self):
         """Ejecutar la aplicación"""
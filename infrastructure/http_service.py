@@ -0,0 +1,318 @@
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs
+from application.aggregates import CatalogAggregates
+from application.catalog_query import CatalogQueryEngine
+from application.search_index import SEARCH_FIELDS, TrigramSearchIndex
+from application.use_cases import BookRegistrationUseCase
+from domain.dto import BookQuery
+from infrastructure.catalog_readers import row_to_request
+
+
+_REASONS = {
+    200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+    413: "Payload Too Large", 500: "Internal Server Error", 503: "Service Unavailable",
+}
+
+
+def _optional_int(params: Dict[str, str], name: str) -> Optional[int]:
+    """Parámetro entero opcional de la query string; ValueError si no es un número"""
+    value = params.get(name)
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"{name} debe ser un número entero")
+
+
+class HTTPError(Exception):
+    """Error que se responde al cliente con el código indicado"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class BookRegistrationHTTPService:
+    """Servicio HTTP/1.1 con JSON sobre asyncio para registrar libros
+
+    Rutas:
+        GET  /health       estado del servicio
+        GET  /stats        agregados del catálogo (si se entregan ``aggregates``)
+        GET  /search?q=    búsqueda aproximada por título o autor (si se entrega
+                           ``search_index``; parámetros opcionales ``field`` y ``limit``)
+        GET  /books?...    consulta por varios criterios con paginación por cursor (si
+                           se entrega ``query_engine``; parámetros de ``BookQuery``)
+        POST /books        registra un BookRegistrationRequest
+        POST /books/batch  registra un arreglo de BookRegistrationRequest
+
+    Las conexiones son keep-alive. El caso de uso se ejecuta en un pool de hilos
+    acotado y, cuando hay ``max_in_flight`` solicitudes en curso, las nuevas se
+    rechazan de inmediato con 503 en lugar de encolarse sin límite.
+    """
+
+    MAX_SEARCH_LIMIT = 100
+
+    def __init__(self, use_case: BookRegistrationUseCase, host: str = "127.0.0.1", port: int = 8080,
+                 max_in_flight: int = 64, max_batch_size: int = 1000,
+                 max_body_bytes: int = 8 * 1024 * 1024, workers: int = 4,
+                 idle_timeout_seconds: float = 30.0,
+                 aggregates: Optional[CatalogAggregates] = None,
+                 search_index: Optional[TrigramSearchIndex] = None,
+                 query_engine: Optional[CatalogQueryEngine] = None):
+        self.use_case = use_case
+        self.aggregates = aggregates
+        self.search_index = search_index
+        self.query_engine = query_engine
+        self.host = host
+        self.port = port
+        self.max_in_flight = max_in_flight
+        self.max_batch_size = max_batch_size
+        self.max_body_bytes = max_body_bytes
+        self.idle_timeout_seconds = idle_timeout_seconds
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="http-registro")
+        self._in_flight = 0
+        self.rejected = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self):
+        """Comienza a aceptar conexiones"""
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        """Atiende conexiones hasta que se cancele la tarea"""
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        """Deja de aceptar conexiones y libera el pool de hilos"""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        self._executor.shutdown(wait=True)
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Atiende todas las solicitudes de una conexión keep-alive"""
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(self._read_request(reader), self.idle_timeout_seconds)
+                except HTTPError as e:
+                    await self._send(writer, e.status, {"error": str(e)}, keep_alive=False)
+                    return
+                if request is None:
+                    return
+                method, path, headers, body = request
+                keep_alive = headers.get("connection", "").lower() != "close"
+                status, payload = await self._dispatch(method, path, body)
+                await self._send(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    return
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+            return
+        finally:
+            writer.close()
+
+    async def _read_request(self, reader: asyncio.StreamReader) -> Optional[Tuple[str, str, Dict[str, str], bytes]]:
+        """Lee una solicitud completa; None si el cliente cerró la conexión"""
+        request_line = await reader.readline()
+        if not request_line:
+            return None
+        try:
+            method, path, _ = request_line.decode("latin-1").split(" ", 2)
+        except ValueError:
+            raise HTTPError(400, "Línea de solicitud inválida")
+
+        headers: Dict[str, str] = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        try:
+            length = int(headers.get("content-length", "0") or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            raise HTTPError(400, "Content-Length inválido")
+        if length > self.max_body_bytes:
+            raise HTTPError(413, "El cuerpo de la solicitud es demasiado grande")
+        body = await reader.readexactly(length) if length else b""
+        return method.upper(), path, headers, body
+
+    async def _dispatch(self, method: str, target: str, body: bytes) -> Tuple[int, object]:
+        """Enruta la solicitud y aplica el control de carga"""
+        path, _, query = target.partition("?")
+        if path == "/health":
+            return 200, {"status": "ok", "in_flight": self._in_flight, "rejected": self.rejected}
+        if path == "/stats" and self.aggregates is not None:
+            if method != "GET":
+                return 405, {"error": "Método no permitido"}
+            return 200, self.aggregates.snapshot()
+        if path == "/search" and self.search_index is not None:
+            if method != "GET":
+                return 405, {"error": "Método no permitido"}
+            return await self._search(query)
+        if path == "/books" and method == "GET" and self.query_engine is not None:
+            return await self._query(query)
+        if path not in ("/books", "/books/batch"):
+            return 404, {"error": "Ruta no encontrada"}
+        if method != "POST":
+            return 405, {"error": "Método no permitido"}
+
+        if self._in_flight >= self.max_in_flight:
+            # Se descarta la carga en lugar de hacer crecer la cola
+            self.rejected += 1
+            return 503, {"error": "Servicio saturado, reintente más tarde"}
+
+        try:
+            document = json.loads(body or b"null")
+        except ValueError:
+            return 400, {"error": "JSON inválido"}
+
+        self._in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            if path == "/books":
+                if not isinstance(document, dict):
+                    return 400, {"error": "Se esperaba un objeto JSON"}
+                response = await loop.run_in_executor(self._executor, self._register_one, document)
+                return 200, asdict(response)
+            if not isinstance(document, list):
+                return 400, {"error": "Se esperaba un arreglo JSON"}
+            if len(document) > self.max_batch_size:
+                return 413, {"error": f"El lote no puede superar {self.max_batch_size} libros"}
+            responses = await loop.run_in_executor(self._executor, self._register_batch, document)
+            return 200, {
+                "registered": sum(1 for response in responses if response["success"]),
+                "failed": sum(1 for response in responses if not response["success"]),
+                "results": responses,
+            }
+        except Exception as e:
+            return 500, {"error": f"Error inesperado: {str(e)}"}
+        finally:
+            self._in_flight -= 1
+
+    async def _search(self, query: str) -> Tuple[int, object]:
+        """Valida los parámetros de /search y busca en el pool de hilos"""
+        params = parse_qs(query)
+        text = params.get("q", [""])[0].strip()
+        if not text:
+            return 400, {"error": "Falta el parámetro q"}
+        field = params.get("field", [None])[0]
+        if field is not None and field not in SEARCH_FIELDS:
+            return 400, {"error": f"field debe ser uno de: {', '.join(SEARCH_FIELDS)}"}
+        try:
+            limit = int(params.get("limit", ["10"])[0])
+        except ValueError:
+            return 400, {"error": "limit debe ser un número entero"}
+        if not 1 <= limit <= self.MAX_SEARCH_LIMIT:
+            return 400, {"error": f"limit debe estar entre 1 y {self.MAX_SEARCH_LIMIT}"}
+
+        loop = asyncio.get_running_loop()
+        results = await loop.run_in_executor(self._executor, self._search_books, text, field, limit)
+        return 200, {"query": text, "results": results}
+
+    async def _query(self, query: str) -> Tuple[int, object]:
+        """Convierte los parámetros de GET /books en un BookQuery y lo ejecuta en el pool de hilos"""
+        parsed = parse_qs(query)
+        params = {name: values[-1] for name, values in parsed.items()}
+        params.setdefault("limit", "20")
+        try:
+            book_query = BookQuery(
+                genre=params.get("genre"),
+                language=params.get("language"),
+                availability_status=params.get("availability_status"),
+                categories=parsed.get("category", []),
+                year_from=_optional_int(params, "year_from"),
+                year_to=_optional_int(params, "year_to"),
+                min_copies=_optional_int(params, "min_copies"),
+                title_contains=params.get("title"),
+                author_contains=params.get("author"),
+                order_by=params.get("order_by", "book_id"),
+                descending=params.get("desc", "false").lower() in ("1", "true"),
+                limit=_optional_int(params, "limit"),
+                cursor=params.get("cursor"),
+            )
+        except ValueError as e:
+            return 400, {"error": str(e)}
+        if not 1 <= book_query.limit <= self.MAX_SEARCH_LIMIT:
+            return 400, {"error": f"limit debe estar entre 1 y {self.MAX_SEARCH_LIMIT}"}
+
+        loop = asyncio.get_running_loop()
+        try:
+            page = await loop.run_in_executor(self._executor, self.query_engine.execute, book_query)
+        except ValueError as e:
+            return 400, {"error": str(e)}
+        return 200, {
+            "results": [
+                {
+                    "book_id": book.book_id,
+                    "title": book.title.value,
+                    "author": book.author.value,
+                    "publication_year": book.publication_year.value,
+                    "genre": book.genre.value,
+                    "categories": sorted(category.value for category in book.categories),
+                    "language": book.language.value,
+                    "availability_status": book.availability_status.value,
+                    "copies_count": book.copies_count.value,
+                }
+                for book in page.books
+            ],
+            "next_cursor": page.next_cursor,
+            "plan": page.plan,
+        }
+
+    def _search_books(self, text: str, field: Optional[str], limit: int) -> list:
+        """Busca y completa cada resultado con los datos del libro (se ejecuta en el pool de hilos)"""
+        results = []
+        for hit in self.search_index.search(text, limit=limit, field=field):
+            book = self.use_case.repository.get(hit.book_id)
+            if book is None:
+                continue
+            results.append({
+                "book_id": hit.book_id,
+                "field": hit.field,
+                "score": hit.score,
+                "title": book.title.value,
+                "author": book.author.value,
+                "publication_year": book.publication_year.value,
+            })
+        return results
+
+    def _register_one(self, document: dict):
+        """Registra un libro (se ejecuta en el pool de hilos)"""
+        return self.use_case.execute(row_to_request(document))
+
+    def _register_batch(self, documents: list) -> list:
+        """Registra un lote en una transacción por bloque (se ejecuta en el pool de hilos)"""
+        requests = (row_to_request(document if isinstance(document, dict) else {})
+                    for document in documents)
+        return [
+            {"success": response.success, "message": response.message}
+            for response in self.use_case.execute_many(requests, include_book_info=False)
+        ]
+
+    @staticmethod
+    async def _send(writer: asyncio.StreamWriter, status: int, payload: object, keep_alive: bool):
+        """Escribe una respuesta JSON"""
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        head = (
+            f"HTTP/1.1 {status} {_REASONS.get(status, 'OK')}\r\n"
+            f"Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+        )
+        if status == 503:
+            head += "Retry-After: 1\r\n"
+        writer.write(head.encode("latin-1") + b"\r\n" + body)
+        await writer.drain()
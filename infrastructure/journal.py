@@ -0,0 +1,442 @@
+"""
+Journal de solo agregado con commit en grupo y recuperación desde snapshots
+
+El catálogo vive en memoria (``ColumnarBookCatalog``) y cada registro o
+actualización se agrega al journal como un evento binario. Los eventos se
+acumulan en memoria y un hilo los escribe con un único ``fsync`` cada
+``sync_every`` eventos o cada ``sync_interval_ms`` milisegundos (commit en grupo),
+así registrar un libro no espera al disco.
+
+Archivos del directorio:
+
+    journal-<generación>.log    segmentos de eventos
+    snapshot-<generación>.bin   columnas del catálogo con todos los eventos de los
+                                segmentos de generación menor
+
+Formato de un evento: tipo u8 | largo u32 | crc32 u32 | libro (``book_codec``);
+las bajas llevan en lugar del libro los identificadores eliminados (u64 cada uno).
+Al arrancar se carga el snapshot más reciente y se reproducen solo los segmentos
+posteriores; un evento incompleto, con crc inválido, de tipo desconocido o cuyo
+contenido no se puede decodificar (escritura interrumpida, relleno de ceros)
+termina la reproducción de su segmento.
+"""
+
+import os
+import re
+import struct
+import sys
+import threading
+import zlib
+from typing import Iterable, Iterator, List, Optional, Tuple
+from domain.entities import Book
+from domain.repositories import BookRepository
+from .book_codec import decode_book, encode_book
+from .columnar_catalog import ColumnarBookCatalog
+
+
+EVENT_REGISTERED = 1
+# Préstamos, devoluciones y fusiones de copias llegan como actualizaciones del libro completo
+EVENT_UPDATED = 2
+# Un evento por cada ``delete_many``, con todos sus identificadores
+EVENT_DELETED = 3
+
+SEGMENT_MAGIC = b"SXJ\x01"
+SNAPSHOT_MAGIC = b"SXS\x01"
+
+_EVENT_HEADER = struct.Struct("<BII")
+_SNAPSHOT_HEADER = struct.Struct("<4scQQ")
+_COLUMN_HEADER = struct.Struct("<cQ")
+_BOOK_ID = struct.Struct("<Q")
+_FILE_NAME = re.compile(r"^(journal|snapshot)-(\d+)\.(log|bin)$")
+
+
+class RegistrationJournal:
+    """Escritor de un archivo de journal con commit en grupo
+
+    ``append`` solo agrega el evento a un buffer en memoria y devuelve su número de
+    secuencia. Un hilo de fondo escribe el buffer y hace ``fsync`` cuando se juntan
+    ``sync_every`` eventos o pasa ``sync_interval`` segundos; ``sync`` lo hace de
+    inmediato y ``wait_durable`` espera a que un evento esté en disco.
+    """
+
+    def __init__(self, path: str, sync_every: int = 1000, sync_interval: float = 0.01):
+        if sync_every < 1 or sync_interval <= 0:
+            raise ValueError("sync_every y sync_interval deben ser mayores que cero")
+        self.path = path
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+        self.syncs = 0
+        self.durable_sequence = 0
+        self._lock = threading.Lock()
+        self._wake = threading.Condition(self._lock)
+        self._durable = threading.Condition(self._lock)
+        # Serializa las escrituras al archivo, en el mismo orden que los eventos
+        self._io_lock = threading.RLock()
+        self._pending = bytearray()
+        self._unsynced = 0
+        self._sequence = 0
+        self._segment_start = 0
+        self._closed = False
+        self._file = self._open_segment(path)
+        self._flusher = threading.Thread(target=self._run, name="journal-commit", daemon=True)
+        self._flusher.start()
+
+    @staticmethod
+    def _open_segment(path: str):
+        """Abre el segmento para agregar, escribiendo la cabecera si es nuevo"""
+        handle = open(path, "ab")
+        if handle.tell() == 0:
+            handle.write(SEGMENT_MAGIC)
+            handle.flush()
+            os.fsync(handle.fileno())
+            _sync_directory(os.path.dirname(path))
+        return handle
+
+    @property
+    def sequence(self) -> int:
+        """Cantidad de eventos agregados"""
+        return self._sequence
+
+    def append(self, kind: int, payload: bytes) -> int:
+        """Agrega un evento al buffer; devuelve su número de secuencia"""
+        return self.append_many(kind, (payload,))
+
+    def append_many(self, kind: int, payloads: Iterable[bytes]) -> int:
+        """Agrega varios eventos con una sola toma del candado; devuelve la última secuencia"""
+        with self._lock:
+            if self._closed:
+                raise ValueError("El journal está cerrado")
+            pending = self._pending
+            for payload in payloads:
+                pending += _EVENT_HEADER.pack(kind, len(payload), zlib.crc32(payload))
+                pending += payload
+                self._sequence += 1
+                self._unsynced += 1
+            if self._unsynced >= self.sync_every:
+                self._wake.notify()
+            return self._sequence
+
+    def sync(self) -> int:
+        """Escribe y sincroniza con el disco los eventos pendientes; devuelve la secuencia durable"""
+        with self._io_lock:
+            with self._lock:
+                data = self._pending
+                sequence = self._sequence
+                self._pending = bytearray()
+                self._unsynced = 0
+            if data:
+                self._file.write(data)
+                self._file.flush()
+                os.fsync(self._file.fileno())
+                self.syncs += 1
+            with self._lock:
+                self.durable_sequence = sequence
+                self._durable.notify_all()
+        return sequence
+
+    def wait_durable(self, sequence: int, timeout: Optional[float] = None) -> bool:
+        """Espera a que el evento ``sequence`` esté en disco; False si vence ``timeout``"""
+        with self._lock:
+            return self._durable.wait_for(lambda: self.durable_sequence >= sequence, timeout)
+
+    def rotate(self, path: str):
+        """Sincroniza el segmento actual y continúa en un segmento nuevo"""
+        with self._io_lock:
+            self.sync()
+            self._close_segment()
+            self._file = self._open_segment(path)
+            self.path = path
+            self._segment_start = self._sequence
+
+    def close(self):
+        """Detiene el hilo de commit y sincroniza lo pendiente"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._wake.notify()
+        self._flusher.join()
+        self.sync()
+        self._close_segment()
+
+    def _close_segment(self):
+        """Cierra el archivo actual; un segmento sin eventos se borra"""
+        self._file.close()
+        if self._sequence == self._segment_start:
+            os.remove(self.path)
+
+    def _run(self):
+        """Hilo de commit en grupo: sincroniza por cantidad de eventos o por tiempo"""
+        while True:
+            with self._lock:
+                self._wake.wait_for(lambda: self._closed or self._unsynced >= self.sync_every,
+                                    self.sync_interval)
+                if self._closed:
+                    return
+                if not self._unsynced:
+                    continue
+            self.sync()
+
+
+class JournaledBookRepository(BookRepository):
+    """Repositorio en memoria cuya durabilidad la da un journal de eventos
+
+    Las consultas las responde un ``ColumnarBookCatalog``; cada ``save_many`` o
+    ``update`` modifica el catálogo y agrega sus eventos al journal bajo el mismo
+    candado, así el orden de los eventos es el de los identificadores. Un evento
+    está en disco a lo sumo ``sync_interval_ms`` después de agregarse; quien
+    necesite esperar puede llamar ``wait_durable()``.
+
+    ``snapshot()`` copia las columnas del catálogo, pasa a un segmento nuevo y
+    escribe el snapshot en un hilo aparte; al terminar borra los segmentos que
+    cubre. Con ``snapshot_every`` se toma uno automáticamente cada esa cantidad de
+    eventos.
+    """
+
+    def __init__(self, directory: str, sync_every: int = 1000, sync_interval_ms: float = 10.0,
+                 snapshot_every: Optional[int] = None):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.snapshot_every = snapshot_every
+        self._lock = threading.RLock()
+        self._snapshot_thread: Optional[threading.Thread] = None
+        self._events_since_snapshot = 0
+        self.catalog, generation, self.replayed_events = self._recover()
+        self._generation = generation + 1
+        self._journal = RegistrationJournal(self._path("journal", self._generation),
+                                            sync_every, sync_interval_ms / 1000)
+
+    def _path(self, kind: str, generation: int) -> str:
+        extension = "log" if kind == "journal" else "bin"
+        return os.path.join(self.directory, f"{kind}-{generation:010d}.{extension}")
+
+    def _generations(self, kind: str) -> List[int]:
+        """Generaciones existentes de segmentos o snapshots, en orden"""
+        found = []
+        for name in os.listdir(self.directory):
+            match = _FILE_NAME.match(name)
+            if match and match.group(1) == kind:
+                found.append(int(match.group(2)))
+        return sorted(found)
+
+    def _recover(self) -> Tuple[ColumnarBookCatalog, int, int]:
+        """Carga el último snapshot y reproduce los segmentos posteriores"""
+        snapshots = self._generations("snapshot")
+        segments = self._generations("journal")
+        base = snapshots[-1] if snapshots else 0
+        catalog = read_snapshot(self._path("snapshot", base)) if snapshots else ColumnarBookCatalog()
+        replayed = 0
+        for generation in segments:
+            if generation >= base:
+                replayed += replay_segment(self._path("journal", generation), catalog)
+        return catalog, max(snapshots + segments, default=0), replayed
+
+    def save(self, book: Book) -> Book:
+        """Guarda un libro y registra el evento"""
+        return self.save_many([book])[0]
+
+    def save_many(self, books: Iterable[Book]) -> List[Book]:
+        """Agrega los libros al catálogo y sus eventos al journal"""
+        with self._lock:
+            saved = self.catalog.save_many(books)
+            self._journal.append_many(EVENT_REGISTERED, [encode_book(book) for book in saved])
+            self._after_events(len(saved))
+        return saved
+
+    def update(self, book: Book) -> Book:
+        """Reemplaza el libro en el catálogo y registra el evento"""
+        with self._lock:
+            updated = self.catalog.update(book)
+            self._journal.append(EVENT_UPDATED, encode_book(updated))
+            self._after_events(1)
+        return updated
+
+    def delete_many(self, book_ids: Iterable[int]) -> int:
+        """Quita los libros del catálogo y registra un único evento de baja"""
+        with self._lock:
+            # Solo se registran los identificadores que existían
+            book_ids = [book_id for book_id in book_ids if self.catalog.index_of(book_id) is not None]
+            if not book_ids:
+                return 0
+            deleted = self.catalog.delete_many(book_ids)
+            self._journal.append(EVENT_DELETED, struct.pack(f"<{len(book_ids)}Q", *book_ids))
+            self._after_events(1)
+        return deleted
+
+    def get(self, book_id: int) -> Optional[Book]:
+        return self.catalog.get(book_id)
+
+    def count(self) -> int:
+        return self.catalog.count()
+
+    def iter_all(self) -> Iterator[Book]:
+        return self.catalog.iter_all()
+
+    def iter_by_year(self, publication_year: int) -> Iterator[Book]:
+        return self.catalog.iter_by_year(publication_year)
+
+    def find_page(self, offset: int, limit: int, order_by: str = "book_id",
+                  descending: bool = False) -> List[Book]:
+        return self.catalog.find_page(offset, limit, order_by, descending)
+
+    def wait_durable(self, timeout: Optional[float] = None) -> bool:
+        """Espera a que todos los eventos agregados hasta ahora estén en disco"""
+        return self._journal.wait_durable(self._journal.sequence, timeout)
+
+    @property
+    def journal(self) -> RegistrationJournal:
+        return self._journal
+
+    def _after_events(self, count: int):
+        """Cuenta eventos y dispara el snapshot periódico (se llama con el candado tomado)"""
+        self._events_since_snapshot += count
+        if self.snapshot_every is not None and self._events_since_snapshot >= self.snapshot_every:
+            self.snapshot(wait=False)
+
+    def snapshot(self, wait: bool = True) -> Optional[int]:
+        """Toma un snapshot compacto; devuelve su generación (None si ya hay uno en curso)"""
+        with self._lock:
+            if self._snapshot_thread is not None and self._snapshot_thread.is_alive():
+                return None
+            # La copia y el cambio de segmento ocurren sin eventos intermedios
+            catalog = self.catalog.copy()
+            self._generation += 1
+            generation = self._generation
+            self._journal.rotate(self._path("journal", generation))
+            self._events_since_snapshot = 0
+            self._snapshot_thread = threading.Thread(
+                target=self._write_snapshot, args=(catalog, generation), name="journal-snapshot", daemon=True
+            )
+            self._snapshot_thread.start()
+            thread = self._snapshot_thread
+        if wait:
+            thread.join()
+        return generation
+
+    def _write_snapshot(self, catalog: ColumnarBookCatalog, generation: int):
+        """Escribe el snapshot y borra los segmentos y snapshots que reemplaza"""
+        write_snapshot(self._path("snapshot", generation), catalog)
+        for kind in ("journal", "snapshot"):
+            for older in self._generations(kind):
+                if older < generation:
+                    os.remove(self._path(kind, older))
+
+    def close(self):
+        """Espera el snapshot en curso y sincroniza el journal"""
+        thread = self._snapshot_thread
+        if thread is not None:
+            thread.join()
+        self._journal.close()
+
+
+def replay_segment(path: str, catalog: ColumnarBookCatalog) -> int:
+    """Aplica al catálogo los eventos válidos de un segmento; devuelve cuántos aplicó"""
+    with open(path, "rb") as handle:
+        data = handle.read()
+    if not data.startswith(SEGMENT_MAGIC):
+        raise ValueError(f"Segmento de journal inválido: {path}")
+
+    view = memoryview(data)
+    offset = len(SEGMENT_MAGIC)
+    end = len(data)
+    applied = 0
+    registered: List[Book] = []
+    while offset + _EVENT_HEADER.size <= end:
+        kind, length, checksum = _EVENT_HEADER.unpack_from(data, offset)
+        start = offset + _EVENT_HEADER.size
+        payload = view[start:start + length]
+        if len(payload) < length or zlib.crc32(payload) != checksum:
+            # Escritura interrumpida: los eventos siguientes nunca se confirmaron
+            break
+        event = _decode_event(kind, payload)
+        if event is None:
+            # Un relleno de ceros (crc32 de b"" es 0) o un tipo desconocido: se trata como cola rota
+            break
+        if kind == EVENT_REGISTERED:
+            registered.append(event)
+        else:
+            if registered:
+                catalog.save_many(registered)
+                registered = []
+            if kind == EVENT_DELETED:
+                catalog.delete_many(event)
+            else:
+                catalog.update(event)
+        applied += 1
+        offset = start + length
+    if registered:
+        catalog.save_many(registered)
+    return applied
+
+
+def _decode_event(kind: int, payload: memoryview):
+    """Libro (alta o actualización) o identificadores (baja) del evento; None si no es válido"""
+    if not payload:
+        return None
+    if kind == EVENT_DELETED:
+        if len(payload) % _BOOK_ID.size:
+            return None
+        return [book_id for book_id, in _BOOK_ID.iter_unpack(payload)]
+    if kind not in (EVENT_REGISTERED, EVENT_UPDATED):
+        return None
+    try:
+        book, end = decode_book(payload, trusted=True)
+    except (struct.error, IndexError, ValueError):
+        return None
+    # El registro debe ocupar exactamente el evento
+    return book if end == len(payload) else None
+
+
+def write_snapshot(path: str, catalog: ColumnarBookCatalog):
+    """Guarda las columnas del catálogo de forma atómica (archivo temporal y rename)"""
+    if catalog.summary_codec is not None:
+        # El snapshot no guarda el diccionario: sus resúmenes no se podrían leer
+        raise ValueError("El snapshot no admite catálogos con resúmenes comprimidos")
+    temporary = path + ".tmp"
+    with open(temporary, "wb") as handle:
+        handle.write(_SNAPSHOT_HEADER.pack(
+            SNAPSHOT_MAGIC, sys.byteorder[0].encode("ascii"), len(catalog), len(catalog.COLUMNS) + 1
+        ))
+        for name in catalog.COLUMNS:
+            column = getattr(catalog, name)
+            handle.write(_COLUMN_HEADER.pack(column.typecode.encode("ascii"), len(column) * column.itemsize))
+            handle.write(memoryview(column).cast("B"))
+        handle.write(_COLUMN_HEADER.pack(b"s", len(catalog.text_buffer)))
+        handle.write(catalog.text_buffer)
+        handle.flush()
+        os.fsync(handle.fileno())
+    os.replace(temporary, path)
+    _sync_directory(os.path.dirname(path))
+
+
+def read_snapshot(path: str) -> ColumnarBookCatalog:
+    """Carga un snapshot copiando cada columna directamente a su array"""
+    catalog = ColumnarBookCatalog()
+    with open(path, "rb") as handle:
+        magic, byteorder, count, columns = _SNAPSHOT_HEADER.unpack(handle.read(_SNAPSHOT_HEADER.size))
+        if magic != SNAPSHOT_MAGIC or columns != len(catalog.COLUMNS) + 1:
+            raise ValueError(f"Snapshot inválido: {path}")
+        if byteorder != sys.byteorder[0].encode("ascii"):
+            raise ValueError(f"Snapshot escrito con otro orden de bytes: {path}")
+        for name in catalog.COLUMNS:
+            column = getattr(catalog, name)
+            typecode, size = _COLUMN_HEADER.unpack(handle.read(_COLUMN_HEADER.size))
+            if typecode.decode("ascii") != column.typecode:
+                raise ValueError(f"Snapshot inválido: columna {name}")
+            column.frombytes(handle.read(size))
+        _, size = _COLUMN_HEADER.unpack(handle.read(_COLUMN_HEADER.size))
+        catalog.text_buffer = bytearray(handle.read(size))
+    if len(catalog) != count:
+        raise ValueError(f"Snapshot truncado: {path}")
+    return catalog
+
+
+def _sync_directory(directory: str):
+    """Sincroniza la entrada de directorio de un archivo creado o renombrado (POSIX)"""
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    descriptor = os.open(directory or ".", os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(descriptor)
+    finally:
+        os.close(descriptor)
@@ -0,0 +1,408 @@
+"""
+Catálogo binario de solo lectura abierto con mmap
+
+Formato (versiones 1 y 2, little-endian):
+
+    cabecera   magia "SAXCATLG" | versión u16 | tamaño de registro u16 | largo del diccionario u32 |
+               cantidad u64 | offset de registros u64 | offset del heap u64 | tamaño del heap u64
+    diccionario  (solo versión 2) diccionario de ``SummaryCodec`` de los resúmenes
+    heap       textos UTF-8 de cada libro (título, autor y resumen contiguos); en la
+               versión 2 cada resumen está codificado con ``SummaryCodec``
+    registros  uno de tamaño fijo por libro, ordenados por book_id:
+               book_id u64 | offset en el heap u64 | largo título u16 | largo autor u16 |
+               largo resumen u16 | año u16 | copias u16 | género u8 | idioma u8 | estado u8 |
+               máscara de categorías u8 | relleno (2)
+
+Los enums se guardan con los códigos de ``domain.codes``. Abrir el archivo solo lee
+la cabecera: los registros se leen del mapa de memoria al consultarlos y cada libro
+se entrega como una vista (``MappedBook``) que decodifica sus campos al accederlos.
+"""
+
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from dataclasses import fields
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+from domain.codes import (
+    GENRES, LANGUAGES, AVAILABILITY_STATUSES,
+    GENRE_CODES, LANGUAGE_CODES, AVAILABILITY_CODES,
+    categories_to_mask, mask_to_categories
+)
+from domain.entities import Book
+from domain.repositories import BookRepository, BOOK_SORT_FIELDS
+from domain.value_objects import (
+    BookTitle, Author, PublicationYear, CopiesCount, BookSummary, trusted_value
+)
+from .summary_codec import SummaryCodec
+
+
+CATALOG_MAGIC = b"SAXCATLG"
+CATALOG_VERSION = 1
+# Versión con los resúmenes comprimidos y el diccionario tras la cabecera
+COMPRESSED_CATALOG_VERSION = 2
+
+HEADER = struct.Struct("<8sHHIQQQQ")
+RECORD = struct.Struct("<QQHHHHHBBBBxx")
+
+# Campos numéricos del registro: offset en bytes y código de tipo de array
+RECORD_FIELDS = {
+    "book_id": (0, "Q"),
+    "publication_year": (22, "H"),
+    "copies_count": (24, "H"),
+    "genre": (26, "B"),
+    "language": (27, "B"),
+    "availability_status": (28, "B"),
+    "category_mask": (29, "B"),
+}
+
+_ID = struct.Struct("<Q")
+
+
+def write_catalog(path: str, books: Iterable[Book], summary_codec: Optional[SummaryCodec] = None) -> int:
+    """Escribe los libros (en orden creciente de book_id) en un archivo nuevo; devuelve la cantidad
+
+    El archivo se escribe en un temporal y se renombra al terminar, así los lectores
+    nunca ven un catálogo a medio escribir. Con ``summary_codec`` los resúmenes se
+    guardan comprimidos junto con el diccionario (versión 2).
+    """
+    temporary = path + ".tmp"
+    dictionary = summary_codec.dictionary if summary_codec is not None else None
+    with open(temporary, "wb") as handle:
+        handle.write(bytes(HEADER.size))
+        if dictionary is not None:
+            handle.write(dictionary)
+        records, count, heap_size = pack_records(books, handle.write, summary_codec)
+        header, padding = catalog_header(count, heap_size, dictionary)
+        handle.write(bytes(padding))
+        handle.write(records)
+        handle.seek(0)
+        handle.write(header)
+        handle.flush()
+        os.fsync(handle.fileno())
+    os.replace(temporary, path)
+    return count
+
+
+def pack_records(books: Iterable[Book], write_heap: Callable[[bytes], object],
+                 summary_codec: Optional[SummaryCodec] = None) -> Tuple[bytearray, int, int]:
+    """Codifica los libros: entrega los textos a ``write_heap`` y devuelve (registros, cantidad, tamaño del heap)"""
+    records = bytearray()
+    count = 0
+    last_id = 0
+    heap_size = 0
+    for book in books:
+        if book.book_id is None or book.book_id <= last_id:
+            raise ValueError(f"Identificador de libro fuera de orden: {book.book_id}")
+        last_id = book.book_id
+        title = book.title.value.encode("utf-8")
+        author = book.author.value.encode("utf-8")
+        if summary_codec is not None:
+            summary = summary_codec.encode_summary(book.summary)
+        else:
+            summary = (book.summary.value or "").encode("utf-8")
+        records += RECORD.pack(
+            book.book_id, heap_size, len(title), len(author), len(summary),
+            book.publication_year.value, book.copies_count.value,
+            GENRE_CODES[book.genre], LANGUAGE_CODES[book.language],
+            AVAILABILITY_CODES[book.availability_status], categories_to_mask(book.categories)
+        )
+        write_heap(title)
+        write_heap(author)
+        write_heap(summary)
+        heap_size += len(title) + len(author) + len(summary)
+        count += 1
+    return records, count, heap_size
+
+
+def catalog_header(count: int, heap_size: int, dictionary: Optional[bytes] = None) -> Tuple[bytes, int]:
+    """Cabecera del catálogo y relleno entre el heap y los registros (que empiezan alineados a 8 bytes)
+
+    Con ``dictionary`` la cabecera es de la versión 2 y el heap empieza después del diccionario.
+    """
+    if dictionary is None:
+        version, dictionary_size = CATALOG_VERSION, 0
+    else:
+        version, dictionary_size = COMPRESSED_CATALOG_VERSION, len(dictionary)
+    heap_offset = HEADER.size + dictionary_size
+    padding = -(heap_offset + heap_size) % 8
+    records_offset = heap_offset + heap_size + padding
+    header = HEADER.pack(CATALOG_MAGIC, version, RECORD.size, dictionary_size, count, records_offset,
+                         heap_offset, heap_size)
+    return header, padding
+
+
+# Campos de la entidad, en el orden de la dataclass (los que compara Book.__eq__)
+_BOOK_FIELDS = tuple(field.name for field in fields(Book))
+
+
+class MappedBook(Book):
+    """Vista de solo lectura de un registro del catálogo mapeado
+
+    Es un ``Book`` (sirve para ``get_display_info``, los servicios de dominio y los
+    exportadores), pero cada campo se decodifica del mapa de memoria al leerlo.
+    ``to_book`` devuelve una entidad independiente para modificarla. La igualdad es
+    la de ``Book``, campo a campo: una vista es igual al ``Book`` con sus datos
+    (``to_book()`` o ``dataclasses.replace``) y, como ``Book``, no es hasheable.
+    """
+
+    __slots__ = ("_catalog", "_offset")
+
+    def __new__(cls, catalog: "MappedBookCatalog" = None, index: int = 0, **values):
+        if values:
+            # dataclasses.replace(vista, ...) crea la instancia con todos los campos: se
+            # devuelve un Book independiente con los cambios
+            return Book(**values)
+        return super().__new__(cls)
+
+    def __init__(self, catalog: "MappedBookCatalog", index: int):
+        # No se llama al __init__ de Book: la vista no copia ningún campo
+        self._catalog = catalog
+        self._offset = catalog.records_offset + index * RECORD.size
+
+    def _record(self) -> tuple:
+        return RECORD.unpack_from(self._catalog.buffer, self._offset)
+
+    def _text(self, field: int) -> str:
+        return str(self._bytes(field), "utf-8")
+
+    def _bytes(self, field: int) -> memoryview:
+        _, start, title_length, author_length, summary_length = RECORD.unpack_from(
+            self._catalog.buffer, self._offset
+        )[:5]
+        start += self._catalog.heap_offset
+        if field >= 1:
+            start += title_length
+        if field == 2:
+            start += author_length
+        length = (title_length, author_length, summary_length)[field]
+        return self._catalog.buffer[start:start + length]
+
+    @property
+    def book_id(self) -> int:
+        return _ID.unpack_from(self._catalog.buffer, self._offset)[0]
+
+    @property
+    def title(self) -> BookTitle:
+        return trusted_value(BookTitle, self._text(0))
+
+    @property
+    def author(self) -> Author:
+        return trusted_value(Author, self._text(1))
+
+    @property
+    def summary(self) -> BookSummary:
+        codec = self._catalog.summary_codec
+        if codec is not None:
+            return codec.summary(self._bytes(2))
+        return trusted_value(BookSummary, self._text(2))
+
+    @property
+    def publication_year(self) -> PublicationYear:
+        return trusted_value(PublicationYear, self._record()[5])
+
+    @property
+    def copies_count(self) -> CopiesCount:
+        return trusted_value(CopiesCount, self._record()[6])
+
+    @property
+    def genre(self):
+        return GENRES[self._record()[7]]
+
+    @property
+    def language(self):
+        return LANGUAGES[self._record()[8]]
+
+    @property
+    def availability_status(self):
+        return AVAILABILITY_STATUSES[self._record()[9]]
+
+    @property
+    def categories(self):
+        return mask_to_categories(self._record()[10])
+
+    def to_book(self) -> Book:
+        """Entidad ``Book`` independiente del archivo con los mismos datos"""
+        book = object.__new__(Book)
+        book.__dict__.update(
+            title=self.title, author=self.author, publication_year=self.publication_year,
+            genre=self.genre, categories=self.categories, language=self.language,
+            availability_status=self.availability_status, copies_count=self.copies_count,
+            summary=self.summary, book_id=self.book_id
+        )
+        return book
+
+    def __eq__(self, other):
+        if not isinstance(other, Book):
+            return NotImplemented
+        # El __eq__ de Book exige la misma clase: con un Book se llega aquí por el operando reflejado
+        return all(getattr(self, name) == getattr(other, name) for name in _BOOK_FIELDS)
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"MappedBook(book_id={self.book_id}, title={self.title.value!r})"
+
+
+class MappedBookCatalog(BookRepository):
+    """Repositorio de solo lectura sobre un archivo escrito con ``write_catalog``
+
+    Abrir el catálogo es O(1) sin importar su tamaño: el sistema operativo carga
+    las páginas del archivo a medida que se leen y varios procesos que abren el
+    mismo archivo comparten esas páginas. ``buffer`` expone el mapa de memoria
+    completo para quien necesite leer los registros directamente.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"Catálogo binario vacío: {path}")
+        try:
+            self._attach(self._map, path)
+        except ValueError:
+            self.close()
+            raise
+
+    def _attach(self, data, source: str):
+        """Valida la cabecera de ``data`` (cualquier objeto con protocolo de buffer) y prepara las vistas"""
+        if len(data) < HEADER.size:
+            raise ValueError(f"Catálogo binario inválido: {source}")
+        (magic, version, record_size, dictionary_size, self._count, self.records_offset,
+         self.heap_offset, heap_size) = HEADER.unpack_from(data, 0)
+        if magic != CATALOG_MAGIC or record_size != RECORD.size:
+            raise ValueError(f"Catálogo binario inválido: {source}")
+        if version not in (CATALOG_VERSION, COMPRESSED_CATALOG_VERSION):
+            raise ValueError(f"Versión de catálogo binario no soportada: {version}")
+        if self.records_offset + self._count * RECORD.size > len(data) or \
+                self.heap_offset + heap_size > self.records_offset or \
+                HEADER.size + dictionary_size > self.heap_offset:
+            raise ValueError(f"Catálogo binario truncado: {source}")
+        self.summary_codec = None
+        if version == COMPRESSED_CATALOG_VERSION:
+            self.summary_codec = SummaryCodec(bytes(data[HEADER.size:HEADER.size + dictionary_size]))
+        self.buffer = memoryview(data)
+        self._ids = self.column("book_id")
+        self._sort_orders = {}
+
+    def __enter__(self) -> "MappedBookCatalog":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def close(self):
+        """Libera el mapa de memoria (las vistas ya entregadas dejan de ser válidas)
+
+        Si alguien conserva una columna de ``column``, el mapa se cierra cuando esa
+        vista se libera.
+        """
+        self._release_views()
+        if getattr(self, "_map", None) is not None:
+            try:
+                self._map.close()
+            except BufferError:
+                pass
+        self._file.close()
+
+    def _release_views(self):
+        for name in ("_ids", "buffer"):
+            view = getattr(self, name, None)
+            if view is not None:
+                view.release()
+                setattr(self, name, None)
+
+    def save(self, book: Book) -> Book:
+        raise ValueError("El catálogo binario es de solo lectura")
+
+    def save_many(self, books: Iterable[Book]) -> List[Book]:
+        raise ValueError("El catálogo binario es de solo lectura")
+
+    def update(self, book: Book) -> Book:
+        raise ValueError("El catálogo binario es de solo lectura")
+
+    def delete_many(self, book_ids: Iterable[int]) -> int:
+        raise ValueError("El catálogo binario es de solo lectura")
+
+    def get(self, book_id: int) -> Optional[Book]:
+        """Vista del libro por su identificador (búsqueda binaria sobre los registros)"""
+        index = bisect_left(self._ids, book_id)
+        if index < self._count and self._ids[index] == book_id:
+            return MappedBook(self, index)
+        return None
+
+    def book_at(self, index: int) -> MappedBook:
+        """Vista del registro en la posición indicada"""
+        if not 0 <= index < self._count:
+            raise IndexError(index)
+        return MappedBook(self, index)
+
+    def count(self) -> int:
+        """Cantidad de libros del archivo"""
+        return self._count
+
+    def iter_all(self) -> Iterator[Book]:
+        """Recorre las vistas en orden de identificador"""
+        for index in range(self._count):
+            yield MappedBook(self, index)
+
+    def column(self, name: str):
+        """Secuencia con un campo de ``RECORD_FIELDS`` de todos los registros, en orden
+
+        En máquinas little-endian es una vista con paso sobre el mapa de memoria (sin
+        copiar nada); en las demás, un array decodificado registro por registro.
+        """
+        offset, typecode = RECORD_FIELDS[name]
+        size = struct.calcsize(typecode)
+        records = self.buffer[self.records_offset:self.records_offset + self._count * RECORD.size]
+        if sys.byteorder == "little":
+            return records.cast(typecode)[offset // size::RECORD.size // size]
+        field = struct.Struct("<" + typecode)
+        return array(typecode, (field.unpack_from(records, start)[0]
+                                for start in range(offset, len(records), RECORD.size)))
+
+    def iter_by_year(self, publication_year: int) -> Iterator[Book]:
+        """Recorre los libros de un año leyendo solo la columna de años"""
+        for index, year in enumerate(self.column("publication_year").tolist()):
+            if year == publication_year:
+                yield MappedBook(self, index)
+
+    def find_page(self, offset: int, limit: int, order_by: str = "book_id",
+                  descending: bool = False) -> List[Book]:
+        """Ventana ordenada; los órdenes distintos de book_id se calculan una vez y se cachean"""
+        if order_by not in BOOK_SORT_FIELDS:
+            raise ValueError(f"Campo de orden no válido: {order_by}")
+        total = self._count
+        start = max(offset, 0)
+        end = min(start + limit, total)
+        if order_by == "book_id":
+            order = range(total)
+        else:
+            order = self._sort_orders.get(order_by)
+            if order is None:
+                order = array("I", sorted(range(total), key=self._sort_key(order_by)))
+                self._sort_orders[order_by] = order
+        if descending:
+            indexes = [order[total - 1 - position] for position in range(start, end)]
+        else:
+            indexes = order[start:end]
+        return [MappedBook(self, index) for index in indexes]
+
+    def _sort_key(self, order_by: str):
+        """Función que obtiene el valor del campo para una posición"""
+        if order_by in ("title", "author"):
+            field = 0 if order_by == "title" else 1
+            return lambda index: MappedBook(self, index)._text(field)
+        column = self.column(order_by).tolist()
+        values = {"genre": GENRES, "language": LANGUAGES, "availability_status": AVAILABILITY_STATUSES}.get(order_by)
+        if values is None:
+            return column.__getitem__
+        return lambda index: values[column[index]].value
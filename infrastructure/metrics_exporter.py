@@ -0,0 +1,58 @@
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Optional, Union
+from application.metrics import RegistrationMetrics
+
+
+def write_prometheus_file(metrics: RegistrationMetrics, path: Union[str, Path]):
+    """Escribe las métricas en formato Prometheus (p. ej. para el textfile collector)"""
+    _write_atomic(path, metrics.to_prometheus())
+
+
+def write_json_snapshot(metrics: RegistrationMetrics, path: Union[str, Path]):
+    """Escribe una instantánea JSON de las métricas"""
+    _write_atomic(path, json.dumps(metrics.snapshot(), indent=2, ensure_ascii=False))
+
+
+def _write_atomic(path: Union[str, Path], content: str):
+    """Reemplaza el archivo de forma atómica para que los lectores nunca vean datos a medias"""
+    temporary = f"{path}.tmp"
+    with open(temporary, "w", encoding="utf-8") as handle:
+        handle.write(content)
+    os.replace(temporary, path)
+
+
+class MetricsSnapshotWriter:
+    """Hilo que exporta periódicamente las métricas a un archivo JSON o Prometheus"""
+
+    def __init__(self, metrics: RegistrationMetrics, path: Union[str, Path],
+                 interval_seconds: float = 10.0, prometheus: bool = False):
+        self.metrics = metrics
+        self.path = path
+        self.interval_seconds = interval_seconds
+        self._write = write_prometheus_file if prometheus else write_json_snapshot
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Comienza la exportación periódica"""
+        if self._thread is not None:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="metrics-snapshot", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Detiene el hilo y escribe una última instantánea"""
+        if self._thread is None:
+            return
+        self._stop_event.set()
+        self._thread.join()
+        self._thread = None
+        self._write(self.metrics, self.path)
+
+    def _run(self):
+        while not self._stop_event.wait(self.interval_seconds):
+            self._write(self.metrics, self.path)
@@ -0,0 +1,163 @@
+import csv
+import io
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterator, List, Optional, Sequence, Tuple, Union
+from application.deduplication import DuplicateIndex
+from application.use_cases import BookRegistrationUseCase
+from domain.dto import BookRegistrationResponse, BulkRegistrationStats, MalformedRowRequest
+from domain.repositories import BookRepository
+from domain.value_objects import ValueObjectInterner
+from infrastructure.book_codec import decode_books, encode_book
+from infrastructure.catalog_readers import jsonl_line_to_request, row_to_request
+
+
+DEFAULT_CHUNK_BYTES = 4 * 1024 * 1024
+
+# Resultado de un fragmento: bloque de libros codificados; por fila, None (válida) o el error;
+# (fila, línea dentro del fragmento) de las líneas ilegibles; cantidad de líneas del fragmento
+ChunkResult = Tuple[bytes, List[Optional[str]], List[Tuple[int, int]], int]
+
+_worker_use_case: Optional[BookRegistrationUseCase] = None
+
+
+def split_byte_ranges(path: Union[str, Path], chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+                      skip_header: bool = False) -> List[Tuple[int, int]]:
+    """Divide el archivo en rangos de bytes que terminan en un salto de línea
+
+    Los registros no pueden contener saltos de línea internos (en CSV, sin campos
+    multilínea entre comillas).
+    """
+    size = os.path.getsize(path)
+    ranges = []
+    with open(path, "rb") as handle:
+        start = len(handle.readline()) if skip_header else 0
+        while start < size:
+            handle.seek(min(start + chunk_bytes, size))
+            handle.readline()
+            end = min(handle.tell(), size)
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+
+def _init_worker():
+    """Inicializa el caso de uso (sin repositorio) de cada proceso"""
+    global _worker_use_case
+    _worker_use_case = BookRegistrationUseCase(interner=ValueObjectInterner())
+
+
+def _process_chunk(path: str, start: int, end: int, file_format: str,
+                   header: Sequence[str]) -> ChunkResult:
+    """Valida y construye los libros de un rango de bytes (se ejecuta en un proceso worker)"""
+    with open(path, "rb") as handle:
+        handle.seek(start)
+        text = handle.read(end - start).decode("utf-8")
+
+    if file_format == "csv":
+        requests = (row_to_request(dict(zip(header, values)))
+                    for values in csv.reader(io.StringIO(text, newline="")) if values)
+    else:
+        # Se corta solo en "\n", como al leer el archivo línea por línea (splitlines también
+        # corta en separadores Unicode que un texto JSON puede contener)
+        requests = (jsonl_line_to_request(line, number)
+                    for number, line in enumerate(text.split("\n"), start=1) if line.strip())
+
+    encoded = []
+    errors: List[Optional[str]] = []
+    malformed: List[Tuple[int, int]] = []
+    for request in requests:
+        if isinstance(request, MalformedRowRequest):
+            # El número de línea en el archivo solo se conoce al unir los fragmentos en orden
+            malformed.append((len(errors), request.line_number))
+            errors.append(request.reason)
+            continue
+        try:
+            book = _worker_use_case.build_book(request)
+        except Exception as e:
+            errors.append(str(e))
+            continue
+        encoded.append(encode_book(book))
+        errors.append(None)
+    line_count = text.count("\n") + (0 if text.endswith("\n") else 1)
+    return b"".join(encoded), errors, malformed, line_count
+
+
+class ParallelCatalogImporter:
+    """Importa un catálogo validando y construyendo libros en varios procesos
+
+    El archivo se divide en rangos de bytes; cada worker devuelve sus libros ya
+    validados en formato binario compacto y el proceso principal los guarda en el
+    orden del archivo, un fragmento por transacción.
+    """
+
+    def __init__(self, repository: Optional[BookRepository] = None, workers: Optional[int] = None,
+                 chunk_bytes: int = DEFAULT_CHUNK_BYTES, duplicates: Optional[DuplicateIndex] = None):
+        self.repository = repository
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_bytes = chunk_bytes
+        # Guardado, duplicados y respuestas se resuelven en el proceso principal
+        self._use_case = BookRegistrationUseCase(repository, duplicates=duplicates)
+
+    def import_file(self, path: Union[str, Path], stats: Optional[BulkRegistrationStats] = None,
+                    include_book_info: bool = False) -> Iterator[BookRegistrationResponse]:
+        """Devuelve una respuesta por fila, en el mismo orden que el archivo"""
+        path = str(path)
+        file_format = self._detect_format(path)
+        header: List[str] = []
+        if file_format == "csv":
+            with open(path, newline="", encoding="utf-8") as handle:
+                header = next(csv.reader(handle), [])
+        ranges = split_byte_ranges(path, self.chunk_bytes, skip_header=file_format == "csv")
+
+        started = time.perf_counter()
+        # Líneas del archivo antes del fragmento en curso (la cabecera del CSV incluida)
+        lines_before = 1 if file_format == "csv" else 0
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker) as executor:
+            # Ventana acotada de fragmentos en vuelo para no acumular resultados en memoria
+            pending = deque()
+            next_range = iter(ranges)
+            for _ in range(self.workers * 2):
+                self._submit(executor, pending, next_range, path, file_format, header)
+
+            while pending:
+                payload, errors, malformed, line_count = pending.popleft().result()
+                self._submit(executor, pending, next_range, path, file_format, header)
+                for row, line in malformed:
+                    errors[row] = MalformedRowRequest.at_line(lines_before + line, errors[row]).error
+                lines_before += line_count
+                responses = self._merge_chunk(payload, errors, include_book_info)
+                if stats is not None:
+                    stats.record_batch(responses, time.perf_counter() - started)
+                yield from responses
+
+    @staticmethod
+    def _submit(executor, pending: deque, next_range, path: str, file_format: str, header: List[str]):
+        """Envía el siguiente rango pendiente, si queda alguno"""
+        byte_range = next(next_range, None)
+        if byte_range is not None:
+            pending.append(executor.submit(_process_chunk, path, *byte_range, file_format, header))
+
+    def _merge_chunk(self, payload: bytes, errors: List[Optional[str]],
+                     include_book_info: bool) -> List[BookRegistrationResponse]:
+        """Guarda los libros del fragmento y arma las respuestas en el orden original"""
+        books = decode_books(payload, trusted=True)
+        saved = iter(self._use_case.register_books(books, include_book_info))
+        return [
+            next(saved) if error is None
+            else BookRegistrationResponse(success=False, message=f"Error al registrar el libro: {error}")
+            for error in errors
+        ]
+
+    @staticmethod
+    def _detect_format(path: str) -> str:
+        """Formato del archivo según su extensión"""
+        suffix = Path(path).suffix.lower()
+        if suffix == ".csv":
+            return "csv"
+        if suffix in (".jsonl", ".ndjson"):
+            return "jsonl"
+        raise ValueError(f"Formato de archivo no soportado: {suffix or path}")
@@ -0,0 +1,212 @@
+"""
+Snapshot de solo lectura del catálogo en memoria compartida
+
+Un proceso publicador copia el catálogo en un segmento de
+``multiprocessing.shared_memory`` con el mismo formato que ``write_catalog``
+(registros de tamaño fijo y un heap de textos) y los procesos de trabajo lo
+abren sin copiarlo: todos leen las mismas páginas físicas.
+
+Cada publicación crea un segmento nuevo, ``{nombre}-{generación}``. Un segmento de
+control pequeño, ``{nombre}``, guarda el número de la generación vigente:
+
+    magia "SXSHRCTL" | generación u64 | confirmación u64
+
+El publicador escribe la generación y después la confirmación; el lector lee la
+confirmación, la generación y vuelve a leer la confirmación, y reintenta si no
+coinciden. Así nunca abre una generación a medio anunciar. Los lectores pasan a
+la generación nueva cuando lo piden (``refresh``) y la anterior sigue siendo
+válida para quien la tenga abierta: el segmento viejo solo deja de tener nombre.
+"""
+
+import struct
+import sys
+import time
+from multiprocessing import resource_tracker, shared_memory
+from typing import Iterable, List, Optional, Set
+from domain.entities import Book
+from .mapped_catalog import HEADER, MappedBookCatalog, catalog_header, pack_records
+from .summary_codec import SummaryCodec
+
+
+CONTROL_MAGIC = b"SXSHRCTL"
+CONTROL = struct.Struct("<8sQQ")
+_GENERATION = struct.Struct("<Q")
+
+DEFAULT_SHARED_NAME = "saberx-catalogo"
+
+# Segmentos creados por publicadores de este proceso (su registro en el tracker es del publicador)
+_PUBLISHED: Set[str] = set()
+
+def _segment_name(name: str, generation: int) -> str:
+    return f"{name}-{generation}"
+
+
+def _attach_segment(name: str) -> shared_memory.SharedMemory:
+    """Abre un segmento existente sin dejarlo registrado en el resource tracker
+
+    Solo el publicador es dueño de los segmentos: si quedaran registrados por un
+    lector, su tracker los eliminaría al terminar el lector.
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name, track=False)
+    # Antes de 3.13 abrir un segmento también lo registra: se quita el registro enseguida,
+    # salvo que lo haya creado un publicador de este proceso (el tracker guarda un único
+    # registro por nombre y quitarlo dejaría al publicador sin el suyo)
+    segment = shared_memory.SharedMemory(name)
+    if name not in _PUBLISHED:
+        resource_tracker.unregister(segment._name, "shared_memory")
+    return segment
+
+
+def _read_generation(control) -> int:
+    """Generación vigente del segmento de control (reintenta mientras se está publicando)"""
+    while True:
+        confirmed = _GENERATION.unpack_from(control, 16)[0]
+        generation = _GENERATION.unpack_from(control, 8)[0]
+        if generation == confirmed and _GENERATION.unpack_from(control, 16)[0] == confirmed:
+            return generation
+        time.sleep(0)
+
+
+class SharedCatalogPublisher:
+    """Publica snapshots del catálogo en memoria compartida con una generación creciente
+
+    Es dueño de los segmentos: ``close`` (o el fin del proceso) los elimina. Cada
+    ``publish`` conserva la generación anterior con nombre durante ``keep``
+    publicaciones más, para que un lector que acaba de leer la generación alcance
+    a abrir su segmento.
+    """
+
+    def __init__(self, name: str = DEFAULT_SHARED_NAME, keep: int = 1):
+        if keep < 0:
+            raise ValueError("La cantidad de generaciones a conservar no puede ser negativa")
+        self.name = name
+        self.keep = keep
+        self._control = shared_memory.SharedMemory(name, create=True, size=CONTROL.size)
+        _PUBLISHED.add(name)
+        CONTROL.pack_into(self._control.buf, 0, CONTROL_MAGIC, 0, 0)
+        self._segments: List[shared_memory.SharedMemory] = []
+        self.generation = 0
+
+    def __enter__(self) -> "SharedCatalogPublisher":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def publish(self, books: Iterable[Book], summary_codec: Optional[SummaryCodec] = None) -> int:
+        """Copia los libros (en orden de identificador) a un segmento nuevo y lo anuncia; devuelve su generación
+
+        Con ``summary_codec`` los resúmenes se publican comprimidos (los lectores reciben el diccionario).
+        """
+        dictionary = summary_codec.dictionary if summary_codec is not None else None
+        heap = bytearray()
+        records, count, heap_size = pack_records(books, heap.extend, summary_codec)
+        header, padding = catalog_header(count, heap_size, dictionary)
+        heap_offset = HEADER.size + (len(dictionary) if dictionary is not None else 0)
+        records_offset = heap_offset + heap_size + padding
+        size = records_offset + len(records)
+
+        generation = self.generation + 1
+        segment = shared_memory.SharedMemory(_segment_name(self.name, generation), create=True, size=size)
+        _PUBLISHED.add(segment.name)
+        try:
+            buffer = segment.buf
+            buffer[:HEADER.size] = header
+            if dictionary is not None:
+                buffer[HEADER.size:heap_offset] = dictionary
+            buffer[heap_offset:heap_offset + heap_size] = heap
+            buffer[records_offset:records_offset + len(records)] = records
+            del heap, records, buffer
+        except BaseException:
+            self._retire(segment)
+            raise
+
+        # La generación se confirma solo cuando el segmento está completo
+        _GENERATION.pack_into(self._control.buf, 8, generation)
+        _GENERATION.pack_into(self._control.buf, 16, generation)
+        self.generation = generation
+        self._segments.append(segment)
+        while len(self._segments) > self.keep + 1:
+            self._retire(self._segments.pop(0))
+        return generation
+
+    def close(self):
+        """Elimina el segmento de control y todas las generaciones (los lectores abiertos no se ven afectados)"""
+        for segment in self._segments:
+            self._retire(segment)
+        self._segments = []
+        if self._control is not None:
+            self._retire(self._control)
+            self._control = None
+
+    @staticmethod
+    def _retire(segment: shared_memory.SharedMemory):
+        segment.close()
+        segment.unlink()
+        _PUBLISHED.discard(segment.name)
+
+
+class SharedBookCatalog(MappedBookCatalog):
+    """Repositorio de solo lectura sobre la generación vigente de un snapshot compartido
+
+    Abrirlo no copia el catálogo: los libros son vistas (``MappedBook``) sobre el
+    segmento compartido. La instancia queda fija en su generación; ``refresh``
+    devuelve un catálogo abierto en la generación más reciente (o la misma
+    instancia si no hay una nueva). La anterior sigue válida hasta cerrarla.
+    """
+
+    def __init__(self, name: str = DEFAULT_SHARED_NAME, attempts: int = 5):
+        self.name = name
+        self.path = name
+        self._control = _attach_segment(name)
+        try:
+            if bytes(self._control.buf[:8]) != CONTROL_MAGIC:
+                raise ValueError(f"Segmento de control inválido: {name}")
+            self._segment = self._attach_latest(attempts)
+            self._attach(self._segment.buf, _segment_name(name, self.generation))
+        except ValueError:
+            self.close()
+            raise
+
+    def _attach_latest(self, attempts: int) -> shared_memory.SharedMemory:
+        """Abre el segmento de la generación vigente; reintenta si el publicador ya lo retiró"""
+        for _ in range(attempts):
+            generation = _read_generation(self._control.buf)
+            if generation == 0:
+                raise ValueError(f"No hay ningún catálogo publicado en {self.name}")
+            try:
+                segment = _attach_segment(_segment_name(self.name, generation))
+            except FileNotFoundError:
+                continue
+            self.generation = generation
+            return segment
+        raise ValueError(f"No se pudo abrir la generación vigente de {self.name}")
+
+    @property
+    def published_generation(self) -> int:
+        """Generación anunciada por el publicador en este momento"""
+        return _read_generation(self._control.buf)
+
+    def refresh(self) -> "SharedBookCatalog":
+        """Catálogo en la generación más reciente (``self`` si ya lo está)"""
+        if self.published_generation == self.generation:
+            return self
+        return SharedBookCatalog(self.name)
+
+    def __del__(self):
+        # Un catálogo descartado sin cerrar (p. ej. el resultado de refresh) libera
+        # sus vistas antes de que SharedMemory intente cerrar el mapa
+        self.close()
+
+    def close(self):
+        """Libera los segmentos (las vistas ya entregadas dejan de ser válidas)"""
+        self._release_views()
+        for name in ("_segment", "_control"):
+            segment: Optional[shared_memory.SharedMemory] = getattr(self, name, None)
+            if segment is not None:
+                try:
+                    segment.close()
+                except BufferError:
+                    pass
+                setattr(self, name, None)
@@ -0,0 +1,307 @@
+import sqlite3
+import threading
+from typing import Iterable, Iterator, List, Optional, Tuple
+from application.catalog_query import QueryPage, validate_query
+from domain.dto import BookQuery
+from domain.entities import Book
+from domain.repositories import BookRepository, LoanLedger, BOOK_SORT_FIELDS
+from domain.value_objects import (
+    BookTitle, Author, PublicationYear, Genre, Category,
+    Language, AvailabilityStatus, CopiesCount, BookSummary
+)
+
+
+# Separador de categorías dentro de la columna de texto
+CATEGORY_SEPARATOR = ";"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS books (
+    id INTEGER PRIMARY KEY,
+    title TEXT NOT NULL,
+    author TEXT NOT NULL,
+    publication_year INTEGER NOT NULL,
+    genre TEXT NOT NULL,
+    categories TEXT NOT NULL,
+    language TEXT NOT NULL,
+    availability_status TEXT NOT NULL,
+    copies_count INTEGER NOT NULL,
+    summary TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_books_title ON books (title);
+CREATE INDEX IF NOT EXISTS idx_books_author ON books (author);
+CREATE INDEX IF NOT EXISTS idx_books_genre ON books (genre);
+CREATE INDEX IF NOT EXISTS idx_books_language ON books (language);
+CREATE INDEX IF NOT EXISTS idx_books_year ON books (publication_year);
+"""
+
+_COLUMNS = (
+    "id, title, author, publication_year, genre, categories, "
+    "language, availability_status, copies_count, summary"
+)
+
+_INSERT_SQL = f"INSERT INTO books ({_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+_UPDATE_SQL = (
+    "UPDATE books SET title = ?, author = ?, publication_year = ?, genre = ?, categories = ?, "
+    "language = ?, availability_status = ?, copies_count = ?, summary = ? WHERE id = ?"
+)
+_SELECT_BY_ID_SQL = f"SELECT {_COLUMNS} FROM books WHERE id = ?"
+_SELECT_BY_YEAR_SQL = f"SELECT {_COLUMNS} FROM books WHERE publication_year = ? ORDER BY id"
+_SELECT_PAGE_SQL = f"SELECT {_COLUMNS} FROM books WHERE id > ? ORDER BY id LIMIT ?"
+
+# Columna SQL de cada campo ordenable (lista cerrada: nunca se interpola texto del usuario)
+_SORT_COLUMNS = dict(zip(BOOK_SORT_FIELDS, (
+    "id", "title", "author", "publication_year", "genre",
+    "language", "availability_status", "copies_count"
+)))
+
+
+class SQLiteBookRepository(BookRepository):
+    """Repositorio de libros persistido en SQLite (modo WAL, escrituras en lote)"""
+
+    def __init__(self, path: str = ":memory:", page_size: int = 1000):
+        self.path = path
+        self.page_size = page_size
+        self._lock = threading.RLock()
+        # La conexión se comparte entre hilos (GUI, workers); el lock serializa su uso
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._configure()
+
+    def _configure(self):
+        """Aplica los pragmas de rendimiento y crea el esquema"""
+        with self._lock:
+            # lower() de SQLite solo conoce ASCII; las búsquedas por texto usan el de Python
+            self._connection.create_function("py_lower", 1, str.lower, deterministic=True)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._connection.execute("PRAGMA temp_store=MEMORY")
+            self._connection.executescript(_SCHEMA)
+
+    def save(self, book: Book) -> Book:
+        """Guarda un libro y le asigna un identificador"""
+        return self.save_many([book])[0]
+
+    def save_many(self, books: Iterable[Book]) -> List[Book]:
+        """Inserta todos los libros dentro de una única transacción"""
+        books = list(books)
+        if not books:
+            return books
+        with self._lock:
+            cursor = self._connection.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                next_id = cursor.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM books").fetchone()[0]
+                rows = []
+                for offset, book in enumerate(books):
+                    book_id = book.book_id if book.book_id is not None else next_id + offset
+                    rows.append(self._to_row(book, book_id))
+                cursor.executemany(_INSERT_SQL, rows)
+                cursor.execute("COMMIT")
+            except Exception:
+                cursor.execute("ROLLBACK")
+                raise
+        for book, row in zip(books, rows):
+            book.book_id = row[0]
+        return books
+
+    def update(self, book: Book) -> Book:
+        """Reemplaza todas las columnas del libro con su identificador"""
+        if book.book_id is None:
+            raise ValueError("El libro a actualizar no tiene identificador")
+        row = self._to_row(book, book.book_id)
+        with self._lock:
+            cursor = self._connection.execute(_UPDATE_SQL, row[1:] + row[:1])
+        if cursor.rowcount == 0:
+            raise ValueError(f"Libro no encontrado: {book.book_id}")
+        return book
+
+    def delete_many(self, book_ids: Iterable[int]) -> int:
+        """Elimina los libros dentro de una única transacción"""
+        rows = [(book_id,) for book_id in book_ids]
+        if not rows:
+            return 0
+        with self._lock:
+            cursor = self._connection.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                before = self._connection.total_changes
+                cursor.executemany("DELETE FROM books WHERE id = ?", rows)
+                deleted = self._connection.total_changes - before
+                cursor.execute("COMMIT")
+            except Exception:
+                cursor.execute("ROLLBACK")
+                raise
+        return deleted
+
+    def get(self, book_id: int) -> Optional[Book]:
+        """Obtiene un libro por su identificador"""
+        with self._lock:
+            row = self._connection.execute(_SELECT_BY_ID_SQL, (book_id,)).fetchone()
+        return self._to_book(row) if row else None
+
+    def count(self) -> int:
+        """Cantidad de libros almacenados"""
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM books").fetchone()[0]
+
+    def iter_all(self) -> Iterator[Book]:
+        """Recorre los libros por páginas usando el identificador como cursor"""
+        last_id = 0
+        while True:
+            with self._lock:
+                rows = self._connection.execute(_SELECT_PAGE_SQL, (last_id, self.page_size)).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                yield self._to_book(row)
+            last_id = rows[-1][0]
+
+    def iter_by_year(self, publication_year: int) -> Iterator[Book]:
+        """Recorre los libros de un año usando el índice por año"""
+        with self._lock:
+            rows = self._connection.execute(_SELECT_BY_YEAR_SQL, (publication_year,)).fetchall()
+        return (self._to_book(row) for row in rows)
+
+    def find_page(self, offset: int, limit: int, order_by: str = "book_id",
+                  descending: bool = False) -> List[Book]:
+        """Obtiene una ventana ordenada; el orden se resuelve en SQLite usando los índices"""
+        if order_by not in _SORT_COLUMNS:
+            raise ValueError(f"Campo de orden no válido: {order_by}")
+        direction = "DESC" if descending else "ASC"
+        sql = (
+            f"SELECT {_COLUMNS} FROM books "
+            f"ORDER BY {_SORT_COLUMNS[order_by]} {direction}, id {direction} LIMIT ? OFFSET ?"
+        )
+        with self._lock:
+            rows = self._connection.execute(sql, (limit, max(offset, 0))).fetchall()
+        return [self._to_book(row) for row in rows]
+
+    def execute_query(self, query: BookQuery) -> QueryPage:
+        """Resuelve una consulta por criterios directamente en SQLite
+
+        Para procesos de una sola consulta (CLI), donde construir los índices en
+        memoria de ``CatalogQueryEngine`` costaría un recorrido completo. Acepta los
+        mismos criterios, cursores y mensajes de error que el motor en memoria.
+        """
+        validate_query(query)
+        conditions, parameters = [], []
+        for name in ("genre", "language", "availability_status"):
+            value = getattr(query, name)
+            if value is not None:
+                conditions.append(f"{name} = ?")
+                parameters.append(value)
+        for value in sorted(set(query.categories)):
+            conditions.append(f"'{CATEGORY_SEPARATOR}' || categories || '{CATEGORY_SEPARATOR}' LIKE ?")
+            parameters.append(f"%{CATEGORY_SEPARATOR}{value}{CATEGORY_SEPARATOR}%")
+        if query.year_from is not None:
+            conditions.append("publication_year >= ?")
+            parameters.append(query.year_from)
+        if query.year_to is not None:
+            conditions.append("publication_year <= ?")
+            parameters.append(query.year_to)
+        if query.min_copies is not None:
+            conditions.append("copies_count >= ?")
+            parameters.append(query.min_copies)
+        if query.title_contains:
+            conditions.append("instr(py_lower(title), ?) > 0")
+            parameters.append(query.title_contains.lower())
+        if query.author_contains:
+            conditions.append("instr(py_lower(author), ?) > 0")
+            parameters.append(query.author_contains.lower())
+
+        by_year = query.order_by == "publication_year"
+        direction, comparison = ("DESC", "<") if query.descending else ("ASC", ">")
+        key = "(publication_year, id)" if by_year else "id"
+        if query.cursor is not None:
+            parts = [int(part) for part in query.cursor.split(":")]
+            conditions.append(f"{key} {comparison} ({', '.join('?' * len(parts))})")
+            parameters.extend(parts)
+        order = f"publication_year {direction}, id {direction}" if by_year else f"id {direction}"
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        # Una fila de más indica si hay página siguiente
+        sql = f"SELECT {_COLUMNS} FROM books{where} ORDER BY {order} LIMIT ?"
+        with self._lock:
+            rows = self._connection.execute(sql, (*parameters, query.limit + 1)).fetchall()
+
+        examined = len(rows)
+        next_cursor = None
+        if examined > query.limit:
+            rows = rows[:query.limit]
+            last = rows[-1]
+            next_cursor = f"{last[3]}:{last[0]}" if by_year else str(last[0])
+        plan = f"SQLite ({len(conditions)} condiciones, orden {order})"
+        return QueryPage([self._to_book(row) for row in rows], next_cursor, plan, examined)
+
+    def close(self):
+        """Cierra la conexión con la base de datos"""
+        with self._lock:
+            self._connection.close()
+
+    @staticmethod
+    def _to_row(book: Book, book_id: int) -> Tuple:
+        """Convierte la entidad en una fila de la tabla"""
+        categories = CATEGORY_SEPARATOR.join(
+            sorted(category.value for category in book.categories)
+        )
+        return (
+            book_id,
+            book.title.value,
+            book.author.value,
+            book.publication_year.value,
+            book.genre.value,
+            categories,
+            book.language.value,
+            book.availability_status.value,
+            book.copies_count.value,
+            book.summary.value or ""
+        )
+
+    @staticmethod
+    def _to_book(row: Tuple) -> Book:
+        """Reconstruye la entidad a partir de una fila de la tabla"""
+        (book_id, title, author, year, genre, categories,
+         language, status, copies, summary) = row
+        return Book(
+            title=BookTitle(title),
+            author=Author(author),
+            publication_year=PublicationYear(year),
+            genre=Genre(genre),
+            categories={Category(value) for value in categories.split(CATEGORY_SEPARATOR)},
+            language=Language(language),
+            availability_status=AvailabilityStatus(status),
+            copies_count=CopiesCount(copies),
+            summary=BookSummary(summary),
+            book_id=book_id
+        )
+
+
+class SQLiteLoanLedger(LoanLedger):
+    """Copias prestadas por libro en la tabla ``loans`` (puede compartir archivo con ``books``)"""
+
+    def __init__(self, path: str = ":memory:"):
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        with self._lock:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS loans (book_id INTEGER PRIMARY KEY, copies INTEGER NOT NULL)"
+            )
+
+    def on_loan(self, book_id: int) -> int:
+        with self._lock:
+            row = self._connection.execute("SELECT copies FROM loans WHERE book_id = ?", (book_id,)).fetchone()
+        return row[0] if row else 0
+
+    def record(self, book_id: int, delta: int):
+        with self._lock:
+            self._connection.execute(
+                "INSERT INTO loans (book_id, copies) VALUES (?, ?) "
+                "ON CONFLICT (book_id) DO UPDATE SET copies = copies + excluded.copies",
+                (book_id, delta)
+            )
+            self._connection.execute("DELETE FROM loans WHERE book_id = ? AND copies <= 0", (book_id,))
+
+    def close(self):
+        """Cierra la conexión con la base de datos"""
+        with self._lock:
+            self._connection.close()
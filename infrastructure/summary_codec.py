@@ -0,0 +1,167 @@
+"""
+Compresión de resúmenes con un diccionario compartido (zlib)
+
+Los resúmenes son textos cortos: comprimidos uno por uno, deflate casi no
+encuentra repeticiones. Con un diccionario entrenado sobre resúmenes del propio
+catálogo (``zdict``), cada resumen puede referirse a palabras y frases frecuentes
+que ya están en el diccionario y ocupa una fracción de su texto.
+
+Formato de cada resumen codificado:
+
+    largo en caracteres u16 | método u8 | datos
+
+El método es 0 (UTF-8 sin comprimir, cuando comprimir no ahorra nada) o 1
+(deflate crudo con el diccionario). El largo va al principio para conocerlo sin
+descomprimir.
+"""
+
+import struct
+import zlib
+from collections import Counter
+from functools import lru_cache
+from typing import Iterable, Optional
+from domain.value_objects import BookSummary
+
+
+SUMMARY_HEADER = struct.Struct("<HB")
+METHOD_STORED = 0
+METHOD_DEFLATE = 1
+
+DEFAULT_DICTIONARY_BYTES = 16 * 1024
+DEFAULT_CACHE_SIZE = 1024
+# zlib solo usa los últimos 32 KiB del diccionario
+MAX_DICTIONARY_BYTES = 32 * 1024
+
+
+class SummaryCodec:
+    """Codifica resúmenes con deflate y un diccionario compartido; decodifica con una caché LRU
+
+    ``decode`` recuerda los ``cache_size`` resúmenes decodificados más recientes
+    (por su contenido comprimido): volver a mostrar un libro no vuelve a descomprimir.
+    """
+
+    def __init__(self, dictionary: bytes = b"", level: int = 9, cache_size: int = DEFAULT_CACHE_SIZE):
+        if len(dictionary) > MAX_DICTIONARY_BYTES:
+            raise ValueError(f"El diccionario no puede superar {MAX_DICTIONARY_BYTES} bytes")
+        self.dictionary = bytes(dictionary)
+        self.level = level
+        # Los compresores se copian de uno ya preparado con el diccionario
+        self._compressor = self._new_compressor()
+        self._decode_cached = lru_cache(maxsize=cache_size)(self._decompress)
+
+    @classmethod
+    def train(cls, summaries: Iterable[str], dictionary_bytes: int = DEFAULT_DICTIONARY_BYTES,
+              sample_limit: int = 20000, **options) -> "SummaryCodec":
+        """Entrena el diccionario con las palabras y pares de palabras más frecuentes de una muestra
+
+        Cada candidato vale (apariciones - 1) × largo: lo que se ahorraría al referirlo
+        en lugar de repetirlo. Los más valiosos van al final del diccionario, donde las
+        distancias de deflate son más cortas.
+        """
+        counts = Counter()
+        for index, summary in enumerate(summaries):
+            if index >= sample_limit:
+                break
+            words = summary.split()
+            counts.update(word + " " for word in words)
+            counts.update(f"{first} {second} " for first, second in zip(words, words[1:]))
+        candidates = sorted(
+            ((count - 1) * len(text.encode("utf-8")), text) for text, count in counts.items() if count > 1
+        )
+        chosen = []
+        size = 0
+        for _, text in reversed(candidates):
+            encoded = text.encode("utf-8")
+            if size + len(encoded) > min(dictionary_bytes, MAX_DICTIONARY_BYTES):
+                continue
+            chosen.append(encoded)
+            size += len(encoded)
+        return cls(b"".join(reversed(chosen)), **options)
+
+    def _new_compressor(self):
+        if self.dictionary:
+            return zlib.compressobj(self.level, zlib.DEFLATED, -15, 8, zlib.Z_DEFAULT_STRATEGY, self.dictionary)
+        return zlib.compressobj(self.level, zlib.DEFLATED, -15, 8)
+
+    def encode(self, text: Optional[str]) -> bytes:
+        """Codifica un resumen (``None`` se codifica como texto vacío)"""
+        text = text or ""
+        raw = text.encode("utf-8")
+        compressor = self._compressor.copy()
+        compressed = compressor.compress(raw) + compressor.flush()
+        if len(compressed) < len(raw):
+            return SUMMARY_HEADER.pack(len(text), METHOD_DEFLATE) + compressed
+        return SUMMARY_HEADER.pack(len(text), METHOD_STORED) + raw
+
+    def encode_summary(self, summary: BookSummary) -> bytes:
+        """Codifica un objeto de valor; uno que ya viene comprimido con este codec se reutiliza tal cual"""
+        if isinstance(summary, CompressedSummary) and summary.codec is self:
+            return summary.data
+        return self.encode(summary.value)
+
+    def decode(self, data: bytes) -> str:
+        """Texto del resumen codificado (de la caché si se decodificó hace poco)"""
+        return self._decode_cached(bytes(data))
+
+    def _decompress(self, data: bytes) -> str:
+        _, method = SUMMARY_HEADER.unpack_from(data, 0)
+        payload = data[SUMMARY_HEADER.size:]
+        if method == METHOD_STORED:
+            return payload.decode("utf-8")
+        if method != METHOD_DEFLATE:
+            raise ValueError(f"Método de compresión de resumen desconocido: {method}")
+        if self.dictionary:
+            decompressor = zlib.decompressobj(-15, self.dictionary)
+        else:
+            decompressor = zlib.decompressobj(-15)
+        return (decompressor.decompress(payload) + decompressor.flush()).decode("utf-8")
+
+    @staticmethod
+    def length(data) -> int:
+        """Largo en caracteres del resumen codificado, sin descomprimirlo"""
+        return SUMMARY_HEADER.unpack_from(data, 0)[0]
+
+    def summary(self, data: bytes) -> "CompressedSummary":
+        """Objeto de valor que descomprime el resumen solo cuando se lee ``value``"""
+        instance = object.__new__(CompressedSummary)
+        object.__setattr__(instance, "_codec", self)
+        object.__setattr__(instance, "_data", bytes(data))
+        return instance
+
+    def cache_info(self):
+        """Aciertos y fallos de la caché de resúmenes decodificados"""
+        return self._decode_cached.cache_info()
+
+
+class CompressedSummary(BookSummary):
+    """``BookSummary`` guardado comprimido
+
+    ``value`` se descomprime al leerlo (a través de la caché del codec) y ``length``
+    sale de la cabecera, así ``estimate_book_reading_time`` no descomprime nada.
+    """
+
+    @property
+    def value(self) -> str:
+        return self._codec.decode(self._data)
+
+    @property
+    def length(self) -> int:
+        return SummaryCodec.length(self._data)
+
+    @property
+    def codec(self) -> SummaryCodec:
+        return self._codec
+
+    @property
+    def data(self) -> bytes:
+        """Resumen codificado tal como se guarda"""
+        return self._data
+
+    def __eq__(self, other):
+        # Igual a cualquier BookSummary con el mismo texto, comprimido o no
+        if isinstance(other, BookSummary):
+            return self.value == other.value
+        return NotImplemented
+
+    def __hash__(self):
+        return hash((self.value,))
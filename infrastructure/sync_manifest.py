@@ -0,0 +1,56 @@
+"""
+Archivo de estado de la sincronización del catálogo
+
+Guarda el ``SyncManifest`` de la última sincronización para que la siguiente
+solo tenga que comparar hashes. Formato:
+
+    magia "SXM\\x01" | orden de bytes | cantidad u64
+    columnas book_ids, content_hashes y key_hashes (u64 cada una, en ese orden)
+
+Se escribe en un archivo temporal que se renombra al terminar: una
+sincronización interrumpida deja el estado anterior intacto.
+"""
+
+import os
+import struct
+import sys
+from array import array
+from application.catalog_sync import SyncManifest
+
+
+MANIFEST_MAGIC = b"SXM\x01"
+
+_HEADER = struct.Struct("<4scQ")
+
+
+def write_sync_manifest(path: str, manifest: SyncManifest):
+    """Guarda el manifiesto de forma atómica"""
+    temporary = path + ".tmp"
+    with open(temporary, "wb") as handle:
+        handle.write(_HEADER.pack(MANIFEST_MAGIC, sys.byteorder[0].encode("ascii"), len(manifest)))
+        for name in SyncManifest.COLUMNS:
+            handle.write(memoryview(getattr(manifest, name)).cast("B"))
+        handle.flush()
+        os.fsync(handle.fileno())
+    os.replace(temporary, path)
+
+
+def read_sync_manifest(path: str) -> SyncManifest:
+    """Carga un manifiesto copiando cada columna directamente a su array"""
+    manifest = SyncManifest()
+    with open(path, "rb") as handle:
+        header = handle.read(_HEADER.size)
+        if len(header) < _HEADER.size:
+            raise ValueError(f"Estado de sincronización inválido: {path}")
+        magic, byteorder, count = _HEADER.unpack(header)
+        if magic != MANIFEST_MAGIC:
+            raise ValueError(f"Estado de sincronización inválido: {path}")
+        if byteorder != sys.byteorder[0].encode("ascii"):
+            raise ValueError(f"Estado de sincronización escrito con otro orden de bytes: {path}")
+        for name in SyncManifest.COLUMNS:
+            column: array = getattr(manifest, name)
+            data = handle.read(count * column.itemsize)
+            if len(data) < count * column.itemsize:
+                raise ValueError(f"Estado de sincronización truncado: {path}")
+            column.frombytes(data)
+    return manifest
@@ -1,15 +1,37 @@
-from infrastructure.gui_interface import BookRegistrationGUI
+import sys
 
 
-def main():
-    """Función principal de la aplicación"""
+def run_gui():
+    """Abre la interfaz gráfica (solo aquí se importa tkinter)"""
+    from application.deduplication import DuplicateIndex
+    from application.search_index import TrigramSearchIndex
+    from application.use_cases import BookRegistrationUseCase
+    from infrastructure.cli_input_output import DEFAULT_DATABASE_PATH
+    from infrastructure.gui_interface import BookRegistrationGUI
+    from infrastructure.sqlite_book_repository import SQLiteBookRepository
+    
     try:
+        # Crear el caso de uso con persistencia en SQLite
+        repository = SQLiteBookRepository(DEFAULT_DATABASE_PATH)
+        use_case = BookRegistrationUseCase(repository, duplicates=DuplicateIndex().rebuild(repository),
+                                           search_index=TrigramSearchIndex().rebuild(repository))
+        
         # Crear y ejecutar la interfaz gráfica
-        app = BookRegistrationGUI()
+        app = BookRegistrationGUI(use_case)
         app.run()
     except Exception as e:
         print(f"Error al iniciar la aplicación: {e}")
 
 
+def main():
+    """Función principal de la aplicación"""
+    if len(sys.argv) > 1:
+        # Con argumentos se usa la línea de comandos, sin cargar la GUI
+        from infrastructure.cli_input_output import main as cli_main
+        return cli_main(sys.argv[1:])
+    run_gui()
+    return 0
+
+
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,22 @@
+import pytest
+from application.use_cases import BookRegistrationUseCase
+from domain.dto import BookRegistrationRequest
+
+
+def make_request(title: str, author: str = "Ana Pérez", publication_year: int = 2000,
+                 genre: str = "Ficción", categories=("Novela",), language: str = "Español",
+                 copies_count: int = 3, summary: str = "") -> BookRegistrationRequest:
+    """Solicitud válida con valores por defecto para lo que la prueba no mira"""
+    return BookRegistrationRequest(
+        title=title, author=author, publication_year=publication_year, genre=genre,
+        categories=list(categories), language=language,
+        availability_status="Disponible" if copies_count > 0 else "Prestado",
+        copies_count=copies_count, summary=summary
+    )
+
+
+@pytest.fixture
+def make_book():
+    """Construye entidades Book sin repositorio"""
+    use_case = BookRegistrationUseCase()
+    return lambda title, **fields: use_case.build_book(make_request(title, **fields))
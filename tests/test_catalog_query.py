@@ -0,0 +1,115 @@
+import pytest
+from application.catalog_query import CatalogQueryEngine
+from application.use_cases import BookRegistrationUseCase
+from domain.dto import BookQuery
+from infrastructure.columnar_catalog import ColumnarBookCatalog
+from infrastructure.sqlite_book_repository import SQLiteBookRepository
+from .conftest import make_request
+
+GENRES = ("Ficción", "No Ficción")
+LANGUAGES = ("Español", "Inglés", "Francés")
+
+
+def _requests(start, count):
+    return [
+        make_request(f"Libro {number}", publication_year=1950 + number % 40, genre=GENRES[number % 2],
+                     language=LANGUAGES[number % 3], copies_count=number % 5)
+        for number in range(start, start + count)
+    ]
+
+
+def _catalog(repository, count=300):
+    engine = CatalogQueryEngine(repository)
+    use_case = BookRegistrationUseCase(repository, query_engine=engine)
+    assert all(response.success for response in use_case.execute_many(_requests(0, count), include_book_info=False))
+    return use_case, engine
+
+
+def _pages(execute, cursor=None, **criteria):
+    """Recorre las páginas desde ``cursor`` siguiendo los cursores"""
+    pages = []
+    while True:
+        page = execute(BookQuery(cursor=cursor, **criteria))
+        pages.append([book.book_id for book in page.books])
+        cursor = page.next_cursor
+        if cursor is None:
+            return pages
+
+
+def _sort_key(book, order_by):
+    return (book.publication_year.value, book.book_id) if order_by == "publication_year" else book.book_id
+
+
+@pytest.mark.parametrize("order_by", ["book_id", "publication_year"])
+@pytest.mark.parametrize("descending", [False, True])
+def test_pages_cover_every_match_once_in_order(order_by, descending):
+    repository = ColumnarBookCatalog()
+    _, engine = _catalog(repository)
+    criteria = dict(language="Español", year_from=1960, order_by=order_by, descending=descending, limit=7)
+    pages = _pages(engine.execute, **criteria)
+
+    expected = sorted(
+        (book for book in repository.iter_all()
+         if book.language.value == "Español" and book.publication_year.value >= 1960),
+        key=lambda book: _sort_key(book, order_by), reverse=descending
+    )
+    assert [book_id for page in pages for book_id in page] == [book.book_id for book in expected]
+    assert len(pages) > 3 and all(len(page) == 7 for page in pages[:-1])
+
+
+@pytest.mark.parametrize("order_by", ["book_id", "publication_year"])
+def test_new_books_do_not_shift_following_pages(order_by):
+    repository = ColumnarBookCatalog()
+    use_case, engine = _catalog(repository)
+    criteria = dict(genre="Ficción", order_by=order_by, limit=10)
+    first = engine.execute(BookQuery(**criteria))
+    second = engine.execute(BookQuery(cursor=first.next_cursor, **criteria))
+
+    # Libros nuevos que caen antes y después del cursor
+    assert all(response.success for response in use_case.execute_many(_requests(300, 40), include_book_info=False))
+    again = engine.execute(BookQuery(cursor=first.next_cursor, **criteria))
+
+    seen = {book.book_id for book in first.books}
+    if order_by == "book_id":
+        # Los identificadores nuevos son mayores: la página siguiente no cambia
+        assert [book.book_id for book in again.books] == [book.book_id for book in second.books]
+    last = _sort_key(first.books[-1], order_by)
+    assert all(_sort_key(book, order_by) > last for book in again.books)
+    assert seen.isdisjoint(book.book_id for book in again.books)
+
+
+def test_removed_books_leave_the_remaining_pages_intact():
+    repository = ColumnarBookCatalog()
+    _, engine = _catalog(repository)
+    criteria = dict(min_copies=1, limit=25)
+    first = engine.execute(BookQuery(**criteria))
+    removed = [book.book_id for book in engine.execute(BookQuery(cursor=first.next_cursor, **criteria)).books[::2]]
+    repository.delete_many(removed)
+    for book_id in removed:
+        engine.remove(book_id)
+
+    following = [book_id for page in _pages(engine.execute, first.next_cursor, **criteria) for book_id in page]
+    expected = [book.book_id for book in repository.iter_all()
+                if book.copies_count.value >= 1 and book.book_id > first.books[-1].book_id]
+    assert following == expected and len(expected) > 100
+
+
+@pytest.mark.parametrize("order_by", ["book_id", "publication_year"])
+@pytest.mark.parametrize("descending", [False, True])
+def test_sqlite_pages_match_the_engine(order_by, descending):
+    repository = SQLiteBookRepository()
+    _, engine = _catalog(repository)
+    criteria = dict(genre="No Ficción", year_to=1980, title_contains="LIBRO 1", order_by=order_by,
+                    descending=descending, limit=4)
+    pages = _pages(engine.execute, **criteria)
+    assert len(pages) > 1
+    assert _pages(repository.execute_query, **criteria) == pages
+
+
+def test_cursor_of_the_other_order_is_rejected():
+    repository = ColumnarBookCatalog()
+    _, engine = _catalog(repository, count=20)
+    with pytest.raises(ValueError, match="Cursor inválido"):
+        engine.execute(BookQuery(order_by="publication_year", cursor="12"))
+    with pytest.raises(ValueError, match="Cursor inválido"):
+        SQLiteBookRepository().execute_query(BookQuery(cursor="1990:12"))
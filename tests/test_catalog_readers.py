@@ -0,0 +1,50 @@
+from application.use_cases import BookRegistrationUseCase
+from domain.dto import MalformedRowRequest
+from domain.validation import ValidationErrorCode, validate_request
+from infrastructure.catalog_readers import read_jsonl_requests
+from infrastructure.parallel_import import ParallelCatalogImporter
+
+VALID = ('{"title": "%s", "author": "Ana Pérez", "publication_year": 2000, "genre": "Ficción", '
+         '"categories": ["Novela"], "language": "Español", "availability_status": "Disponible", '
+         '"copies_count": 1}')
+
+
+def _write(tmp_path, lines):
+    path = tmp_path / "catalogo.jsonl"
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return path
+
+
+def test_malformed_jsonl_lines_become_rejected_rows(tmp_path):
+    path = _write(tmp_path, [VALID % "Primero", "{no es json", "", "[1, 2]", VALID % "Segundo"])
+    requests = list(read_jsonl_requests(path))
+
+    assert [type(request) for request in requests][1:3] == [MalformedRowRequest, MalformedRowRequest]
+    assert requests[1].error.startswith("Línea 2: JSON inválido")
+    assert requests[2].error == "Línea 4: se esperaba un objeto JSON"
+    assert validate_request(requests[1]) == [ValidationErrorCode.ROW_MALFORMED]
+
+
+def test_import_continues_past_malformed_lines(tmp_path):
+    path = _write(tmp_path, [VALID % "Primero", "{no es json", '"texto"', VALID % "Segundo"])
+    responses = list(BookRegistrationUseCase().execute_many(read_jsonl_requests(path)))
+
+    assert [response.success for response in responses] == [True, False, False, True]
+    assert "Línea 3" in responses[2].message
+    rejected = list(BookRegistrationUseCase().execute_many(read_jsonl_requests(path), collect_errors=True))
+    assert rejected[1].error_codes == ["E201"]
+
+
+def test_parallel_import_reports_malformed_lines_with_file_line_numbers(tmp_path):
+    lines = [VALID % f"Libro {n}" for n in range(40)]
+    lines[5], lines[33] = "{no es json", "[1, 2]"
+    path = _write(tmp_path, lines)
+    # Fragmentos pequeños para que las líneas ilegibles caigan en fragmentos distintos
+    importer = ParallelCatalogImporter(workers=2, chunk_bytes=1024)
+    responses = list(importer.import_file(path))
+
+    assert len(responses) == 40
+    failed = [response.message for response in responses if not response.success]
+    assert len(failed) == 2
+    assert "Línea 6: JSON inválido" in failed[0]
+    assert "Línea 34: se esperaba un objeto JSON" in failed[1]
@@ -0,0 +1,118 @@
+import pytest
+from application.aggregates import CatalogAggregates
+from application.catalog_query import CatalogQueryEngine
+from application.catalog_sync import CatalogSyncUseCase
+from application.deduplication import DuplicateIndex
+from application.use_cases import BookRegistrationUseCase
+from domain.dto import BookQuery
+from infrastructure.columnar_catalog import ColumnarBookCatalog
+from infrastructure.sqlite_book_repository import SQLiteBookRepository
+from infrastructure.sync_manifest import read_sync_manifest, write_sync_manifest
+from .conftest import make_request
+
+
+def _file(count=6, **changes):
+    """Archivo del proveedor: ``changes`` reemplaza campos de la fila indicada (row_<n>)"""
+    rows = []
+    for number in range(count):
+        fields = dict(title=f"Libro {number}", publication_year=1990 + number, copies_count=2)
+        fields.update(changes.get(f"row_{number}", {}))
+        rows.append(make_request(**fields))
+    return rows
+
+
+def _counts(report):
+    return (report.unchanged, report.inserted, report.updated, report.deleted, report.failed)
+
+
+@pytest.fixture(params=[ColumnarBookCatalog, SQLiteBookRepository])
+def sync(request):
+    repository = request.param()
+    registration = BookRegistrationUseCase(
+        repository, aggregates=CatalogAggregates(), duplicates=DuplicateIndex().rebuild(repository),
+        query_engine=CatalogQueryEngine(repository)
+    )
+    return CatalogSyncUseCase(registration)
+
+
+def test_first_sync_inserts_every_row(sync):
+    report = sync.execute(_file())
+    assert _counts(report) == (0, 6, 0, 0, 0)
+    assert sync.repository.count() == 6
+    assert len(sync.manifest) == 6
+
+
+def test_unchanged_file_touches_nothing(sync):
+    sync.execute(_file())
+    report = sync.execute(_file())
+    assert _counts(report) == (6, 0, 0, 0, 0)
+
+
+def test_changed_rows_are_updated_in_place(sync):
+    sync.execute(_file())
+    book_id = next(book.book_id for book in sync.repository.iter_all() if book.title.value == "Libro 3")
+    report = sync.execute(_file(row_3=dict(copies_count=9), row_4=dict(genre="No Ficción")))
+    assert _counts(report) == (4, 0, 2, 0, 0)
+    assert sync.repository.get(book_id).copies_count.value == 9
+    assert sync.registration.aggregates.snapshot()["copies"] == 2 * 5 + 9
+    engine = sync.registration.query_engine
+    assert [book.title.value for book in engine.execute(BookQuery(genre="No Ficción")).books] == ["Libro 4"]
+
+
+def test_category_order_and_repetition_do_not_count_as_changes(sync):
+    sync.execute(_file(row_0=dict(categories=("Novela", "Historia"))))
+    report = sync.execute(_file(row_0=dict(categories=("Historia", "Novela", "Historia"))))
+    assert _counts(report) == (6, 0, 0, 0, 0)
+
+
+def test_new_rows_are_inserted_and_missing_ones_kept_by_default(sync):
+    sync.execute(_file())
+    report = sync.execute(_file(count=8)[2:])
+    assert _counts(report) == (4, 2, 0, 0, 0)
+    assert sync.repository.count() == 8
+    assert len(sync.manifest) == 8
+
+
+def test_missing_rows_are_deleted_only_when_requested(sync):
+    sync.execute(_file())
+    report = sync.execute(_file()[2:], delete_missing=True)
+    assert _counts(report) == (4, 0, 0, 2, 0)
+    assert sorted(book.title.value for book in sync.repository.iter_all()) == [f"Libro {n}" for n in range(2, 6)]
+    assert len(sync.registration.query_engine) == 4
+    # La clave vuelve a ser nueva: la fila reaparece como alta
+    report = sync.execute(_file())
+    assert _counts(report) == (4, 2, 0, 0, 0)
+
+
+def test_without_manifest_nothing_is_deleted(sync):
+    sync.registration.register_books([sync.registration.build_book(make_request("Registrado a mano"))])
+    report = sync.execute(_file(), delete_missing=True)
+    assert _counts(report) == (0, 6, 0, 0, 0)
+    assert sync.repository.count() == 7
+
+
+def test_invalid_and_repeated_rows_fail_without_losing_the_book(sync):
+    sync.execute(_file())
+    rows = _file(row_1=dict(genre="Inexistente"))
+    rows.append(rows[0])
+    report = sync.execute(rows, delete_missing=True)
+    assert _counts(report) == (5, 0, 0, 0, 2)
+    assert [failure["row"] for failure in report.failures] == [2, 7]
+    assert sync.repository.count() == 6
+
+
+def test_existing_books_are_adopted_instead_of_duplicated(sync):
+    registration = sync.registration
+    registration.register_books([registration.build_book(make_request("Libro 0", publication_year=1990))])
+    report = sync.execute(_file())
+    assert _counts(report) == (0, 5, 1, 0, 0)
+    assert sync.repository.count() == 6
+
+
+def test_manifest_round_trip_keeps_classification(sync, tmp_path):
+    sync.execute(_file())
+    path = str(tmp_path / "estado.sxm")
+    write_sync_manifest(path, sync.manifest)
+    restored = CatalogSyncUseCase(sync.registration, read_sync_manifest(path))
+    report = restored.execute(_file(row_5=dict(copies_count=1)))
+    assert _counts(report) == (5, 0, 1, 0, 0)
@@ -0,0 +1,144 @@
+import os
+import zlib
+from dataclasses import replace
+from domain.value_objects import CopiesCount
+from infrastructure.journal import _EVENT_HEADER, EVENT_REGISTERED, JournaledBookRepository
+
+
+def _state(repository):
+    return [(book.book_id, book.title.value, book.copies_count.value) for book in repository.iter_all()]
+
+
+def _segments(directory):
+    return sorted(name for name in os.listdir(directory) if name.startswith("journal-"))
+
+
+def _truncate_last_segment(directory, byte_count):
+    path = os.path.join(directory, _segments(directory)[-1])
+    with open(path, "r+b") as handle:
+        handle.truncate(os.path.getsize(path) - byte_count)
+
+
+def test_replay_restores_registrations_updates_and_deletes(tmp_path, make_book):
+    repository = JournaledBookRepository(str(tmp_path))
+    repository.save_many([make_book(f"Libro {number}") for number in range(1, 6)])
+    repository.update(replace(repository.get(2), copies_count=CopiesCount(9)))
+    repository.delete_many([4])
+    expected = _state(repository)
+    repository.close()
+
+    recovered = JournaledBookRepository(str(tmp_path))
+    assert _state(recovered) == expected
+    assert recovered.replayed_events == 7
+    recovered.close()
+
+
+def test_truncated_event_is_dropped_and_ids_continue(tmp_path, make_book):
+    repository = JournaledBookRepository(str(tmp_path))
+    repository.save_many([make_book("Primero"), make_book("Segundo"), make_book("Tercero")])
+    repository.close()
+    _truncate_last_segment(str(tmp_path), 5)
+
+    recovered = JournaledBookRepository(str(tmp_path))
+    assert _state(recovered) == [(1, "Primero", 3), (2, "Segundo", 3)]
+    # El identificador del evento perdido se vuelve a asignar
+    assert recovered.save(make_book("Cuarto")).book_id == 3
+    recovered.close()
+
+    reopened = JournaledBookRepository(str(tmp_path))
+    assert _state(reopened) == [(1, "Primero", 3), (2, "Segundo", 3), (3, "Cuarto", 3)]
+    assert len(_segments(str(tmp_path))) == 3
+    reopened.close()
+
+
+def test_segments_after_a_truncated_one_are_replayed(tmp_path, make_book):
+    repository = JournaledBookRepository(str(tmp_path))
+    repository.save_many([make_book("Primero"), make_book("Segundo")])
+    repository.close()
+    _truncate_last_segment(str(tmp_path), 1)
+
+    repository = JournaledBookRepository(str(tmp_path))
+    repository.update(replace(repository.get(1), copies_count=CopiesCount(7)))
+    repository.close()
+
+    recovered = JournaledBookRepository(str(tmp_path))
+    assert _state(recovered) == [(1, "Primero", 7)]
+    recovered.close()
+
+
+def test_corrupted_event_stops_replay_of_its_segment(tmp_path, make_book):
+    repository = JournaledBookRepository(str(tmp_path))
+    for title in ("Primero", "Segundo", "Tercero"):
+        repository.save(make_book(title))
+    repository.close()
+    path = os.path.join(str(tmp_path), _segments(str(tmp_path))[-1])
+    with open(path, "r+b") as handle:
+        data = bytearray(handle.read())
+        # Un byte del título del segundo evento: su checksum deja de coincidir
+        position = data.index("Segundo".encode("utf-8"))
+        data[position] ^= 0xFF
+        handle.seek(0)
+        handle.write(data)
+
+    recovered = JournaledBookRepository(str(tmp_path))
+    assert _state(recovered) == [(1, "Primero", 3)]
+    recovered.close()
+
+
+def test_snapshot_then_truncated_segment(tmp_path, make_book):
+    repository = JournaledBookRepository(str(tmp_path))
+    repository.save_many([make_book(f"Libro {number}") for number in range(1, 4)])
+    repository.snapshot()
+    repository.save(make_book("Después"))
+    repository.close()
+    _truncate_last_segment(str(tmp_path), 3)
+
+    recovered = JournaledBookRepository(str(tmp_path))
+    assert [book_id for book_id, _, _ in _state(recovered)] == [1, 2, 3]
+    assert recovered.replayed_events == 0
+    recovered.close()
+
+
+def _append_to_last_segment(directory, data):
+    path = os.path.join(directory, _segments(directory)[-1])
+    with open(path, "ab") as handle:
+        handle.write(data)
+
+
+def test_zero_filled_tail_ends_replay(tmp_path, make_book):
+    repository = JournaledBookRepository(str(tmp_path))
+    repository.save_many([make_book("Primero"), make_book("Segundo")])
+    repository.close()
+    # Un encabezado de ceros tiene largo 0 y crc32(b"") == 0: pasa la comprobación del crc
+    _append_to_last_segment(str(tmp_path), bytes(64))
+
+    recovered = JournaledBookRepository(str(tmp_path))
+    assert _state(recovered) == [(1, "Primero", 3), (2, "Segundo", 3)]
+    assert recovered.replayed_events == 2
+    recovered.close()
+
+
+def test_unknown_event_kind_ends_replay(tmp_path, make_book):
+    repository = JournaledBookRepository(str(tmp_path))
+    repository.save(make_book("Primero"))
+    repository.close()
+    payload = b"desconocido"
+    _append_to_last_segment(str(tmp_path), _EVENT_HEADER.pack(9, len(payload), zlib.crc32(payload)) + payload)
+
+    recovered = JournaledBookRepository(str(tmp_path))
+    assert _state(recovered) == [(1, "Primero", 3)]
+    assert recovered.save(make_book("Segundo")).book_id == 2
+    recovered.close()
+
+
+def test_undecodable_registration_ends_replay(tmp_path, make_book):
+    repository = JournaledBookRepository(str(tmp_path))
+    repository.save(make_book("Primero"))
+    repository.close()
+    payload = b"\x01" * 5
+    _append_to_last_segment(str(tmp_path),
+                            _EVENT_HEADER.pack(EVENT_REGISTERED, len(payload), zlib.crc32(payload)) + payload)
+
+    recovered = JournaledBookRepository(str(tmp_path))
+    assert _state(recovered) == [(1, "Primero", 3)]
+    recovered.close()